@@ -0,0 +1,12 @@
+"""
+Benchmark suite for the services, on synthetic data.
+
+- generator: deterministic dataset (agencies, managers, KPI assignments,
+  monthly targets/results/reviews/action items, users and their agencies)
+- scenarios: timed operations (admin dashboard, agencies summary, agency
+  list, monthly review save, target copying, login) with SQL query counts
+- run: command line runner, SQLite and/or PostgreSQL
+
+Usage:
+    python -m benchmarks --help
+"""
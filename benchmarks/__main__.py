@@ -0,0 +1,4 @@
+"""Entry point: python -m benchmarks."""
+from benchmarks.run import main
+
+main()
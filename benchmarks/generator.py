@@ -0,0 +1,211 @@
+"""
+Deterministic synthetic data for the benchmarks.
+
+generate_dataset() fills an empty database with N agencies (with managers
+and KPI assignments), M years of monthly targets, results, reviews and
+action items, and K users mapped to agencies through UserAgency. The same
+arguments and seed always produce the same rows.
+
+Rows are inserted in chunks with executemany inserts, then the materialized
+KPI status (agency_kpi_status) is rebuilt, as the app would have it.
+"""
+import random
+from datetime import date, datetime
+from typing import Dict, Any, List
+from sqlalchemy import insert
+from db.models import (
+    Agency, AgencyManager, KPI, AgencyKPI, MonthlyTarget, MonthlyResult,
+    MonthlyReview, ActionItem, User, UserAgency
+)
+from services.auth_service import hash_password
+from services.tracking_service import refresh_kpi_status
+
+
+# KPIs created by the generator (same codes as scripts/init_kpis.py)
+KPI_DEFINITIONS = [
+    ("CS", "Capital Services", "trx"),
+    ("RIA", "RIA", "trx"),
+    ("MG", "MoneyGram", "trx"),
+    ("CORNERS", "Corners", "units"),
+    ("CARDS", "Tarjetas", "units"),
+    ("INSURANCE", "Seguros", "units"),
+]
+
+CITIES = [
+    "Santo Domingo", "Santiago", "La Romana", "Puerto Plata", "Higüey",
+    "San Pedro", "La Vega", "Moca", "Baní", "Azua"
+]
+
+# Password of every generated user (login scenario)
+BENCHMARK_PASSWORD = "Benchmark#2026"
+ADMIN_USERNAME = "bench_admin"
+
+INSERT_CHUNK_SIZE = 5000
+
+
+def _insert_chunked(db, model, rows: List[Dict[str, Any]]) -> None:
+    """Insert rows with executemany, in chunks."""
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(model), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def generate_dataset(
+    db,
+    agencies: int = 200,
+    years: int = 2,
+    users: int = 100,
+    end_year: int = 2026,
+    kpis_per_agency: int = 4,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Fill an empty database with a deterministic synthetic dataset.
+
+    Args:
+        db: Open session on an empty database (tables created)
+        agencies: Number of agencies (N)
+        years: Number of years of monthly data, ending with end_year (M)
+        users: Number of NORMAL users mapped to agencies (K)
+        end_year: Last year with data
+        kpis_per_agency: KPIs assigned to each agency (up to len(KPI_DEFINITIONS))
+        seed: Random seed
+
+    Returns:
+        Dict with agency_ids, kpi_ids, usernames, admin_username, password,
+        years and the row count per table
+    """
+    rnd = random.Random(seed)
+    created_at = datetime(end_year - years, 12, 1)
+    year_list = list(range(end_year - years + 1, end_year + 1))
+
+    # KPIs
+    _insert_chunked(db, KPI, [
+        {"code": code, "label": label, "unit": unit, "active": True}
+        for code, label, unit in KPI_DEFINITIONS
+    ])
+    kpi_ids = [kpi_id for kpi_id, in db.query(KPI.id).order_by(KPI.id)]
+    kpis_per_agency = max(1, min(kpis_per_agency, len(kpi_ids)))
+
+    # Agencies and their managers (a past one for some, to have history)
+    _insert_chunked(db, Agency, [
+        {
+            "name": f"Agencia {i + 1:05d}",
+            "city": CITIES[i % len(CITIES)],
+            "active": rnd.random() > 0.05,
+            "created_at": created_at
+        }
+        for i in range(agencies)
+    ])
+    agency_ids = [agency_id for agency_id, in db.query(Agency.id).order_by(Agency.id)]
+
+    managers = []
+    for i, agency_id in enumerate(agency_ids):
+        if rnd.random() < 0.3:
+            managers.append({
+                "agency_id": agency_id,
+                "full_name": f"Ex Jefe {i + 1:05d}",
+                "start_date": date(end_year - years, 1, 1),
+                "end_date": date(end_year - 1, 6, 30),
+                "active": False
+            })
+        managers.append({
+            "agency_id": agency_id,
+            "full_name": f"Jefe {i + 1:05d}",
+            "email": f"jefe{i + 1:05d}@example.com",
+            "start_date": date(end_year - 1, 7, 1),
+            "active": True
+        })
+    _insert_chunked(db, AgencyManager, managers)
+
+    # KPI assignments
+    assigned = {
+        agency_id: sorted(rnd.sample(kpi_ids, kpis_per_agency))
+        for agency_id in agency_ids
+    }
+    _insert_chunked(db, AgencyKPI, [
+        {"agency_id": agency_id, "kpi_id": kpi_id, "active": True}
+        for agency_id, kpi_list in assigned.items()
+        for kpi_id in kpi_list
+    ])
+
+    # Monthly targets, results, reviews and action items
+    targets, results, reviews, actions = [], [], [], []
+    for agency_id, kpi_list in assigned.items():
+        base = {kpi_id: rnd.randint(20, 500) for kpi_id in kpi_list}
+        for year in year_list:
+            for month in range(1, 13):
+                for kpi_id in kpi_list:
+                    target = float(round(base[kpi_id] * rnd.uniform(0.9, 1.2)))
+                    targets.append({
+                        "agency_id": agency_id, "year": year, "month": month,
+                        "kpi_id": kpi_id, "target_value": target, "created_at": created_at
+                    })
+                    # Some results missing (month not reported yet)
+                    if rnd.random() < 0.95:
+                        results.append({
+                            "agency_id": agency_id, "year": year, "month": month,
+                            "kpi_id": kpi_id,
+                            "actual_value": float(round(target * rnd.uniform(0.6, 1.3))),
+                            "recorded_at": created_at, "recorded_by": "benchmark"
+                        })
+                if rnd.random() < 0.7:
+                    reviews.append({
+                        "agency_id": agency_id, "year": year, "month": month,
+                        "review_date": date(year, month, 25),
+                        "what_happened": "Resultados del mes dentro de lo esperado.",
+                        "improvement_plan": "Reforzar visitas a comercios."
+                    })
+                for n in range(rnd.randint(0, 3)):
+                    done = rnd.random() < 0.5
+                    actions.append({
+                        "agency_id": agency_id, "year": year, "month": month,
+                        "title": f"Acción {n + 1}", "done": done,
+                        "done_at": created_at if done else None
+                    })
+    _insert_chunked(db, MonthlyTarget, targets)
+    _insert_chunked(db, MonthlyResult, results)
+    _insert_chunked(db, MonthlyReview, reviews)
+    _insert_chunked(db, ActionItem, actions)
+
+    # Users: one admin and K NORMAL users with 1-3 agencies each.
+    # bcrypt is slow by design: hash once and share the hash.
+    password_hash = hash_password(BENCHMARK_PASSWORD)
+    usernames = [f"bench_user_{i + 1:05d}" for i in range(users)]
+    _insert_chunked(db, User, [
+        {
+            "username": username, "password_hash": password_hash,
+            "role": role, "active": True, "created_at": created_at,
+            "failed_attempts": 0, "onboarding_completed": True
+        }
+        for username, role in [(ADMIN_USERNAME, "ADMIN")] + [(u, "NORMAL") for u in usernames]
+    ])
+    user_ids = dict(db.query(User.username, User.id))
+    mappings = []
+    if agency_ids:
+        for username in usernames:
+            for agency_id in rnd.sample(agency_ids, min(len(agency_ids), rnd.randint(1, 3))):
+                mappings.append({"user_id": user_ids[username], "agency_id": agency_id})
+    _insert_chunked(db, UserAgency, mappings)
+
+    refresh_kpi_status(db)
+    db.commit()
+
+    return {
+        "agency_ids": agency_ids,
+        "kpi_ids": kpi_ids,
+        "usernames": usernames,
+        "admin_username": ADMIN_USERNAME,
+        "password": BENCHMARK_PASSWORD,
+        "years": year_list,
+        "rows": {
+            "agencies": len(agency_ids),
+            "agency_managers": len(managers),
+            "agency_kpis": sum(len(k) for k in assigned.values()),
+            "monthly_targets": len(targets),
+            "monthly_results": len(results),
+            "monthly_reviews": len(reviews),
+            "action_items": len(actions),
+            "users": len(usernames) + 1,
+            "user_agencies": len(mappings)
+        }
+    }
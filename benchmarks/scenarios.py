@@ -0,0 +1,174 @@
+"""
+Timed benchmark scenarios over the services.
+
+Each scenario is a function of (dataset, rnd) that runs one operation the
+way a page would (random agency, period or user of the generated dataset).
+run_scenario() times N iterations and counts the SQL statements each one
+issues, through an engine event listener.
+
+Import after setting DATABASE_URL and CACHE_TTL_SECONDS=0 (both read at
+import time), so the timings measure the database work on the intended
+engine; benchmarks.run takes care of it.
+"""
+import random
+import statistics
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List
+from sqlalchemy import event
+from db.database import SessionLocal, engine
+from services.agency_service import list_agencies, get_agency_kpis
+from services.auth_service import authenticate_user
+from services.dashboard_service import get_admin_dashboard_data
+from services.tracking_service import (
+    get_all_agencies_summary, upsert_monthly_results, upsert_monthly_review,
+    copy_targets_to_all_months
+)
+
+
+class QueryCounter:
+    """
+    Count the SQL statements executed on an engine while active.
+
+    Usage:
+        with QueryCounter() as counter:
+            get_admin_dashboard_data(2026, 1)
+        counter.count
+    """
+
+    def __init__(self, bind=None):
+        self.bind = bind or SessionLocal.kw.get("bind") or engine
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.bind, "before_cursor_execute", self._on_execute)
+        return False
+
+
+def _random_period(dataset: Dict[str, Any], rnd: random.Random) -> tuple:
+    """Random (year, month) with data."""
+    return rnd.choice(dataset["years"]), rnd.randint(1, 12)
+
+
+def scenario_admin_dashboard(dataset: Dict[str, Any], rnd: random.Random) -> None:
+    """Admin dashboard of a period (all agencies)."""
+    get_admin_dashboard_data(*_random_period(dataset, rnd))
+
+
+def scenario_all_agencies_summary(dataset: Dict[str, Any], rnd: random.Random) -> None:
+    """Summary (ranking) of all agencies for a period."""
+    get_all_agencies_summary(*_random_period(dataset, rnd))
+
+
+def scenario_list_agencies(dataset: Dict[str, Any], rnd: random.Random) -> None:
+    """Agency list with active managers."""
+    list_agencies(active_only=True)
+
+
+def scenario_monthly_review_save(dataset: Dict[str, Any], rnd: random.Random) -> None:
+    """Save results and notes of one agency/month (monthly review page)."""
+    agency_id = rnd.choice(dataset["agency_ids"])
+    year, month = _random_period(dataset, rnd)
+    kpis = get_agency_kpis(agency_id)
+    upsert_monthly_results(
+        agency_id, year, month,
+        {kpi.id: float(rnd.randint(0, 600)) for kpi in kpis},
+        recorded_by="benchmark"
+    )
+    upsert_monthly_review(
+        agency_id, year, month,
+        review_date=date(year, month, 28),
+        what_happened="Benchmark",
+        improvement_plan="Benchmark"
+    )
+
+
+def scenario_copy_targets(dataset: Dict[str, Any], rnd: random.Random) -> None:
+    """Copy one month's targets of an agency to the whole year."""
+    agency_id = rnd.choice(dataset["agency_ids"])
+    year, month = _random_period(dataset, rnd)
+    copy_targets_to_all_months(agency_id, year, month)
+
+
+def scenario_login(dataset: Dict[str, Any], rnd: random.Random) -> None:
+    """Successful login of a random NORMAL user (bcrypt verification included)."""
+    username = rnd.choice(dataset["usernames"]) if dataset["usernames"] else dataset["admin_username"]
+    if not authenticate_user(username, dataset["password"]):
+        raise RuntimeError(f"Login failed for {username}")
+
+
+# Scenario name -> function, in report order
+SCENARIOS: Dict[str, Callable[[Dict[str, Any], random.Random], None]] = {
+    "admin_dashboard": scenario_admin_dashboard,
+    "all_agencies_summary": scenario_all_agencies_summary,
+    "list_agencies": scenario_list_agencies,
+    "monthly_review_save": scenario_monthly_review_save,
+    "copy_targets": scenario_copy_targets,
+    "login": scenario_login,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_scenario(
+    name: str,
+    dataset: Dict[str, Any],
+    iterations: int = 20,
+    warmup: int = 2,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Time a scenario and count its queries.
+
+    Args:
+        name: Scenario name (key of SCENARIOS)
+        dataset: Result of generate_dataset
+        iterations: Timed iterations
+        warmup: Untimed iterations run first
+        seed: Random seed (same seed = same agencies and periods)
+
+    Returns:
+        Dict with scenario, iterations, p50_ms, p95_ms, mean_ms, max_ms
+        and queries (average statements per iteration)
+    """
+    scenario = SCENARIOS[name]
+    rnd = random.Random(seed)
+
+    for _ in range(warmup):
+        scenario(dataset, rnd)
+
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            scenario(dataset, rnd)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+
+    timings.sort()
+    return {
+        "scenario": name,
+        "iterations": iterations,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "mean_ms": statistics.mean(timings) if timings else 0.0,
+        "max_ms": timings[-1] if timings else 0.0,
+        "queries": statistics.mean(queries) if queries else 0.0
+    }
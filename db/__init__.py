@@ -1,2 +1,2 @@
 # Database module
-from db.database import SessionLocal, engine, Base, get_db
+from db.database import SessionLocal, engine, Base, get_db, get_pool_stats
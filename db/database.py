@@ -3,7 +3,12 @@ Database configuration module.
 Configures SQLAlchemy engine, session factory, and base class.
 """
 import os
-from sqlalchemy import create_engine
+import time
+import threading
+from typing import Dict, Any, Optional
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -13,6 +18,91 @@ load_dotenv()
 # Get database URL from environment variable, default to SQLite for development
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///agency_tracker.db")
 
+# Connection pool settings (PostgreSQL and other server databases)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds waiting for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds before a connection is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 = no limit
+
+# SQLite performance profile (opt-in): WAL journaling lets readers continue
+# while a writer commits, instead of blocking on the rollback journal lock
+SQLITE_PERFORMANCE_PROFILE = os.getenv("SQLITE_PERFORMANCE_PROFILE", "false").lower() in ("1", "true", "yes")
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # Safe with WAL; fsync only at checkpoints
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # Negative = KiB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+
+def configure_sqlite_performance(sqlite_engine: Engine, pragmas: Dict[str, Any] = None) -> None:
+    """
+    Apply the SQLite performance pragmas to every new connection of an engine.
+
+    Args:
+        sqlite_engine: SQLite engine
+        pragmas: Pragmas to apply (defaults to SQLITE_PRAGMAS)
+    """
+    pragmas = dict(SQLITE_PRAGMAS if pragmas is None else pragmas)
+
+    @event.listens_for(sqlite_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait to check out a connection.
+    Used by get_pool_stats() to detect an undersized pool. Checkouts that
+    time out waiting for a connection are counted apart from the ones that
+    fail for other reasons (e.g. the database refuses new connections).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._stats = {"checkouts": 0, "timeouts": 0, "errors": 0, "total_wait": 0.0, "max_wait": 0.0}
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._stats["timeouts"] += 1
+            raise
+        except Exception:
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._stats["checkouts"] += 1
+                self._stats["total_wait"] += waited
+                self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+
+    def recreate(self):
+        # Keep the instrumentation when SQLAlchemy recreates the pool
+        pool = super().recreate()
+        pool._stats = self._stats
+        pool._stats_lock = self._stats_lock
+        return pool
+
+    def get_wait_stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the checkout wait statistics."""
+        with self._stats_lock:
+            return dict(self._stats)
+
 # Configure engine based on database type
 if DATABASE_URL.startswith("sqlite"):
     # SQLite specific configuration
@@ -21,6 +111,8 @@ if DATABASE_URL.startswith("sqlite"):
         connect_args={"check_same_thread": False},  # Required for SQLite with multiple threads
         echo=False  # Set to True for SQL debugging
     )
+    if SQLITE_PERFORMANCE_PROFILE:
+        configure_sqlite_performance(engine)
 else:
     # PostgreSQL or other databases
     # Ensure required DB driver is present and fail with a clear message if not
@@ -35,8 +127,19 @@ else:
                     "Install it with `pip install psycopg2-binary` or add it to requirements.txt"
                 ) from e
 
+        connect_args = {}
+        if DB_STATEMENT_TIMEOUT_MS > 0 and "postgres" in DATABASE_URL:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
         engine = create_engine(
             DATABASE_URL,
+            poolclass=InstrumentedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            connect_args=connect_args,
             echo=False
         )
     except Exception:
@@ -46,6 +149,101 @@ else:
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# Async engine (services/async_service.py). Derived from DATABASE_URL unless
+# ASYNC_DATABASE_URL is set; requires aiosqlite (SQLite) or asyncpg (PostgreSQL)
+def to_async_url(url: str) -> str:
+    """
+    Map a sync database URL to its async driver.
+
+    asyncpg does not accept libpq's sslmode: it is passed as ssl, which
+    takes the same values (disable, prefer, require, verify-full...).
+
+    Args:
+        url: Sync URL (sqlite:///..., postgresql[+psycopg2]://...)
+
+    Returns:
+        URL using aiosqlite or asyncpg (unchanged if unknown)
+    """
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            async_url = make_url("postgresql+asyncpg://" + url[len(prefix):])
+            if "sslmode" in async_url.query:
+                async_url = async_url.update_query_dict(
+                    {"ssl": async_url.query["sslmode"]}
+                ).difference_update_query(["sslmode"])
+            return async_url.render_as_string(hide_password=False)
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+_async_engine = None
+_async_session_factory = None
+_async_lock = threading.Lock()
+
+
+def get_async_session_factory():
+    """
+    Create the async engine on first use and return its session factory.
+    Created lazily so the async drivers stay optional for the sync app.
+
+    Returns:
+        async_sessionmaker bound to the async engine
+
+    Raises:
+        ImportError: If the async driver for the database is not installed
+    """
+    global _async_engine, _async_session_factory
+
+    with _async_lock:
+        if _async_session_factory is not None:
+            return _async_session_factory
+
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        if "+aiosqlite" in ASYNC_DATABASE_URL:
+            try:
+                import aiosqlite  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "aiosqlite is required for the async services on SQLite. "
+                    "Install it with `pip install aiosqlite`"
+                ) from e
+            async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+            if SQLITE_PERFORMANCE_PROFILE:
+                configure_sqlite_performance(async_engine.sync_engine)
+        else:
+            if "+asyncpg" in ASYNC_DATABASE_URL:
+                try:
+                    import asyncpg  # noqa: F401
+                except ImportError as e:
+                    raise ImportError(
+                        "asyncpg is required for the async services on PostgreSQL. "
+                        "Install it with `pip install asyncpg`"
+                    ) from e
+
+            connect_args = {}
+            if DB_STATEMENT_TIMEOUT_MS > 0 and "+asyncpg" in ASYNC_DATABASE_URL:
+                connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_pre_ping=DB_POOL_PRE_PING,
+                connect_args=connect_args,
+                echo=False
+            )
+
+        _async_engine = async_engine
+        _async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+        return _async_session_factory
+
 # Base class for declarative models
 Base = declarative_base()
 
@@ -69,3 +267,81 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get connection pool statistics.
+
+    Returns:
+        Dict with:
+        - pool_class: Pool implementation name
+        - size, max_overflow, timeout: Configured limits (None if not applicable)
+        - checked_out: Connections currently in use
+        - checked_in: Idle connections in the pool
+        - overflow: Connections open beyond pool_size
+        - checkouts, timeouts, errors: Totals since start (instrumented pool
+          only); timeouts waited pool_timeout for a connection, errors failed
+          to connect
+        - avg_wait_ms, max_wait_ms: Checkout wait times (instrumented pool only)
+    """
+    pool = engine.pool
+    stats = {
+        "pool_class": type(pool).__name__,
+        "size": None,
+        "max_overflow": None,
+        "timeout": None,
+        "checked_out": None,
+        "checked_in": None,
+        "overflow": None,
+        "checkouts": None,
+        "timeouts": None,
+        "errors": None,
+        "avg_wait_ms": None,
+        "max_wait_ms": None,
+    }
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        wait = pool.get_wait_stats()
+        checkouts = wait["checkouts"]
+        stats.update({
+            "checkouts": checkouts,
+            "timeouts": wait["timeouts"],
+            "errors": wait["errors"],
+            "avg_wait_ms": (wait["total_wait"] / checkouts * 1000) if checkouts else 0.0,
+            "max_wait_ms": wait["max_wait"] * 1000,
+        })
+
+    return stats
+
+
+def get_pool_capacity(bind: Engine = None) -> Optional[int]:
+    """
+    Get the maximum number of connections an engine's pool can hand out at once.
+    Used to size thread pools so workers do not wait on pool checkouts.
+
+    Args:
+        bind: Engine (defaults to the current bind of SessionLocal)
+
+    Returns:
+        pool_size + max_overflow for a QueuePool, 1 for single-connection
+        pools, or None if the pool is unbounded
+    """
+    pool = (bind or SessionLocal.kw.get("bind") or engine).pool
+    if isinstance(pool, QueuePool):
+        if pool._max_overflow < 0:
+            return None
+        return pool.size() + pool._max_overflow
+    if isinstance(pool, (SingletonThreadPool, StaticPool)):
+        return 1
+    return None
@@ -11,10 +11,11 @@ import os
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import inspect
 from db.database import engine, Base
 from db.models import (
     Agency, AgencyManager, KPI, AgencyKPI,
-    MonthlyTarget, MonthlyResult, MonthlyReview, ActionItem
+    MonthlyTarget, MonthlyResult, MonthlyReview, ActionItem, AgencyKPIStatus
 )
 
 
@@ -25,9 +26,16 @@ def init_database():
     print("Initializing database...")
     print(f"Database URL: {engine.url}")
 
+    # Existing databases get agency_kpi_status empty: backfill it when created
+    status_table_missing = not inspect(engine).has_table(AgencyKPIStatus.__tablename__)
+
     # Create all tables
     Base.metadata.create_all(bind=engine)
 
+    if status_table_missing:
+        from services.tracking_service import rebuild_kpi_status
+        print(f"KPI status rows backfilled: {rebuild_kpi_status()}")
+
     print("Database tables created successfully!")
     print("\nTables created:")
     for table in Base.metadata.tables.keys():
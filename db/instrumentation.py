@@ -0,0 +1,228 @@
+"""
+SQL instrumentation - query count and database time per unit of work.
+
+Listeners on the SQLAlchemy engine events (before/after_cursor_execute)
+record every statement into the active QueryStats collector, if any. A
+collector is activated with track_queries(), e.g. around one Streamlit
+rerun (main.py) or one service call:
+
+    with track_queries("dashboard") as stats:
+        get_admin_dashboard_data(2026, 1)
+    stats.count, stats.total_ms, stats.slowest, stats.by_function
+
+Each statement is attributed to the innermost services.* function on the
+call stack (or the name set with query_function()), so an N+1 loop shows
+up as one function with a high count.
+When a collector closes, a structured (JSON) log line is written to the
+"agency_tracker.queries" logger, at WARNING above QUERY_WARN_THRESHOLD.
+
+The collector lives in a context variable. Work handed to other threads
+keeps it only when run in a copy of the caller's context
+(contextvars.copy_context), as services/parallel.py and
+services/async_service.py do.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Set to false to skip the listeners entirely
+QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+# Units of work issuing more statements than this are logged as warnings
+QUERY_WARN_THRESHOLD = int(os.getenv("QUERY_WARN_THRESHOLD", "50"))
+# Slowest statements kept per unit of work
+SLOWEST_STATEMENTS = 5
+# Statement text kept per slow statement
+MAX_STATEMENT_LENGTH = 300
+# INFO logs every unit of work; WARNING only those above the threshold
+QUERY_LOG_LEVEL = os.getenv("QUERY_LOG_LEVEL", "WARNING").upper()
+
+logger = logging.getLogger("agency_tracker.queries")
+logger.setLevel(QUERY_LOG_LEVEL)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.propagate = False
+
+_current: contextvars.ContextVar = contextvars.ContextVar("query_stats", default=None)
+# Explicit attribution where the call stack does not show the caller (async tasks)
+_function_label: contextvars.ContextVar = contextvars.ContextVar("query_function", default=None)
+_installed = False
+_install_lock = threading.Lock()
+
+
+class QueryStats:
+    """Statements recorded during one unit of work (thread-safe)."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.count = 0
+        self.total_ms = 0.0
+        self.elapsed_ms = 0.0
+        self.slowest: List[Dict[str, Any]] = []
+        self.by_function: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration_ms: float, function: str) -> None:
+        """
+        Record one executed statement.
+
+        Args:
+            statement: SQL text
+            duration_ms: Execution time in milliseconds
+            function: Service function that issued it
+        """
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+
+            per_function = self.by_function.setdefault(function, {"count": 0, "total_ms": 0.0})
+            per_function["count"] += 1
+            per_function["total_ms"] += duration_ms
+
+            if len(self.slowest) < SLOWEST_STATEMENTS or duration_ms > self.slowest[-1]["ms"]:
+                self.slowest.append({
+                    "ms": duration_ms,
+                    "function": function,
+                    "statement": " ".join(statement.split())[:MAX_STATEMENT_LENGTH]
+                })
+                self.slowest.sort(key=lambda s: s["ms"], reverse=True)
+                del self.slowest[SLOWEST_STATEMENTS:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of the statistics as plain data.
+
+        Returns:
+            Dict with label, count, total_ms, elapsed_ms, slowest and
+            by_function (sorted by statement count, descending)
+        """
+        with self._lock:
+            return {
+                "label": self.label,
+                "count": self.count,
+                "total_ms": round(self.total_ms, 2),
+                "elapsed_ms": round(self.elapsed_ms, 2),
+                "slowest": [dict(s, ms=round(s["ms"], 2)) for s in self.slowest],
+                "by_function": {
+                    name: {"count": f["count"], "total_ms": round(f["total_ms"], 2)}
+                    for name, f in sorted(
+                        self.by_function.items(), key=lambda item: item[1]["count"], reverse=True
+                    )
+                }
+            }
+
+
+def _calling_function() -> str:
+    """Innermost services.* function on the call stack (or the first caller outside SQLAlchemy)."""
+    label = _function_label.get()
+    if label is not None:
+        return label
+
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        # Comprehensions and lambdas count as their enclosing function
+        if module.startswith("services.") and not frame.f_code.co_name.startswith("<"):
+            return f"{module[len('services.'):]}.{frame.f_code.co_name}"
+        if fallback is None and not module.startswith(("sqlalchemy", "db.instrumentation")):
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+# The start time lives on the statement's execution context, not on the
+# connection: after_cursor_execute does not fire when a statement raises
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started_at", None)
+    if started is None:
+        # No collector when the statement started
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration_ms, _calling_function())
+
+
+def install_query_instrumentation() -> None:
+    """Attach the listeners to every engine (sync and async), once."""
+    global _installed
+    with _install_lock:
+        if _installed or not QUERY_INSTRUMENTATION:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+@contextmanager
+def query_function(name: str):
+    """
+    Attribute the statements executed inside the block to a function name.
+    For code whose call stack does not reach the service (async tasks).
+
+    Args:
+        name: Function name to report (e.g. "async_service.get_monthly_summary_async")
+    """
+    token = _function_label.set(name)
+    try:
+        yield
+    finally:
+        _function_label.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Get the active collector, or None outside track_queries()."""
+    return _current.get()
+
+
+def log_query_stats(stats: Dict[str, Any]) -> None:
+    """
+    Write one structured log line for a unit of work.
+
+    Args:
+        stats: QueryStats.to_dict() snapshot
+    """
+    level = logging.WARNING if stats["count"] > QUERY_WARN_THRESHOLD else logging.INFO
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps({"event": "sql_stats", **stats}, ensure_ascii=False, default=str))
+
+
+@contextmanager
+def track_queries(label: str, log: bool = True):
+    """
+    Record the statements executed inside the block.
+
+    Args:
+        label: Name of the unit of work (page, service call, ...)
+        log: Write the structured log line when the block ends
+
+    Yields:
+        QueryStats collector (complete once the block ends)
+    """
+    install_query_instrumentation()
+    stats = QueryStats(label)
+    token = _current.set(stats)
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.elapsed_ms = (time.perf_counter() - started) * 1000
+        _current.reset(token)
+        if log:
+            log_query_stats(stats.to_dict())
@@ -10,11 +10,12 @@ Models:
 - MonthlyResult: Actual monthly results per agency and KPI
 - MonthlyReview: Notes and feedback for monthly reviews
 - ActionItem: Checklist items for action plans
+- AgencyKPIStatus: Precomputed target vs result status per agency, month and KPI
 """
 from datetime import datetime, date
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, Float,
-    Date, DateTime, ForeignKey, UniqueConstraint
+    Date, DateTime, ForeignKey, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from db.database import Base
@@ -61,6 +62,11 @@ class AgencyManager(Base):
     end_date = Column(Date, nullable=True)  # NULL means currently active
     active = Column(Boolean, default=True, nullable=False)
 
+    # Active manager lookup per agency
+    __table_args__ = (
+        Index('ix_agency_managers_agency_active', 'agency_id', 'active'),
+    )
+
     # Relationships
     agency = relationship("Agency", back_populates="managers")
 
@@ -130,8 +136,11 @@ class MonthlyTarget(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Unique constraint: one target per agency/year/month/kpi combination
+    # (also serves the agency-first access order). The period index covers
+    # roll-ups across all agencies for a given (year, month).
     __table_args__ = (
         UniqueConstraint('agency_id', 'year', 'month', 'kpi_id', name='uq_monthly_target'),
+        Index('ix_monthly_targets_period', 'year', 'month', 'agency_id', 'kpi_id', 'target_value'),
     )
 
     # Relationships
@@ -159,8 +168,11 @@ class MonthlyResult(Base):
     recorded_by = Column(String(255), nullable=True)  # Optional: who recorded this
 
     # Unique constraint: one result per agency/year/month/kpi combination
+    # (also serves the agency-first access order). The period index covers
+    # roll-ups across all agencies for a given (year, month).
     __table_args__ = (
         UniqueConstraint('agency_id', 'year', 'month', 'kpi_id', name='uq_monthly_result'),
+        Index('ix_monthly_results_period', 'year', 'month', 'agency_id', 'kpi_id', 'actual_value'),
     )
 
     # Relationships
@@ -189,6 +201,7 @@ class MonthlyReview(Base):
     # Unique constraint: one review per agency/year/month combination
     __table_args__ = (
         UniqueConstraint('agency_id', 'year', 'month', name='uq_monthly_review'),
+        Index('ix_monthly_reviews_period', 'year', 'month', 'agency_id'),
     )
 
     # Relationships
@@ -213,6 +226,12 @@ class ActionItem(Base):
     done = Column(Boolean, default=False, nullable=False)
     done_at = Column(DateTime, nullable=True)  # When it was marked as done
 
+    # Lookups by agency and period, and by period across all agencies
+    __table_args__ = (
+        Index('ix_action_items_agency_period', 'agency_id', 'year', 'month'),
+        Index('ix_action_items_period', 'year', 'month', 'agency_id'),
+    )
+
     # Relationships
     agency = relationship("Agency", back_populates="action_items")
 
@@ -220,6 +239,37 @@ class ActionItem(Base):
         return f"<ActionItem(id={self.id}, agency_id={self.agency_id}, '{self.title[:30]}...', done={self.done})>"
 
 
+class AgencyKPIStatus(Base):
+    """
+    Materialized KPI status per agency, year, month, and KPI.
+    One row per assigned KPI with a target or a result in the period, holding
+    the output of compute_kpi_status. Maintained by the tracking service on
+    every target/result/assignment write; rebuilt with scripts/rebuild_kpi_status.py.
+    """
+    __tablename__ = "agency_kpi_status"
+
+    id = Column(Integer, primary_key=True, index=True)
+    agency_id = Column(Integer, ForeignKey("agencies.id", ondelete="CASCADE"), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)  # 1-12
+    kpi_id = Column(Integer, ForeignKey("kpis.id", ondelete="CASCADE"), nullable=False)
+    target_value = Column(Float, nullable=False)  # 0 if no target
+    actual_value = Column(Float, nullable=False)  # 0 if no result
+    diff = Column(Float, nullable=False)
+    pct = Column(Float, nullable=False)
+    status = Column(String(10), nullable=False)  # green, yellow, red
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Same natural key as monthly_targets / monthly_results, plus the period index
+    __table_args__ = (
+        UniqueConstraint('agency_id', 'year', 'month', 'kpi_id', name='uq_agency_kpi_status'),
+        Index('ix_agency_kpi_status_period', 'year', 'month', 'agency_id', 'kpi_id'),
+    )
+
+    def __repr__(self):
+        return f"<AgencyKPIStatus(agency_id={self.agency_id}, {self.year}/{self.month}, kpi_id={self.kpi_id}, status='{self.status}')>"
+
+
 # ============== AUTHENTICATION & AUTHORIZATION MODELS ==============
 
 class User(Base):
@@ -13,17 +13,19 @@ st.set_page_config(
 )
 
 # Import services
-from services.auth_service import needs_security_setup, ensure_admin_exists
+from services.auth_service import ensure_admin_exists
 
 # Import UI modules
-from ui.sidebar import render_sidebar
+from ui.sidebar import render_sidebar, render_query_stats
 from ui import (
     agency_setup, agency_list, targets_setup,
     monthly_review, dashboard, login,
     first_login_security, forgot_password, user_management,
-    dashboard_normal, dashboard_admin
+    dashboard_normal, dashboard_admin, performance
 )
 from services.onboarding_service import update_last_login
+from db.instrumentation import track_queries, current_query_stats
+from services.profiling import profile_section
 
 
 def init_system():
@@ -50,11 +52,14 @@ def main():
         login.render()
         return
 
-    # Get current user
+    # Get current user (None if deactivated since login)
     current_user = login.get_current_user()
+    if current_user is None:
+        login.render()
+        return
 
     # Check if user needs to configure security countries
-    if needs_security_setup(current_user["id"]):
+    if not current_user["security_configured"]:
         first_login_security.render(current_user)
         return
 
@@ -67,32 +72,47 @@ def main():
     # Render sidebar and get current page
     current_page = render_sidebar(current_user)
 
-    # Route to appropriate page
-    if current_page == "dashboard":
-        # Show different dashboard based on role
-        if current_user.get("role") == "ADMIN":
-            dashboard_admin.render(current_user)
-        else:
-            dashboard_normal.render(current_user)
+    query_stats = current_query_stats()
+    if query_stats is not None:
+        query_stats.label = f"page:{current_page}"
 
-    elif current_page == "agency_list":
-        agency_list.render(current_user)
+    # Route to appropriate page (timed per page, see services/profiling.py)
+    with profile_section(f"page:{current_page}", capture=True):
+        if current_page == "dashboard":
+            # Show different dashboard based on role
+            if current_user.get("role") == "ADMIN":
+                dashboard_admin.render(current_user)
+            else:
+                dashboard_normal.render(current_user)
 
-    elif current_page == "agency_setup":
-        agency_setup.render(current_user)
+        elif current_page == "agency_list":
+            agency_list.render(current_user)
 
-    elif current_page == "targets_setup":
-        targets_setup.render(current_user)
+        elif current_page == "agency_setup":
+            agency_setup.render(current_user)
 
-    elif current_page == "monthly_review":
-        monthly_review.render(current_user)
+        elif current_page == "targets_setup":
+            targets_setup.render(current_user)
 
-    elif current_page == "user_management":
-        user_management.render(current_user)
+        elif current_page == "monthly_review":
+            monthly_review.render(current_user)
 
-    else:
-        st.error(f"Página no encontrada: {current_page}")
+        elif current_page == "user_management":
+            user_management.render(current_user)
+
+        elif current_page == "performance":
+            performance.render(current_user)
+
+        else:
+            st.error(f"Página no encontrada: {current_page}")
 
 
 if __name__ == "__main__":
-    main()
+    # SQL statements of this rerun: structured log line, and a debug panel for admins
+    with track_queries("rerun") as rerun_stats:
+        main()
+
+    rerun_user = login.get_current_user() if login.is_authenticated() else None
+    if rerun_user and rerun_user.get("role") == "ADMIN":
+        with st.sidebar:
+            render_query_stats(rerun_stats.to_dict())
@@ -0,0 +1,157 @@
+"""
+Benchmark of the hot tracking queries with and without the composite period
+indexes (see scripts/migrate_add_period_indexes.py).
+
+For each query it prints the query plan and the average execution time, first
+with the indexes in place and then with them dropped inside a transaction
+that is rolled back at the end, so the database is left unchanged.
+Works on SQLite (EXPLAIN QUERY PLAN) and PostgreSQL (EXPLAIN ANALYZE).
+
+Note: on PostgreSQL dropping an index takes an exclusive lock on its table
+until the rollback; run this against a copy or outside business hours.
+
+Usage:
+    python -m scripts.benchmark_indexes
+    python -m scripts.benchmark_indexes --repeat 50
+"""
+import sys
+import os
+import argparse
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, inspect
+from db.database import engine
+from scripts.migrate_add_period_indexes import get_period_indexes
+
+
+# Hot queries issued by the services, by access order
+QUERIES = {
+    "targets by agency/period": """
+        SELECT kpi_id, target_value FROM monthly_targets
+        WHERE agency_id = :agency_id AND year = :year AND month = :month
+    """,
+    "targets by period (all agencies)": """
+        SELECT agency_id, kpi_id, target_value FROM monthly_targets
+        WHERE year = :year AND month = :month
+    """,
+    "results by period (all agencies)": """
+        SELECT agency_id, kpi_id, actual_value FROM monthly_results
+        WHERE year = :year AND month = :month
+    """,
+    "reviews by period (all agencies)": """
+        SELECT agency_id, what_happened, improvement_plan FROM monthly_reviews
+        WHERE year = :year AND month = :month
+    """,
+    "action items by agency/period": """
+        SELECT id, title, done FROM action_items
+        WHERE agency_id = :agency_id AND year = :year AND month = :month
+        ORDER BY id
+    """,
+    "action items by period (all agencies)": """
+        SELECT agency_id, id, title, done FROM action_items
+        WHERE year = :year AND month = :month
+        ORDER BY id
+    """,
+    "active manager by agency": """
+        SELECT id, full_name FROM agency_managers
+        WHERE agency_id = :agency_id AND active = :active
+    """,
+}
+
+
+def get_sample_params(conn) -> dict:
+    """Pick an existing agency and period to query."""
+    row = conn.execute(text(
+        "SELECT agency_id, year, month FROM monthly_targets ORDER BY id LIMIT 1"
+    )).first()
+    if row is None:
+        raise RuntimeError("No hay objetivos en la base de datos; cargue datos primero")
+    return {"agency_id": row[0], "year": row[1], "month": row[2], "active": True}
+
+
+def explain(conn, sql: str, params: dict, label: str) -> list:
+    """Return the query plan lines for a statement."""
+    if engine.dialect.name == "sqlite":
+        # The label makes the statement text unique per phase: pysqlite caches
+        # prepared statements and a cached EXPLAIN is not re-planned after DDL
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN /* {label} */ " + sql), params).fetchall()
+        return [row[-1] for row in rows]
+    rows = conn.execute(text("EXPLAIN (ANALYZE, BUFFERS) " + sql), params).fetchall()
+    return [row[0] for row in rows]
+
+
+def time_query(conn, sql: str, params: dict, repeat: int) -> float:
+    """Return the average execution time in milliseconds."""
+    statement = text(sql)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(statement, params).fetchall()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def run_queries(conn, params: dict, repeat: int, label: str) -> dict:
+    """Print plan and timing of every query; return timings by name."""
+    timings = {}
+    for name, sql in QUERIES.items():
+        timings[name] = time_query(conn, sql, params, repeat)
+        print(f"\n  ▶ {name}: {timings[name]:.3f} ms")
+        for line in explain(conn, sql, params, label):
+            print(f"      {line}")
+    return timings
+
+
+def main():
+    """Run the benchmark with and without the period indexes."""
+    parser = argparse.ArgumentParser(description="Planes y tiempos con/sin índices de periodo")
+    parser.add_argument("--repeat", type=int, default=20, help="Ejecuciones por consulta")
+    args = parser.parse_args()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+
+    inspector = inspect(engine)
+    missing = [
+        index.name for index in get_period_indexes()
+        if index.name not in {i["name"] for i in inspector.get_indexes(index.table.name)}
+    ]
+    if missing:
+        print(f"⚠️  Faltan índices ({', '.join(missing)}).")
+        print("   Ejecute primero: python scripts/migrate_add_period_indexes.py")
+        sys.exit(1)
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        if engine.dialect.name == "sqlite":
+            # pysqlite does not open a transaction before DDL on its own
+            conn.exec_driver_sql("BEGIN")
+        try:
+            params = get_sample_params(conn)
+            print(f"Parámetros: {params}")
+
+            print("\n" + "=" * 50)
+            print("📈 Con índices")
+            print("=" * 50)
+            with_indexes = run_queries(conn, params, args.repeat, "with")
+
+            for index in get_period_indexes():
+                conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+            print("\n" + "=" * 50)
+            print("📉 Sin índices")
+            print("=" * 50)
+            without_indexes = run_queries(conn, params, args.repeat, "without")
+        finally:
+            trans.rollback()
+
+    print("\n" + "=" * 50)
+    print("📊 Resumen (ms promedio)")
+    print("=" * 50)
+    print(f"  {'consulta':40} {'sin':>10} {'con':>10}")
+    for name in QUERIES:
+        print(f"  {name:40} {without_indexes[name]:10.3f} {with_indexes[name]:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
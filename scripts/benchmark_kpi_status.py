@@ -0,0 +1,147 @@
+"""
+Equivalence check and benchmark of compute_kpi_status_array (vectorized)
+against compute_kpi_status (scalar), both in services/utils.py.
+
+1. Property check: random batches mixing edge values (zero, negative and
+   fractional targets, exact threshold hits, NaN) must give exactly the same
+   diff, pct and status as the scalar function, cell by cell.
+2. Benchmark: time both versions over a roll-up sized input
+   (agencies x KPIs x months cells).
+
+Exits with status 1 if any cell differs. Does not touch the database.
+
+Usage:
+    python -m scripts.benchmark_kpi_status
+    python -m scripts.benchmark_kpi_status --cells 200000 --batches 500
+"""
+import sys
+import os
+import argparse
+import math
+import random
+import time
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.utils import (
+    compute_kpi_status, compute_kpi_status_array, THRESHOLD_GREEN, THRESHOLD_YELLOW
+)
+
+
+# Values that exercise every branch of compute_kpi_status
+EDGE_VALUES = [
+    0, 0.0, -0.0, 1, -1, -100, 0.5, 1e-9, 1e12,
+    THRESHOLD_GREEN, THRESHOLD_YELLOW, THRESHOLD_YELLOW - 1e-9, float("nan")
+]
+
+
+def random_value(rnd: random.Random):
+    """Pick an edge value, an integer or a float."""
+    kind = rnd.random()
+    if kind < 0.3:
+        return rnd.choice(EDGE_VALUES)
+    if kind < 0.6:
+        return rnd.randint(-10, 1000)
+    return rnd.uniform(-100, 10000)
+
+
+def same_number(a: float, b: float) -> bool:
+    """Exact equality, treating NaN as equal to NaN."""
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    return a == b
+
+
+def check_equivalence(batches: int, seed: int) -> int:
+    """Compare both versions on random batches; return the number of mismatches."""
+    rnd = random.Random(seed)
+    mismatches = 0
+    cells = 0
+
+    for _ in range(batches):
+        size = rnd.randint(0, 200)
+        targets = [random_value(rnd) for _ in range(size)]
+        actuals = [random_value(rnd) for _ in range(size)]
+        # Exact threshold hits: actual = target * pct / 100
+        for i in range(0, size, 10):
+            if rnd.random() < 0.5 and targets[i] > 0:
+                actuals[i] = targets[i] * rnd.choice([THRESHOLD_GREEN, THRESHOLD_YELLOW]) / 100
+
+        diffs, pcts, statuses = compute_kpi_status_array(targets, actuals)
+        for target, actual, diff, pct, status in zip(
+            targets, actuals, diffs.tolist(), pcts.tolist(), statuses.tolist()
+        ):
+            cells += 1
+            expected = compute_kpi_status(target, actual)
+            if not (
+                same_number(float(expected[0]), diff)
+                and same_number(float(expected[1]), pct)
+                and expected[2] == status
+            ):
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"  ❌ target={target!r} actual={actual!r}: "
+                          f"escalar={expected} vectorizado={(diff, pct, status)}")
+
+    print(f"  Celdas comparadas: {cells}, diferencias: {mismatches}")
+    return mismatches
+
+
+def benchmark(cells: int, repeat: int, seed: int) -> None:
+    """Time the scalar loop and the vectorized version over the same cells."""
+    rnd = random.Random(seed)
+    targets = [rnd.choice([0, 100, 250, 1200]) * 1.0 for _ in range(cells)]
+    actuals = [rnd.uniform(0, 1500) for _ in range(cells)]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        [compute_kpi_status(t, a) for t, a in zip(targets, actuals)]
+    scalar_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compute_kpi_status_array(targets, actuals)
+    vector_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    # Inputs already in NumPy arrays (e.g. DataFrame columns): no list conversion
+    target_array, actual_array = np.asarray(targets), np.asarray(actuals)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compute_kpi_status_array(target_array, actual_array)
+    array_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    print(f"  {cells} celdas, {repeat} repeticiones")
+    print(f"  Escalar:                 {scalar_ms:10.2f} ms")
+    print(f"  Vectorizado (listas):    {vector_ms:10.2f} ms ({scalar_ms / vector_ms:.1f}x)")
+    print(f"  Vectorizado (arrays):    {array_ms:10.2f} ms ({scalar_ms / array_ms:.1f}x)")
+
+
+def main():
+    """Run the equivalence check and the benchmark."""
+    parser = argparse.ArgumentParser(description="Equivalencia y rendimiento de compute_kpi_status_array")
+    parser.add_argument("--batches", type=int, default=200, help="Lotes aleatorios a comparar")
+    parser.add_argument("--cells", type=int, default=50000, help="Celdas del benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones del benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🔍 Equivalencia escalar vs vectorizado")
+    print("=" * 50)
+    mismatches = check_equivalence(args.batches, args.seed)
+
+    print("\n" + "=" * 50)
+    print("⏱️  Rendimiento")
+    print("=" * 50)
+    benchmark(args.cells, args.repeat, args.seed)
+
+    if mismatches:
+        print("\n❌ El resultado vectorizado difiere del escalar.")
+        sys.exit(1)
+    print("\n✅ Resultados idénticos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark of the parallel all-agencies builders (see services/parallel.py).
+
+For each agency count, seeds a temporary SQLite database (agencies, managers,
+KPIs, targets, results, reviews and action items) and times, sequential vs
+parallel:
+    - per-agency: get_agency_dashboard_data once per agency (several round
+      trips each), in a loop vs on the bounded thread pool (map_ordered)
+    - get_agencies_dashboard_data (set-based, chunked when parallel)
+    - get_all_agencies_summary (set-based, chunked when parallel)
+
+Parallel results must be identical to the sequential ones, in the same order.
+Exits with status 1 otherwise. The configured DATABASE_URL is not touched.
+
+Usage:
+    python -m scripts.benchmark_parallel_dashboard
+    python -m scripts.benchmark_parallel_dashboard --agencies 50 200 --workers 8 --wal
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, datetime
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Time the database work: disable the process-wide cache (read at import)
+os.environ["CACHE_TTL_SECONDS"] = "0"
+
+from sqlalchemy import create_engine
+from db.database import Base, SessionLocal, configure_sqlite_performance, get_pool_capacity
+from db.models import (
+    Agency, AgencyManager, AgencyKPI, KPI, MonthlyTarget, MonthlyResult,
+    MonthlyReview, ActionItem
+)
+from services.dashboard_service import get_agency_dashboard_data, get_agencies_dashboard_data
+from services.tracking_service import get_all_agencies_summary, refresh_kpi_status
+from services.parallel import get_worker_count, map_ordered
+
+
+YEAR = 2026
+MONTH = 3
+KPI_CODES = ["CS", "RIA", "MG", "CORNERS", "SEG"]
+
+
+def seed(agencies: int, seed_value: int) -> list:
+    """Create a month of data for the given number of agencies; return their IDs."""
+    rnd = random.Random(seed_value)
+    db = SessionLocal()
+    try:
+        kpis = [KPI(code=code, label=code, unit="units") for code in KPI_CODES]
+        db.add_all(kpis)
+        db.flush()
+
+        agency_ids = []
+        for i in range(agencies):
+            agency = Agency(name=f"Agencia {i:04d}", city=f"Ciudad {i % 10}", active=True)
+            db.add(agency)
+            db.flush()
+            agency_ids.append(agency.id)
+            db.add(AgencyManager(
+                agency_id=agency.id, full_name=f"Jefe {i:04d}",
+                start_date=date(2024, 1, 1), active=True
+            ))
+            for kpi in kpis:
+                db.add(AgencyKPI(agency_id=agency.id, kpi_id=kpi.id, active=True))
+                db.add(MonthlyTarget(
+                    agency_id=agency.id, year=YEAR, month=MONTH,
+                    kpi_id=kpi.id, target_value=100.0
+                ))
+                db.add(MonthlyResult(
+                    agency_id=agency.id, year=YEAR, month=MONTH, kpi_id=kpi.id,
+                    actual_value=float(rnd.randint(60, 130)),
+                    recorded_at=datetime.utcnow(), recorded_by="benchmark"
+                ))
+            if rnd.random() < 0.5:
+                db.add(MonthlyReview(
+                    agency_id=agency.id, year=YEAR, month=MONTH,
+                    review_date=date(YEAR, MONTH, 28),
+                    what_happened="Mes normal", improvement_plan="Seguir"
+                ))
+            for n in range(rnd.randint(0, 3)):
+                db.add(ActionItem(
+                    agency_id=agency.id, year=YEAR, month=MONTH,
+                    title=f"Acción {n + 1}", done=rnd.random() < 0.5
+                ))
+
+        refresh_kpi_status(db)
+        db.commit()
+        return agency_ids
+    finally:
+        db.close()
+
+
+def timed(func, repeat: int):
+    """Run func repeat times; return (best time in ms, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_size(agencies: int, args) -> bool:
+    """Benchmark one agency count on a fresh database; return True if results match."""
+    tmpdir = tempfile.mkdtemp(prefix="bench_parallel_")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+        connect_args={"check_same_thread": False}
+    )
+    if args.wal:
+        configure_sqlite_performance(engine)
+
+    SessionLocal.configure(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    agency_ids = seed(agencies, args.seed)
+
+    workers = get_worker_count(args.workers)
+    print(f"\n⏳ {agencies} agencias, {workers} hilo(s) (capacidad del pool: {get_pool_capacity()})")
+
+    cases = [
+        (
+            "por agencia",
+            lambda: [get_agency_dashboard_data.uncached(a, YEAR, MONTH) for a in agency_ids],
+            lambda: map_ordered(
+                lambda a: get_agency_dashboard_data.uncached(a, YEAR, MONTH), agency_ids, workers
+            )
+        ),
+        (
+            "dashboard (conjuntos)",
+            lambda: get_agencies_dashboard_data(YEAR, MONTH, workers=1),
+            lambda: get_agencies_dashboard_data(YEAR, MONTH, workers=workers)
+        ),
+        (
+            "resumen (conjuntos)",
+            lambda: get_all_agencies_summary.uncached(YEAR, MONTH, workers=1),
+            lambda: get_all_agencies_summary.uncached(YEAR, MONTH, workers=workers)
+        ),
+    ]
+
+    identical = True
+    print(f"  {'':24} {'secuencial':>12} {'paralelo':>12} {'aceleración':>12}")
+    for label, sequential, parallel in cases:
+        sequential_ms, expected = timed(sequential, args.repeat)
+        parallel_ms, result = timed(parallel, args.repeat)
+        same = result == expected
+        identical = identical and same
+        print(f"  {label:24} {sequential_ms:9.1f} ms {parallel_ms:9.1f} ms "
+              f"{sequential_ms / parallel_ms:11.2f}x{'' if same else '  ❌ resultados distintos'}")
+
+    engine.dispose()
+    return identical
+
+
+def main():
+    """Run the benchmark for every agency count."""
+    parser = argparse.ArgumentParser(description="Constructores secuenciales vs paralelos")
+    parser.add_argument("--agencies", type=int, nargs="+", default=[50, 200, 1000], help="Cantidades de agencias")
+    parser.add_argument("--workers", type=int, default=8, help="Hilos en modo paralelo (limitados por el pool)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones (se toma la mejor)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla aleatoria")
+    parser.add_argument("--wal", action="store_true", help="Usar el perfil de rendimiento SQLite (WAL)")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("⏱️  Construcción secuencial vs paralela")
+    print("=" * 50)
+    results = [run_size(agencies, args) for agencies in args.agencies]
+
+    if not all(results):
+        print("\n❌ El modo paralelo devolvió resultados distintos.")
+        sys.exit(1)
+    print("\n✅ Resultados idénticos y en el mismo orden.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Calibrate the bcrypt work factor (AUTH_BCRYPT_ROUNDS) for this host.
+
+Times bcrypt hashing at increasing costs and picks the highest one whose
+median time stays within the latency budget of one login (--target-ms).
+Run it on the deployment host: the result depends on its CPU.
+
+The chosen cost is printed and, with --env-file, written to that file
+(AUTH_BCRYPT_ROUNDS=...). After restarting the app with the new value,
+existing hashes keep working and are rehashed at the new cost on each
+user's next successful login (see authenticate_user); --report-users shows
+how many users are still on another cost.
+
+Usage:
+    python -m scripts.calibrate_bcrypt
+    python -m scripts.calibrate_bcrypt --target-ms 300 --env-file .env --report-users
+"""
+import sys
+import os
+import re
+import argparse
+import statistics
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.password_hashing import get_crypt_context, AUTH_BCRYPT_ROUNDS
+
+
+# Below this cost bcrypt is too cheap to brute force
+MIN_SAFE_ROUNDS = 10
+SAMPLE_PASSWORD = "Calibrate2026@"
+
+
+def time_rounds(rounds: int, samples: int) -> float:
+    """Median time in ms of one bcrypt hash at the given cost."""
+    context = get_crypt_context(rounds)
+    context.hash(SAMPLE_PASSWORD)  # Load the backend outside the measurement
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int, max_rounds: int, samples: int):
+    """Time each cost; return the highest one within target_ms (None if none is)."""
+    print(f"  {'rounds':>6} {'ms':>9} {'logins/s por núcleo':>20}")
+    chosen = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed_ms = time_rounds(rounds, samples)
+        within = elapsed_ms <= target_ms
+        print(f"  {rounds:6} {elapsed_ms:9.1f} {1000 / elapsed_ms:20.1f}{'' if within else '  (fuera de presupuesto)'}")
+        if within:
+            chosen = rounds
+        else:
+            # Each extra round doubles the time: the next ones are slower still
+            break
+    return chosen
+
+
+def write_env_file(path: str, rounds: int) -> None:
+    """Set AUTH_BCRYPT_ROUNDS in an env file (replacing any previous value)."""
+    line = f"AUTH_BCRYPT_ROUNDS={rounds}"
+    content = ""
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+
+    pattern = re.compile(r"^AUTH_BCRYPT_ROUNDS=.*$", re.MULTILINE)
+    if pattern.search(content):
+        content = pattern.sub(line, content)
+    else:
+        content = content + ("" if not content or content.endswith("\n") else "\n") + line + "\n"
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def report_users(rounds: int) -> None:
+    """Print how many users have a hash at a cost other than rounds."""
+    from db.database import SessionLocal
+    from db.models import User
+
+    context = get_crypt_context(rounds)
+    db = SessionLocal()
+    try:
+        hashes = [h for (h,) in db.query(User.password_hash).all()]
+    finally:
+        db.close()
+
+    pending = sum(1 for h in hashes if context.needs_update(h))
+    print(f"\n👥 Usuarios: {len(hashes)}, con otro coste: {pending} "
+          "(se actualizan en su próximo inicio de sesión)")
+
+
+def main():
+    """Calibrate and report (or store) the bcrypt cost."""
+    parser = argparse.ArgumentParser(description="Calibrar el coste de bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250, help="Presupuesto por hash (ms)")
+    parser.add_argument("--min-rounds", type=int, default=MIN_SAFE_ROUNDS, help="Coste mínimo aceptable")
+    parser.add_argument("--max-rounds", type=int, default=16, help="Coste máximo a probar")
+    parser.add_argument("--samples", type=int, default=5, help="Mediciones por coste (se toma la mediana)")
+    parser.add_argument("--env-file", help="Guardar AUTH_BCRYPT_ROUNDS en este fichero (p. ej. .env)")
+    parser.add_argument("--report-users", action="store_true", help="Contar usuarios con otro coste en la BD")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🔐 Calibración de bcrypt")
+    print("=" * 50)
+    print(f"Presupuesto: {args.target_ms:.0f} ms · coste actual: {AUTH_BCRYPT_ROUNDS}\n")
+
+    rounds = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    if rounds is None:
+        rounds = args.min_rounds
+        print(f"\n⚠️  Ni el coste mínimo ({rounds}) cabe en el presupuesto; se usa igualmente.")
+    print(f"\n✅ Coste recomendado: AUTH_BCRYPT_ROUNDS={rounds}")
+
+    if args.env_file:
+        write_env_file(args.env_file, rounds)
+        print(f"💾 Guardado en {args.env_file} (reinicie la aplicación para aplicarlo)")
+
+    if args.report_users:
+        report_users(rounds)
+
+
+if __name__ == "__main__":
+    main()
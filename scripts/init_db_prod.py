@@ -17,7 +17,7 @@ from db.database import engine, Base
 from db.models import (  # noqa: F401
     Agency, AgencyManager, KPI, AgencyKPI, 
     MonthlyTarget, MonthlyResult, MonthlyReview, 
-    ActionItem, User, Country
+    ActionItem, AgencyKPIStatus, User, Country
 )
 from sqlalchemy import inspect
 
@@ -55,6 +55,12 @@ def init_database():
         Base.metadata.create_all(bind=engine)
         
         print("\n✅ ¡Tablas creadas correctamente!")
+
+        # On existing data, the materialized KPI status starts empty
+        if AgencyKPIStatus.__tablename__ in tables_to_create:
+            from services.tracking_service import rebuild_kpi_status
+            print("\n⏳ Calculando estado de KPIs (agency_kpi_status)...")
+            print(f"✅ {rebuild_kpi_status()} fila(s) de estado calculadas")
         print("\nTablas en la base de datos:")
         inspector = inspect(engine)
         for table in sorted(inspector.get_table_names()):
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.database import SessionLocal
 from db.models import KPI
+from services.cache import invalidate
 
 
 # Default KPIs to seed
@@ -71,6 +72,7 @@ def seed_kpis():
                 created_count += 1
 
         db.commit()
+        invalidate("kpis")
         print(f"\nDone! Created: {created_count}, Skipped: {skipped_count}")
 
     except Exception as e:
@@ -0,0 +1,68 @@
+"""
+Script to load a yearly targets plan for many agencies at once.
+Reads a CSV or Parquet file with columns: agency, year, month, kpi, target_value
+(agency by name, kpi by code). The file is validated against the KPIs assigned
+to each agency and written in a single transaction; nothing is written if any
+row is invalid. Existing targets for the same agency/month/KPI are overwritten.
+
+Usage:
+    python -m scripts.load_targets plan_2026.csv
+    python -m scripts.load_targets plan_2026.parquet --dry-run
+    python -m scripts.load_targets plan_2026.csv --chunk-size 1000
+"""
+import sys
+import os
+import argparse
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.planning_service import (
+    load_plan_file,
+    PlanningServiceError,
+    DEFAULT_CHUNK_SIZE
+)
+
+
+# Maximum number of validation errors printed
+MAX_ERRORS_SHOWN = 50
+
+
+def main():
+    """Load a yearly targets plan from a file."""
+    parser = argparse.ArgumentParser(description="Carga masiva de objetivos anuales")
+    parser.add_argument("path", help="Archivo .csv o .parquet con el plan")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Filas por sentencia (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Solo validar, sin escribir en la base de datos")
+    args = parser.parse_args()
+
+    print(f"⏳ Cargando plan desde {args.path}...")
+    started = time.perf_counter()
+
+    try:
+        summary = load_plan_file(args.path, chunk_size=args.chunk_size, dry_run=args.dry_run)
+    except PlanningServiceError as e:
+        print(f"\n❌ {e}")
+        for error in e.errors[:MAX_ERRORS_SHOWN]:
+            print(f"  - {error}")
+        if len(e.errors) > MAX_ERRORS_SHOWN:
+            print(f"  ... y {len(e.errors) - MAX_ERRORS_SHOWN} error(es) más")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - started
+
+    print(f"\n✅ Plan válido: {summary['rows']} objetivo(s)")
+    print(f"  - Agencias: {summary['agencies']}")
+    print(f"  - KPIs: {summary['kpis']}")
+    print(f"  - Meses: {summary['months']}")
+    if args.dry_run:
+        print("\n(dry-run) No se escribió nada en la base de datos.")
+    else:
+        print(f"\n💾 {summary['written']} objetivo(s) guardados en {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
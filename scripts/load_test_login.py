@@ -0,0 +1,154 @@
+"""
+Load test of concurrent logins (see services/password_hashing.py).
+
+Seeds a temporary SQLite database with N users, then releases N threads at
+once, each calling authenticate_user (one bcrypt verification plus the
+failed-attempts update), and reports throughput and latency percentiles.
+Each user count runs twice: hashing inline in the calling threads
+(AUTH_HASH_WORKERS=0) and on the hashing process pool.
+
+bcrypt is CPU bound: throughput is capped by the cores available to the
+hashing (inline threads share the server process with page renders; the
+pool moves that work to other processes). Logins rejected because the pool
+is saturated (AUTH_HASH_MAX_CONCURRENCY / AUTH_HASH_QUEUE_TIMEOUT) are
+counted as "ocupado". The configured DATABASE_URL is not touched.
+
+Usage:
+    python -m scripts.load_test_login
+    python -m scripts.load_test_login --users 50 200 --workers 4 --max-concurrency 64
+"""
+import sys
+import os
+import argparse
+import tempfile
+import threading
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from db.database import Base, SessionLocal
+from db.models import User
+from services.auth_service import authenticate_user, AuthServiceError
+from services import password_hashing
+
+
+PASSWORD = "LoadTest2026@"
+
+
+def seed(users: int) -> list:
+    """Create the users (sharing one hash); return their usernames."""
+    usernames = [f"login_{i:04d}" for i in range(users)]
+    password_hash = password_hashing.pwd_context.hash(PASSWORD)
+    db = SessionLocal()
+    try:
+        db.execute(insert(User), [
+            {"username": username, "password_hash": password_hash, "role": "NORMAL", "active": True}
+            for username in usernames
+        ])
+        db.commit()
+        return usernames
+    finally:
+        db.close()
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_logins(usernames: list) -> dict:
+    """Log every user in at the same time; return the timings."""
+    barrier = threading.Barrier(len(usernames) + 1)
+    latencies = []
+    outcome = {"ok": 0, "fallidos": 0, "ocupado": 0}
+    lock = threading.Lock()
+
+    def login(username: str):
+        barrier.wait()
+        started = time.perf_counter()
+        try:
+            result = "ok" if authenticate_user(username, PASSWORD) else "fallidos"
+        except AuthServiceError as e:
+            result = "ocupado" if "ocupado" in str(e) else "fallidos"
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            outcome[result] += 1
+
+    threads = [threading.Thread(target=login, args=(u,)) for u in usernames]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return dict(
+        outcome,
+        wall_s=wall,
+        throughput=outcome["ok"] / wall,
+        p50_ms=percentile(latencies, 50),
+        p95_ms=percentile(latencies, 95),
+        max_ms=latencies[-1]
+    )
+
+
+def run_size(users: int, args) -> None:
+    """Load test one user count on a fresh database, inline and on the pool."""
+    tmpdir = tempfile.mkdtemp(prefix="load_login_")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(tmpdir, 'login.db')}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=5, max_overflow=15, pool_timeout=60
+    )
+    SessionLocal.configure(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    usernames = seed(users)
+
+    print(f"\n⏳ {users} inicios de sesión simultáneos")
+    print(f"  {'modo':16} {'ok':>5} {'ocupado':>8} {'fallidos':>9} {'total (s)':>10} "
+          f"{'logins/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+
+    modes = [("en línea", 0), (f"pool ({args.workers} proc.)", args.workers)]
+    for label, workers in modes:
+        password_hashing.configure_hashing(
+            workers=workers, max_concurrency=args.max_concurrency, queue_timeout=args.queue_timeout
+        )
+        password_hashing.warm_up_hashing_pool()
+        r = run_logins(usernames)
+        print(f"  {label:16} {r['ok']:5} {r['ocupado']:8} {r['fallidos']:9} {r['wall_s']:10.2f} "
+              f"{r['throughput']:9.1f} {r['p50_ms']:9.0f} {r['p95_ms']:9.0f}")
+
+    password_hashing.shutdown_hashing_pool()
+    engine.dispose()
+
+
+def main():
+    """Run the load test for every user count."""
+    parser = argparse.ArgumentParser(description="Prueba de carga de inicios de sesión")
+    parser.add_argument("--users", type=int, nargs="+", default=[50, 200], help="Usuarios simultáneos")
+    parser.add_argument("--workers", type=int, default=password_hashing.AUTH_HASH_WORKERS or 1,
+                        help="Procesos del pool de hashing")
+    parser.add_argument("--max-concurrency", type=int, default=password_hashing.AUTH_HASH_MAX_CONCURRENCY,
+                        help="Operaciones de hashing en curso o en cola")
+    parser.add_argument("--queue-timeout", type=float, default=password_hashing.AUTH_HASH_QUEUE_TIMEOUT,
+                        help="Segundos de espera por un hueco")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🔐 Prueba de carga: inicio de sesión concurrente")
+    print("=" * 50)
+    print(f"CPUs: {os.cpu_count()}")
+    for users in args.users:
+        run_size(users, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Migration script to add composite indexes for the (agency, year, month) and
+(year, month) access patterns on the tracking tables.
+Run this script once on databases created before the indexes were declared
+in db/models.py (new databases get them from create_all).
+Idempotent: existing indexes are skipped. Works on SQLite and PostgreSQL.
+
+Usage:
+    python scripts/migrate_add_period_indexes.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+from db.models import AgencyManager, MonthlyTarget, MonthlyResult, MonthlyReview, ActionItem
+from sqlalchemy import inspect
+
+
+# Indexes added by this migration (declared in db/models.py)
+PERIOD_INDEX_NAMES = [
+    "ix_monthly_targets_period",
+    "ix_monthly_results_period",
+    "ix_monthly_reviews_period",
+    "ix_action_items_agency_period",
+    "ix_action_items_period",
+    "ix_agency_managers_agency_active",
+]
+
+
+def get_period_indexes():
+    """Return the Index objects added by this migration."""
+    indexes = []
+    for model in (AgencyManager, MonthlyTarget, MonthlyResult, MonthlyReview, ActionItem):
+        indexes.extend(
+            idx for idx in model.__table__.indexes if idx.name in PERIOD_INDEX_NAMES
+        )
+    return indexes
+
+
+def run_migration():
+    """Create the composite period indexes that do not exist yet."""
+    print("🚀 Starting migration: Add composite period indexes")
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for index in get_period_indexes():
+            table = index.table.name
+            existing = {i["name"] for i in inspector.get_indexes(table)}
+
+            if index.name in existing:
+                print(f"  → Index '{index.name}' already exists")
+                continue
+
+            columns = ", ".join(c.name for c in index.columns)
+            print(f"  → Creating '{index.name}' on {table} ({columns})...")
+            index.create(bind=conn)
+            print(f"    ✅ Index '{index.name}' created")
+
+        # Refresh planner statistics so the new indexes are considered
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+        elif engine.dialect.name == "postgresql":
+            for model in (AgencyManager, MonthlyTarget, MonthlyResult, MonthlyReview, ActionItem):
+                conn.exec_driver_sql(f"ANALYZE {model.__tablename__}")
+
+    print("\n🎉 Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        sys.exit(1)
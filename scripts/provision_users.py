@@ -0,0 +1,76 @@
+"""
+Script to create or update many users and their agency assignments at once.
+Reads a CSV file with columns: username, password, role, agencies[, active]
+(agencies by name, separated by ";"). The file is validated against the
+existing users and agencies and written in a single transaction; nothing is
+written if any row is invalid. See services/provisioning_service.py.
+
+Usage:
+    python -m scripts.provision_users usuarios_region_norte.csv
+    python -m scripts.provision_users usuarios_region_norte.csv --dry-run
+    python -m scripts.provision_users usuarios_region_norte.csv --workers 4
+"""
+import sys
+import os
+import argparse
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.provisioning_service import provision_users_file, ProvisioningServiceError
+from services.password_hashing import configure_hashing
+
+
+# Maximum number of validation errors printed
+MAX_ERRORS_SHOWN = 50
+
+
+def main():
+    """Provision users from a CSV file."""
+    parser = argparse.ArgumentParser(description="Alta masiva de usuarios y asignación de agencias")
+    parser.add_argument("path", help="Archivo .csv con los usuarios")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Solo validar y mostrar los cambios, sin escribir en la base de datos")
+    parser.add_argument("--workers", type=int,
+                        help="Procesos para el hashing de contraseñas (default: AUTH_HASH_WORKERS)")
+    args = parser.parse_args()
+
+    if args.workers is not None:
+        configure_hashing(workers=args.workers)
+
+    print(f"⏳ Importando usuarios desde {args.path}...")
+    started = time.perf_counter()
+
+    try:
+        summary = provision_users_file(args.path, dry_run=args.dry_run)
+    except ProvisioningServiceError as e:
+        print(f"\n❌ {e}")
+        for error in e.errors[:MAX_ERRORS_SHOWN]:
+            print(f"  - {error}")
+        if len(e.errors) > MAX_ERRORS_SHOWN:
+            print(f"  ... y {len(e.errors) - MAX_ERRORS_SHOWN} error(es) más")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - started
+
+    print(f"\n✅ Archivo válido")
+    print(f"  - Nuevos: {len(summary['created'])}")
+    print(f"  - Modificados: {len(summary['updated'])}")
+    print(f"  - Sin cambios: {len(summary['unchanged'])}")
+    print(f"  - Asignaciones: +{summary['assignments_added']} / -{summary['assignments_removed']}")
+    print(f"  - Contraseñas: {summary['passwords_set']}")
+
+    if summary["changes"]:
+        print("\n📋 Cambios:")
+        for username, details in summary["changes"].items():
+            print(f"  - {username}: {', '.join(details)}")
+
+    if args.dry_run:
+        print("\n(dry-run) No se escribió nada en la base de datos.")
+    elif summary["changes"]:
+        print(f"\n💾 Cambios guardados en {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
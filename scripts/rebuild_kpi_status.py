@@ -0,0 +1,52 @@
+"""
+Rebuild the materialized KPI status table (agency_kpi_status).
+
+The table is kept up to date by the tracking service on every target, result
+and KPI assignment write. Run this script once on databases created before
+the table existed, and after changing data outside the services (manual SQL,
+restores, changes to the status thresholds in services/utils.py).
+Creates the table if it does not exist. Idempotent.
+
+Usage:
+    python scripts/rebuild_kpi_status.py
+    python scripts/rebuild_kpi_status.py --year 2026
+    python scripts/rebuild_kpi_status.py --year 2026 --month 3 --agency-id 12
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+from db.models import AgencyKPIStatus
+from services.tracking_service import rebuild_kpi_status, TrackingServiceError
+
+
+def main():
+    """Create the table if needed and rebuild the requested scope."""
+    parser = argparse.ArgumentParser(description="Recalcular la tabla agency_kpi_status")
+    parser.add_argument("--year", type=int, help="Solo este año")
+    parser.add_argument("--month", type=int, help="Solo este mes (1-12)")
+    parser.add_argument("--agency-id", type=int, help="Solo esta agencia")
+    args = parser.parse_args()
+
+    print("🚀 Rebuilding materialized KPI status")
+    AgencyKPIStatus.__table__.create(bind=engine, checkfirst=True)
+
+    scope = {"agency_id": args.agency_id, "year": args.year, "month": args.month}
+    print(f"  → Scope: { {k: v for k, v in scope.items() if v is not None} or 'todo' }")
+
+    try:
+        count = rebuild_kpi_status(**scope)
+    except TrackingServiceError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    print(f"  ✅ {count} status row(s) written")
+    print("\n🎉 Rebuild completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
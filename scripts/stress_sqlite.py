@@ -0,0 +1,202 @@
+"""
+Stress test for the SQLite performance profile (see SQLITE_PERFORMANCE_PROFILE
+in db/database.py).
+
+Runs the same concurrent workload twice on a temporary database, first with
+the default rollback journal and then with the WAL profile:
+    - reader threads call get_monthly_summary on random agencies
+    - one writer thread repeatedly saves results for every agency in one
+      transaction (bulk upsert on monthly_results)
+
+It reports read throughput, read latency and errors for each mode. With WAL,
+readers must keep going (no errors, low max latency) while writes commit.
+The configured DATABASE_URL is not touched.
+
+Usage:
+    python -m scripts.stress_sqlite
+    python -m scripts.stress_sqlite --seconds 20 --readers 8 --agencies 400
+"""
+import sys
+import os
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from db.database import Base, SessionLocal, configure_sqlite_performance
+from db.models import Agency, AgencyKPI, KPI, MonthlyTarget, MonthlyResult
+from services.tracking_service import (
+    get_monthly_summary, bulk_upsert_monthly_rows, refresh_kpi_status
+)
+
+
+YEAR = 2026
+MONTH = 1
+KPI_CODES = ["CS", "RIA", "MG", "CORNERS"]
+
+
+def seed(agencies: int) -> list:
+    """Create KPIs, agencies, assignments and targets; return agency IDs."""
+    db = SessionLocal()
+    try:
+        kpis = [KPI(code=code, label=code, unit="units") for code in KPI_CODES]
+        db.add_all(kpis)
+        db.flush()
+
+        agency_ids = []
+        for i in range(agencies):
+            agency = Agency(name=f"Agencia {i:04d}", city="Stress", active=True)
+            db.add(agency)
+            db.flush()
+            agency_ids.append(agency.id)
+            for kpi in kpis:
+                db.add(AgencyKPI(agency_id=agency.id, kpi_id=kpi.id, active=True))
+                db.add(MonthlyTarget(
+                    agency_id=agency.id, year=YEAR, month=MONTH,
+                    kpi_id=kpi.id, target_value=100.0
+                ))
+
+        refresh_kpi_status(db)
+        db.commit()
+        return agency_ids
+    finally:
+        db.close()
+
+
+def writer_loop(agency_ids: list, kpi_ids: list, stop: threading.Event, stats: dict) -> None:
+    """Save results for every agency in one transaction, until stopped."""
+    rnd = random.Random(1)
+    while not stop.is_set():
+        now = datetime.utcnow()
+        rows = [
+            {
+                "agency_id": agency_id,
+                "year": YEAR,
+                "month": MONTH,
+                "kpi_id": kpi_id,
+                "actual_value": float(rnd.randint(50, 150)),
+                "recorded_at": now,
+                "recorded_by": "stress"
+            }
+            for agency_id in agency_ids
+            for kpi_id in kpi_ids
+        ]
+        db = SessionLocal()
+        try:
+            for start in range(0, len(rows), 500):
+                bulk_upsert_monthly_rows(
+                    db, MonthlyResult, rows[start:start + 500],
+                    ["actual_value", "recorded_at", "recorded_by"]
+                )
+            refresh_kpi_status(db, year=YEAR, month=MONTH)
+            db.commit()
+            stats["writes"] += 1
+        except Exception:
+            db.rollback()
+            stats["write_errors"] += 1
+        finally:
+            db.close()
+
+
+def reader_loop(agency_ids: list, stop: threading.Event, latencies: list, stats: dict) -> None:
+    """Read monthly summaries of random agencies, until stopped."""
+    rnd = random.Random()
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            # Bypass the process-wide cache: the point is to hit the database
+            get_monthly_summary.uncached(rnd.choice(agency_ids), YEAR, MONTH)
+            latencies.append(time.perf_counter() - started)
+        except Exception:
+            stats["read_errors"] += 1
+
+
+def run_mode(name: str, wal: bool, args) -> dict:
+    """Run the workload on a fresh temporary database."""
+    tmpdir = tempfile.mkdtemp(prefix="stress_sqlite_")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(tmpdir, 'stress.db')}",
+        connect_args={"check_same_thread": False}
+    )
+    if wal:
+        configure_sqlite_performance(engine)
+
+    SessionLocal.configure(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    agency_ids = seed(args.agencies)
+
+    db = SessionLocal()
+    try:
+        kpi_ids = [k.id for k in db.query(KPI).all()]
+    finally:
+        db.close()
+
+    stop = threading.Event()
+    stats = {"writes": 0, "write_errors": 0, "read_errors": 0}
+    latencies = []
+
+    threads = [threading.Thread(target=writer_loop, args=(agency_ids, kpi_ids, stop, stats))]
+    threads += [
+        threading.Thread(target=reader_loop, args=(agency_ids, stop, latencies, stats))
+        for _ in range(args.readers)
+    ]
+
+    print(f"\n⏳ {name}: {args.readers} lector(es) + 1 escritor durante {args.seconds}s...")
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    latencies.sort()
+    result = {
+        "reads": len(latencies),
+        "reads_per_s": len(latencies) / args.seconds,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        **stats
+    }
+
+    print(f"  Lecturas: {result['reads']} ({result['reads_per_s']:.0f}/s), errores: {result['read_errors']}")
+    print(f"  Latencia lectura: p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, máx {result['max_ms']:.1f} ms")
+    print(f"  Escrituras: {result['writes']}, errores: {result['write_errors']}")
+    return result
+
+
+def main():
+    """Compare the default journal with the WAL profile."""
+    parser = argparse.ArgumentParser(description="Stress test lectores/escritor en SQLite")
+    parser.add_argument("--seconds", type=float, default=10, help="Duración por modo")
+    parser.add_argument("--readers", type=int, default=4, help="Hilos lectores")
+    parser.add_argument("--agencies", type=int, default=400, help="Agencias a generar")
+    args = parser.parse_args()
+
+    default = run_mode("Journal por defecto", wal=False, args=args)
+    wal = run_mode("Perfil WAL", wal=True, args=args)
+
+    print("\n" + "=" * 50)
+    print("📊 Resumen")
+    print("=" * 50)
+    print(f"  {'':12} {'lect/s':>8} {'p95 ms':>8} {'máx ms':>8} {'errores':>8}")
+    for label, r in (("default", default), ("WAL", wal)):
+        print(f"  {label:12} {r['reads_per_s']:8.0f} {r['p95_ms']:8.1f} {r['max_ms']:8.1f} {r['read_errors']:8}")
+
+    if wal["read_errors"] == 0 and wal["writes"] > 0:
+        print("\n✅ Con WAL los lectores no se bloquearon durante las escrituras.")
+    else:
+        print("\n❌ Con WAL hubo errores de lectura o ninguna escritura completada.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
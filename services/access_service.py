@@ -2,8 +2,25 @@
 Access Service - Authorization and access control.
 """
 from typing import List, Optional, Dict, Any
+from sqlalchemy import select, true
+from sqlalchemy.sql import ColumnElement
 from db.database import SessionLocal
 from db.models import User, UserAgency, Agency
+from services.cache import cached, invalidate
+
+
+# Cache scope of per-user access reads
+USER_SCOPE = ("user_id",)
+
+
+def invalidate_user_access(user_id: int) -> None:
+    """
+    Invalidate cached access reads of a user.
+
+    Args:
+        user_id: User ID
+    """
+    invalidate("access", (user_id,))
 
 
 class AccessServiceError(Exception):
@@ -11,6 +28,59 @@ class AccessServiceError(Exception):
     pass
 
 
+@cached("access", scope=USER_SCOPE, depends_on=("agencies",))
+def get_access_index(user_id: int) -> Dict[str, Any]:
+    """
+    Load what a user may access, in one query returning IDs only.
+    Cached per user; invalidated by the assignment and role write functions
+    and by agency changes.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Dict with all_agencies (True for ADMIN users) and agency_ids, a dict
+        {agency_id: agency active} of the assigned agencies, in agency name
+        order (empty if the user does not exist)
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(User.role, Agency.id, Agency.active).outerjoin(
+            UserAgency, UserAgency.user_id == User.id
+        ).outerjoin(
+            Agency, Agency.id == UserAgency.agency_id
+        ).filter(User.id == user_id).order_by(Agency.name).all()
+
+        return {
+            "all_agencies": bool(rows) and rows[0].role == "ADMIN",
+            "agency_ids": {agency_id: active for _, agency_id, active in rows if agency_id is not None}
+        }
+    finally:
+        db.close()
+
+
+def agency_access_filter(user_id: int, agency_id_column) -> ColumnElement:
+    """
+    SQL condition restricting a query to the agencies a user may access.
+
+    Usage:
+        query.filter(agency_access_filter(user_id, MonthlyResult.agency_id))
+
+    Args:
+        user_id: User ID
+        agency_id_column: Agency ID column of the queried table
+
+    Returns:
+        true() for ADMIN users, otherwise an IN (assigned agencies) subquery
+    """
+    if get_access_index(user_id)["all_agencies"]:
+        return true()
+    return agency_id_column.in_(
+        select(UserAgency.agency_id).where(UserAgency.user_id == user_id)
+    )
+
+
+@cached("access", scope=USER_SCOPE, depends_on=("agencies",))
 def get_user_agencies(user_id: int) -> List[Dict[str, Any]]:
     """
     Get the agencies a user has access to.
@@ -23,21 +93,15 @@ def get_user_agencies(user_id: int) -> List[Dict[str, Any]]:
     Returns:
         List of agency dicts
     """
+    # ADMIN has access to all agencies, NORMAL users only to assigned ones
+    access_filter = agency_access_filter(user_id, Agency.id)
+
     db = SessionLocal()
     try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return []
-
-        if user.role == "ADMIN":
-            # ADMIN has access to all agencies
-            agencies = db.query(Agency).filter(Agency.active == True).order_by(Agency.name).all()
-        else:
-            # NORMAL user only has assigned agencies
-            agencies = db.query(Agency).join(UserAgency).filter(
-                UserAgency.user_id == user_id,
-                Agency.active == True
-            ).order_by(Agency.name).all()
+        agencies = db.query(Agency.id, Agency.name, Agency.city).filter(
+            Agency.active == True,
+            access_filter
+        ).order_by(Agency.name).all()
 
         return [
             {
@@ -53,7 +117,7 @@ def get_user_agencies(user_id: int) -> List[Dict[str, Any]]:
 
 def get_user_agency_ids(user_id: int) -> List[int]:
     """
-    Get the IDs of agencies a user has access to.
+    Get the IDs of active agencies a user has access to (in name order).
 
     Args:
         user_id: User ID
@@ -61,8 +125,10 @@ def get_user_agency_ids(user_id: int) -> List[int]:
     Returns:
         List of agency IDs
     """
-    agencies = get_user_agencies(user_id)
-    return [a["id"] for a in agencies]
+    index = get_access_index(user_id)
+    if index["all_agencies"]:
+        return [a["id"] for a in get_user_agencies(user_id)]
+    return [agency_id for agency_id, active in index["agency_ids"].items() if active]
 
 
 def user_can_access_agency(user_id: int, agency_id: int) -> bool:
@@ -76,25 +142,9 @@ def user_can_access_agency(user_id: int, agency_id: int) -> bool:
     Returns:
         True if user can access the agency
     """
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return False
-
-        if user.role == "ADMIN":
-            # ADMIN can access all agencies
-            return True
-
-        # Check if NORMAL user has assignment
-        assignment = db.query(UserAgency).filter(
-            UserAgency.user_id == user_id,
-            UserAgency.agency_id == agency_id
-        ).first()
-
-        return assignment is not None
-    finally:
-        db.close()
+    index = get_access_index(user_id)
+    # ADMIN can access all agencies, NORMAL users their assignments
+    return index["all_agencies"] or agency_id in index["agency_ids"]
 
 
 def assign_agency_to_user(user_id: int, agency_id: int) -> None:
@@ -120,6 +170,7 @@ def assign_agency_to_user(user_id: int, agency_id: int) -> None:
             )
             db.add(assignment)
             db.commit()
+            invalidate_user_access(user_id)
     except Exception as e:
         db.rollback()
         raise AccessServiceError(f"Error al asignar agencia: {str(e)}")
@@ -142,6 +193,7 @@ def remove_agency_from_user(user_id: int, agency_id: int) -> None:
             UserAgency.agency_id == agency_id
         ).delete()
         db.commit()
+        invalidate_user_access(user_id)
     except Exception as e:
         db.rollback()
         raise AccessServiceError(f"Error al quitar agencia: {str(e)}")
@@ -152,7 +204,7 @@ def remove_agency_from_user(user_id: int, agency_id: int) -> None:
 def set_user_agencies(user_id: int, agency_ids: List[int]) -> None:
     """
     Set the complete list of agencies for a user.
-    Replaces all existing assignments.
+    Replaces the existing assignments (only the differences are written).
 
     Args:
         user_id: User ID
@@ -160,11 +212,21 @@ def set_user_agencies(user_id: int, agency_ids: List[int]) -> None:
     """
     db = SessionLocal()
     try:
-        # Remove all existing assignments
-        db.query(UserAgency).filter(UserAgency.user_id == user_id).delete()
+        current = {
+            agency_id for (agency_id,) in
+            db.query(UserAgency.agency_id).filter(UserAgency.user_id == user_id)
+        }
+        desired = set(agency_ids)
+
+        # Remove dropped assignments
+        if current - desired:
+            db.query(UserAgency).filter(
+                UserAgency.user_id == user_id,
+                UserAgency.agency_id.in_(current - desired)
+            ).delete(synchronize_session=False)
 
         # Add new assignments
-        for agency_id in agency_ids:
+        for agency_id in sorted(desired - current):
             assignment = UserAgency(
                 user_id=user_id,
                 agency_id=agency_id
@@ -172,6 +234,8 @@ def set_user_agencies(user_id: int, agency_ids: List[int]) -> None:
             db.add(assignment)
 
         db.commit()
+        if current != desired:
+            invalidate_user_access(user_id)
     except Exception as e:
         db.rollback()
         raise AccessServiceError(f"Error al actualizar agencias: {str(e)}")
@@ -190,14 +254,7 @@ def get_assigned_agency_ids(user_id: int) -> List[int]:
     Returns:
         List of assigned agency IDs
     """
-    db = SessionLocal()
-    try:
-        assignments = db.query(UserAgency).filter(
-            UserAgency.user_id == user_id
-        ).all()
-        return [a.agency_id for a in assignments]
-    finally:
-        db.close()
+    return list(get_access_index(user_id)["agency_ids"])
 
 
 def is_admin(user_id: int) -> bool:
@@ -210,12 +267,7 @@ def is_admin(user_id: int) -> bool:
     Returns:
         True if user is ADMIN
     """
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        return user is not None and user.role == "ADMIN"
-    finally:
-        db.close()
+    return get_access_index(user_id)["all_agencies"]
 
 
 def require_admin(user: Dict[str, Any]) -> None:
@@ -249,5 +301,5 @@ def filter_agencies_for_user(user: Dict[str, Any], agencies: List[Dict[str, Any]
     if user.get("role") == "ADMIN":
         return agencies
 
-    allowed_ids = set(get_user_agency_ids(user["id"]))
-    return [a for a in agencies if a["id"] in allowed_ids]
+    allowed_ids = get_access_index(user["id"])["agency_ids"]
+    return [a for a in agencies if allowed_ids.get(a["id"])]
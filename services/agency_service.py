@@ -4,9 +4,13 @@ Agency Service - Business logic for agency operations.
 from typing import List, Optional, Dict, Any
 from datetime import date
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select, Select
 from sqlalchemy.exc import IntegrityError
 from db.database import SessionLocal
 from db.models import Agency, AgencyManager, AgencyKPI, KPI
+from services.cache import cached, invalidate
+from services.tracking_service import refresh_kpi_status
+from services.utils import contains_pattern, LIKE_ESCAPE
 
 
 class AgencyServiceError(Exception):
@@ -79,6 +83,7 @@ def create_agency(
 
         db.commit()
         db.refresh(agency)
+        invalidate("agencies")
         return agency
 
     except IntegrityError as e:
@@ -91,12 +96,25 @@ def create_agency(
         db.close()
 
 
-def list_agencies(active_only: bool = True) -> List[Dict[str, Any]]:
+@cached("agencies")
+def list_agencies(
+    active_only: bool = True,
+    name: Optional[str] = None,
+    city: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
     """
     List all agencies with their active manager.
+    Managers and KPIs are loaded with one grouped query each, not per agency.
+    Cached process-wide; invalidated by the agency write functions.
 
     Args:
         active_only: If True, only return active agencies
+        name: Optional case-insensitive substring filter on the agency name
+        city: Optional case-insensitive filter on the city (exact match)
+        limit: Optional page size
+        offset: Number of agencies to skip (with limit, for pagination)
 
     Returns:
         List of dicts with agency info and active manager
@@ -106,22 +124,48 @@ def list_agencies(active_only: bool = True) -> List[Dict[str, Any]]:
         query = db.query(Agency)
         if active_only:
             query = query.filter(Agency.active == True)
+        if name:
+            query = query.filter(Agency.name.ilike(contains_pattern(name), escape=LIKE_ESCAPE))
+        if city:
+            query = query.filter(func.lower(Agency.city) == city.lower())
+
+        query = query.order_by(Agency.name)
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+
+        agencies = query.all()
+        if not agencies:
+            return []
+
+        agency_ids = query.with_entities(Agency.id).scalar_subquery()
+
+        # Active manager per agency (first one if several are flagged active)
+        managers_by_agency: Dict[int, AgencyManager] = {}
+        for manager in db.query(AgencyManager).filter(
+            AgencyManager.agency_id.in_(agency_ids),
+            AgencyManager.active == True
+        ).order_by(AgencyManager.agency_id, AgencyManager.id):
+            managers_by_agency.setdefault(manager.agency_id, manager)
+
+        # Assigned KPIs per agency
+        kpis_by_agency: Dict[int, List[Dict[str, Any]]] = {}
+        for agency_id, kpi_id, code, label in db.query(
+            AgencyKPI.agency_id, KPI.id, KPI.code, KPI.label
+        ).join(
+            KPI, AgencyKPI.kpi_id == KPI.id
+        ).filter(
+            AgencyKPI.agency_id.in_(agency_ids),
+            AgencyKPI.active == True
+        ).order_by(AgencyKPI.agency_id, KPI.id):
+            kpis_by_agency.setdefault(agency_id, []).append(
+                {"id": kpi_id, "code": code, "label": label}
+            )
 
-        agencies = query.order_by(Agency.name).all()
         result = []
-
         for agency in agencies:
-            # Get active manager
-            active_manager = db.query(AgencyManager).filter(
-                AgencyManager.agency_id == agency.id,
-                AgencyManager.active == True
-            ).first()
-
-            # Get assigned KPIs
-            assigned_kpis = db.query(KPI).join(AgencyKPI).filter(
-                AgencyKPI.agency_id == agency.id,
-                AgencyKPI.active == True
-            ).all()
+            active_manager = managers_by_agency.get(agency.id)
 
             result.append({
                 "id": agency.id,
@@ -130,12 +174,12 @@ def list_agencies(active_only: bool = True) -> List[Dict[str, Any]]:
                 "active": agency.active,
                 "created_at": agency.created_at,
                 "manager": {
-                    "id": active_manager.id if active_manager else None,
-                    "name": active_manager.full_name if active_manager else None,
-                    "email": active_manager.email if active_manager else None,
-                    "phone": active_manager.phone if active_manager else None,
+                    "id": active_manager.id,
+                    "name": active_manager.full_name,
+                    "email": active_manager.email,
+                    "phone": active_manager.phone,
                 } if active_manager else None,
-                "kpis": [{"id": k.id, "code": k.code, "label": k.label} for k in assigned_kpis]
+                "kpis": kpis_by_agency.get(agency.id, [])
             })
 
         return result
@@ -143,9 +187,11 @@ def list_agencies(active_only: bool = True) -> List[Dict[str, Any]]:
         db.close()
 
 
+@cached("agencies")
 def get_agency_detail(agency_id: int) -> Optional[Dict[str, Any]]:
     """
     Get detailed information about a specific agency.
+    Cached process-wide; invalidated by the agency write functions.
 
     Args:
         agency_id: The agency ID
@@ -155,52 +201,82 @@ def get_agency_detail(agency_id: int) -> Optional[Dict[str, Any]]:
     """
     db = SessionLocal()
     try:
-        agency = db.query(Agency).filter(Agency.id == agency_id).first()
+        agency = db.get(Agency, agency_id)
         if not agency:
             return None
 
         # Get all managers (for history)
-        managers = db.query(AgencyManager).filter(
-            AgencyManager.agency_id == agency_id
-        ).order_by(AgencyManager.start_date.desc()).all()
-
-        # Get active manager
-        active_manager = next((m for m in managers if m.active), None)
+        managers = db.execute(select_agency_managers(agency_id)).scalars().all()
 
         # Get assigned KPIs
-        assigned_kpis = db.query(KPI).join(AgencyKPI).filter(
-            AgencyKPI.agency_id == agency_id,
-            AgencyKPI.active == True
-        ).all()
+        assigned_kpis = db.execute(select_assigned_kpis(agency_id)).scalars().all()
 
-        return {
-            "id": agency.id,
-            "name": agency.name,
-            "city": agency.city,
-            "active": agency.active,
-            "created_at": agency.created_at,
-            "active_manager": {
-                "id": active_manager.id,
-                "name": active_manager.full_name,
-                "email": active_manager.email,
-                "phone": active_manager.phone,
-                "start_date": active_manager.start_date,
-            } if active_manager else None,
-            "manager_history": [
-                {
-                    "id": m.id,
-                    "name": m.full_name,
-                    "start_date": m.start_date,
-                    "end_date": m.end_date,
-                    "active": m.active
-                } for m in managers
-            ],
-            "kpis": [{"id": k.id, "code": k.code, "label": k.label, "unit": k.unit} for k in assigned_kpis]
-        }
+        return build_agency_detail(agency, managers, assigned_kpis)
     finally:
         db.close()
 
 
+def select_agency_managers(agency_id: int) -> Select:
+    """Statement selecting all managers of an agency, most recent start_date first."""
+    return select(AgencyManager).where(
+        AgencyManager.agency_id == agency_id
+    ).order_by(AgencyManager.start_date.desc())
+
+
+def select_assigned_kpis(agency_id: int) -> Select:
+    """Statement selecting the active KPIs assigned to an agency."""
+    return select(KPI).join(AgencyKPI).where(
+        AgencyKPI.agency_id == agency_id,
+        AgencyKPI.active == True
+    )
+
+
+def build_agency_detail(
+    agency: Agency,
+    managers: List[AgencyManager],
+    assigned_kpis: List[KPI]
+) -> Dict[str, Any]:
+    """
+    Build the agency detail dict from already loaded rows.
+    Shared by get_agency_detail and the set-based dashboard builders.
+
+    Args:
+        agency: Agency row
+        managers: All managers of the agency, most recent start_date first
+        assigned_kpis: Active KPIs assigned to the agency
+
+    Returns:
+        Dict with agency details
+    """
+    # Get active manager
+    active_manager = next((m for m in managers if m.active), None)
+
+    return {
+        "id": agency.id,
+        "name": agency.name,
+        "city": agency.city,
+        "active": agency.active,
+        "created_at": agency.created_at,
+        "active_manager": {
+            "id": active_manager.id,
+            "name": active_manager.full_name,
+            "email": active_manager.email,
+            "phone": active_manager.phone,
+            "start_date": active_manager.start_date,
+        } if active_manager else None,
+        "manager_history": [
+            {
+                "id": m.id,
+                "name": m.full_name,
+                "start_date": m.start_date,
+                "end_date": m.end_date,
+                "active": m.active
+            } for m in managers
+        ],
+        "kpis": [{"id": k.id, "code": k.code, "label": k.label, "unit": k.unit} for k in assigned_kpis]
+    }
+
+
 def get_agency_kpis(agency_id: int) -> List[KPI]:
     """
     Get the KPIs assigned to a specific agency.
@@ -224,7 +300,8 @@ def get_agency_kpis(agency_id: int) -> List[KPI]:
 def update_agency_kpis(agency_id: int, kpi_ids: List[int]) -> None:
     """
     Update the KPIs assigned to an agency.
-    Deactivates removed KPIs and adds new ones.
+    Deactivates removed KPIs and adds new ones, and refreshes the agency's
+    materialized KPI status in the same transaction.
 
     Args:
         agency_id: The agency ID
@@ -256,7 +333,9 @@ def update_agency_kpis(agency_id: int, kpi_ids: List[int]) -> None:
             )
             db.add(agency_kpi)
 
+        refresh_kpi_status(db, agency_id=agency_id)
         db.commit()
+        invalidate("agencies")
     except Exception as e:
         db.rollback()
         raise AgencyServiceError(f"Error al actualizar KPIs: {str(e)}")
@@ -289,6 +368,7 @@ def toggle_agency_active(agency_id: int, active: bool) -> None:
         if agency:
             agency.active = active
             db.commit()
+            invalidate("agencies")
     except Exception as e:
         db.rollback()
         raise AgencyServiceError(f"Error al cambiar estado: {str(e)}")
@@ -0,0 +1,286 @@
+"""
+Aggregation Service - KPI attainment over multi-month windows.
+
+Supports year-to-date, trailing N months, quarters and any contiguous range
+of months. Targets and actuals are summed per agency and KPI over the window
+in a single grouped query on the materialized KPI status (agency_kpi_status),
+for all agencies at once. Attainment and status of the sums use the same
+thresholds as the monthly views (compute_kpi_status_array).
+"""
+from typing import List, Optional, Dict, Any
+from sqlalchemy import func
+from db.database import SessionLocal
+from db.models import AgencyKPIStatus
+from services.agency_service import list_agencies
+from services.tracking_service import (
+    build_kpi_summary, build_agency_summary, get_assigned_kpis_by_agency
+)
+from services.utils import compute_kpi_status_array, month_name, validate_month
+
+
+class AggregationServiceError(Exception):
+    """Custom exception for aggregation service errors."""
+    pass
+
+
+# Trailing windows offered to the UI, in months
+TRAILING_WINDOWS = (3, 6, 12)
+
+
+def _month_index(year: int, month: int) -> int:
+    """Months since year 0 (for window arithmetic)."""
+    return year * 12 + month - 1
+
+
+def _from_month_index(index: int) -> tuple:
+    """Inverse of _month_index: (year, month)."""
+    return index // 12, index % 12 + 1
+
+
+def month_window(
+    start_year: int,
+    start_month: int,
+    end_year: int,
+    end_month: int
+) -> Dict[str, Any]:
+    """
+    Build a window of consecutive months (both ends included).
+
+    Args:
+        start_year: First year
+        start_month: First month (1-12)
+        end_year: Last year
+        end_month: Last month (1-12)
+
+    Returns:
+        Dict with start_year, start_month, end_year, end_month, months and label
+
+    Raises:
+        AggregationServiceError: If a month is invalid or the window is empty
+    """
+    if not validate_month(start_month) or not validate_month(end_month):
+        raise AggregationServiceError("El mes debe estar entre 1 y 12")
+
+    months = _month_index(end_year, end_month) - _month_index(start_year, start_month) + 1
+    if months < 1:
+        raise AggregationServiceError("El inicio del periodo es posterior al final")
+
+    if start_year == end_year:
+        if start_month == end_month:
+            label = f"{month_name(start_month)} {start_year}"
+        else:
+            label = f"{month_name(start_month)} - {month_name(end_month)} {end_year}"
+    else:
+        label = f"{month_name(start_month)} {start_year} - {month_name(end_month)} {end_year}"
+
+    return {
+        "start_year": start_year,
+        "start_month": start_month,
+        "end_year": end_year,
+        "end_month": end_month,
+        "months": months,
+        "label": label
+    }
+
+
+def ytd_window(year: int, month: int) -> Dict[str, Any]:
+    """
+    Year-to-date window: January to the given month.
+
+    Args:
+        year: Year
+        month: Last month included (1-12)
+
+    Returns:
+        Window dict (see month_window)
+    """
+    return month_window(year, 1, year, month)
+
+
+def trailing_window(year: int, month: int, months: int) -> Dict[str, Any]:
+    """
+    Trailing window: the given month and the previous months - 1.
+
+    Args:
+        year: Year of the last month
+        month: Last month included (1-12)
+        months: Window length in months
+
+    Returns:
+        Window dict (see month_window)
+    """
+    if months < 1:
+        raise AggregationServiceError("La ventana debe tener al menos un mes")
+
+    start_year, start_month = _from_month_index(_month_index(year, month) - months + 1)
+    return month_window(start_year, start_month, year, month)
+
+
+def quarter_window(year: int, quarter: int) -> Dict[str, Any]:
+    """
+    Calendar quarter window.
+
+    Args:
+        year: Year
+        quarter: Quarter (1-4)
+
+    Returns:
+        Window dict (see month_window)
+    """
+    if quarter not in (1, 2, 3, 4):
+        raise AggregationServiceError("El trimestre debe estar entre 1 y 4")
+
+    window = month_window(year, quarter * 3 - 2, year, quarter * 3)
+    window["label"] = f"T{quarter} {year}"
+    return window
+
+
+def previous_window(window: Dict[str, Any], same_period_last_year: bool = False) -> Dict[str, Any]:
+    """
+    Window to compare against: the same number of months right before, or
+    the same months of the previous year (e.g. YTD vs last year's YTD).
+
+    Args:
+        window: Window dict
+        same_period_last_year: If True, shift the window back one year
+
+    Returns:
+        Window dict (see month_window)
+    """
+    if same_period_last_year:
+        previous = month_window(
+            window["start_year"] - 1, window["start_month"],
+            window["end_year"] - 1, window["end_month"]
+        )
+    else:
+        end = _month_index(window["start_year"], window["start_month"]) - 1
+        start_year, start_month = _from_month_index(end - window["months"] + 1)
+        end_year, end_month = _from_month_index(end)
+        previous = month_window(start_year, start_month, end_year, end_month)
+
+    return previous
+
+
+def get_window_statuses(
+    db,
+    window: Dict[str, Any],
+    agency_ids
+) -> Dict[int, Dict[int, tuple]]:
+    """
+    Sum targets and actuals per agency and KPI over a window, in one query.
+
+    Args:
+        db: Open session
+        window: Window dict (see month_window)
+        agency_ids: List of agency IDs or a scalar subquery selecting them
+
+    Returns:
+        Dict mapping agency_id to a dict of kpi_id -> (target, actual, diff, pct, status)
+    """
+    period_key = AgencyKPIStatus.year * 100 + AgencyKPIStatus.month
+    rows = db.query(
+        AgencyKPIStatus.agency_id,
+        AgencyKPIStatus.kpi_id,
+        func.sum(AgencyKPIStatus.target_value),
+        func.sum(AgencyKPIStatus.actual_value)
+    ).filter(
+        # The year range lets the period index narrow the scan
+        AgencyKPIStatus.year.between(window["start_year"], window["end_year"]),
+        period_key.between(
+            window["start_year"] * 100 + window["start_month"],
+            window["end_year"] * 100 + window["end_month"]
+        ),
+        AgencyKPIStatus.agency_id.in_(agency_ids)
+    ).group_by(AgencyKPIStatus.agency_id, AgencyKPIStatus.kpi_id)
+
+    rows = rows.all()
+    targets = [target for _, _, target, _ in rows]
+    actuals = [actual for _, _, _, actual in rows]
+    diffs, pcts, status_codes = compute_kpi_status_array(targets, actuals)
+
+    statuses: Dict[int, Dict[int, tuple]] = {}
+    for (agency_id, kpi_id, target, actual), diff, pct, status in zip(
+        rows, diffs.tolist(), pcts.tolist(), status_codes.tolist()
+    ):
+        statuses.setdefault(agency_id, {})[kpi_id] = (target, actual, diff, pct, status)
+    return statuses
+
+
+def get_window_summary(
+    window: Dict[str, Any],
+    agency_ids: Optional[List[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get the cumulative KPI summary of all active agencies over a window.
+    Same shape as get_all_agencies_summary, with targets and actuals summed
+    over the window's months.
+
+    Args:
+        window: Window dict (see month_window)
+        agency_ids: Optional list of agency IDs to restrict to
+
+    Returns:
+        List of agency summaries sorted by average performance (descending)
+    """
+    agencies = list_agencies(active_only=True)
+    if agency_ids is not None:
+        allowed = set(agency_ids)
+        agencies = [a for a in agencies if a["id"] in allowed]
+    if not agencies:
+        return []
+    ids = [agency["id"] for agency in agencies]
+
+    db = SessionLocal()
+    try:
+        kpis_by_agency = get_assigned_kpis_by_agency(db, ids)
+        statuses_by_agency = get_window_statuses(db, window, ids)
+    finally:
+        db.close()
+
+    result = [
+        build_agency_summary(
+            agency,
+            build_kpi_summary(
+                kpis_by_agency.get(agency["id"], []),
+                statuses_by_agency.get(agency["id"], {})
+            )
+        )
+        for agency in agencies
+    ]
+
+    result.sort(key=lambda x: x["avg_pct"], reverse=True)
+    return result
+
+
+def compare_windows(
+    current: Dict[str, Any],
+    previous: Dict[str, Any],
+    agency_ids: Optional[List[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get the summary of a window with the change against another window.
+
+    Args:
+        current: Window to report
+        previous: Window to compare against (see previous_window)
+        agency_ids: Optional list of agency IDs to restrict to
+
+    Returns:
+        List of agency summaries (see get_window_summary), each with:
+        - previous_avg_pct: Average performance in the previous window (None if no data)
+        - delta_pct: avg_pct - previous_avg_pct (None if no data)
+    """
+    previous_by_agency = {
+        row["agency_id"]: row for row in get_window_summary(previous, agency_ids)
+    }
+
+    result = get_window_summary(current, agency_ids)
+    for row in result:
+        before = previous_by_agency.get(row["agency_id"])
+        has_previous = before is not None and any(
+            k["target"] or k["actual"] for k in before["kpi_details"]
+        )
+        row["previous_avg_pct"] = before["avg_pct"] if has_previous else None
+        row["delta_pct"] = row["avg_pct"] - before["avg_pct"] if has_previous else None
+
+    return result
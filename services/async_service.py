@@ -0,0 +1,270 @@
+"""
+Async Service - Concurrent read paths on SQLAlchemy AsyncSession.
+
+Pages that need several independent reads (agency dashboard, monthly review)
+gather them concurrently instead of running them one after the other. Every
+read opens its own AsyncSession, so gathered reads run on separate pooled
+connections. The SQL is shared with the sync services (the select_*
+statement builders in tracking_service and agency_service).
+
+Streamlit scripts are synchronous, so pages use the sync facade
+(load_agency_dashboard, load_monthly_review). It runs the coroutines on a
+dedicated event loop thread, and falls back to the sync services when the
+async engine cannot connect (e.g. aiosqlite / asyncpg not installed) or an
+async read fails. The async engine's connections belong to that loop: call
+the *_async functions through run_async, not from another event loop.
+"""
+import asyncio
+import contextvars
+import threading
+from contextlib import asynccontextmanager
+from typing import List, Optional, Dict, Any
+from sqlalchemy import text
+from db.database import get_async_session_factory
+from db.instrumentation import query_function
+from db.models import Agency
+from services.tracking_service import (
+    select_monthly_targets, select_monthly_results, select_monthly_review,
+    select_action_items, select_monthly_summary, review_to_dict,
+    action_item_to_dict, summary_rows_to_kpi_summary, PERIOD_SCOPE,
+    get_monthly_targets, get_monthly_results, get_monthly_review,
+    get_action_items, get_monthly_summary
+)
+from services.agency_service import (
+    select_agency_managers, select_assigned_kpis, build_agency_detail
+)
+from services.dashboard_service import build_agency_dashboard, get_agency_dashboard_data
+from services.cache import cached
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_available: Optional[bool] = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) the event loop thread that owns the async engine."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-services", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the async services loop and wait for its result.
+
+    Args:
+        coro: Coroutine using the async engine
+
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(_in_context(coro, contextvars.copy_context()), _get_loop()).result()
+
+
+async def _in_context(coro, context: contextvars.Context):
+    """Await coro with the caller's context variables set (SQL instrumentation)."""
+    for var, value in context.items():
+        var.set(value)
+    return await coro
+
+
+def async_available() -> bool:
+    """
+    Check (once) whether the async engine can connect, with a SELECT 1.
+
+    Returns:
+        False if the async driver is missing or cannot connect (e.g. options
+        of DATABASE_URL it does not accept); the facade then uses the sync
+        services
+    """
+    global _available
+    if _available is None:
+        try:
+            run_async(_probe())
+            _available = True
+        except Exception as e:
+            print(f"Async services disabled, using sync reads: {e}")
+            _available = False
+    return _available
+
+
+async def _probe() -> None:
+    """Run SELECT 1 on the async engine."""
+    async with _session("async_available") as session:
+        await session.execute(text("SELECT 1"))
+
+
+@asynccontextmanager
+async def _session(caller: str):
+    """
+    Open a new AsyncSession (one per concurrent read).
+
+    Args:
+        caller: Name of the reading function, for the SQL instrumentation
+    """
+    with query_function(f"async_service.{caller}"):
+        async with get_async_session_factory()() as session:
+            yield session
+
+
+# ============== ASYNC READS ==============
+
+async def get_monthly_targets_async(agency_id: int, year: int, month: int) -> Dict[int, float]:
+    """Async get_monthly_targets: dict mapping kpi_id to target_value."""
+    async with _session("get_monthly_targets_async") as session:
+        result = await session.execute(select_monthly_targets(agency_id, year, month))
+        return dict(result.all())
+
+
+async def get_monthly_results_async(agency_id: int, year: int, month: int) -> Dict[int, float]:
+    """Async get_monthly_results: dict mapping kpi_id to actual_value."""
+    async with _session("get_monthly_results_async") as session:
+        result = await session.execute(select_monthly_results(agency_id, year, month))
+        return dict(result.all())
+
+
+async def get_monthly_review_async(agency_id: int, year: int, month: int) -> Optional[Dict[str, Any]]:
+    """Async get_monthly_review: review dict or None."""
+    async with _session("get_monthly_review_async") as session:
+        result = await session.execute(select_monthly_review(agency_id, year, month))
+        review = result.scalars().first()
+        return review_to_dict(review) if review else None
+
+
+async def get_action_items_async(agency_id: int, year: int, month: int) -> List[Dict[str, Any]]:
+    """Async get_action_items: list of action item dicts."""
+    async with _session("get_action_items_async") as session:
+        result = await session.execute(select_action_items(agency_id, year, month))
+        return [action_item_to_dict(item) for item in result.scalars()]
+
+
+async def get_monthly_summary_async(agency_id: int, year: int, month: int) -> List[Dict[str, Any]]:
+    """Async get_monthly_summary: KPI performance rows."""
+    async with _session("get_monthly_summary_async") as session:
+        result = await session.execute(select_monthly_summary(agency_id, year, month))
+        return summary_rows_to_kpi_summary(result.all())
+
+
+async def get_agency_detail_async(agency_id: int) -> Optional[Dict[str, Any]]:
+    """Async get_agency_detail: agency detail dict or None."""
+    async with _session("get_agency_detail_async") as session:
+        agency = await session.get(Agency, agency_id)
+        if not agency:
+            return None
+
+        managers = (await session.execute(select_agency_managers(agency_id))).scalars().all()
+        assigned_kpis = (await session.execute(select_assigned_kpis(agency_id))).scalars().all()
+        return build_agency_detail(agency, managers, assigned_kpis)
+
+
+async def get_agency_dashboard_data_async(
+    agency_id: int,
+    year: int,
+    month: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Async get_agency_dashboard_data: agency, KPI summary, review and action
+    items are read concurrently.
+
+    Args:
+        agency_id: Agency ID
+        year: Year
+        month: Month (1-12)
+
+    Returns:
+        Dict with all dashboard data, or None if the agency does not exist
+    """
+    agency, kpi_summary, review, actions = await asyncio.gather(
+        get_agency_detail_async(agency_id),
+        get_monthly_summary_async(agency_id, year, month),
+        get_monthly_review_async(agency_id, year, month),
+        get_action_items_async(agency_id, year, month)
+    )
+    if not agency:
+        return None
+
+    return build_agency_dashboard(agency, kpi_summary, review, actions, year, month)
+
+
+async def get_monthly_review_data_async(agency_id: int, year: int, month: int) -> Dict[str, Any]:
+    """
+    Read everything the monthly review page shows for a period, concurrently.
+
+    Args:
+        agency_id: Agency ID
+        year: Year
+        month: Month (1-12)
+
+    Returns:
+        Dict with targets, results, review, actions and summary
+    """
+    targets, results, review, actions, summary = await asyncio.gather(
+        get_monthly_targets_async(agency_id, year, month),
+        get_monthly_results_async(agency_id, year, month),
+        get_monthly_review_async(agency_id, year, month),
+        get_action_items_async(agency_id, year, month),
+        get_monthly_summary_async(agency_id, year, month)
+    )
+    return {
+        "targets": targets,
+        "results": results,
+        "review": review,
+        "actions": actions,
+        "summary": summary
+    }
+
+
+# ============== SYNC FACADE ==============
+
+@cached("tracking", scope=PERIOD_SCOPE, depends_on=("agencies", "kpis"))
+def load_agency_dashboard(agency_id: int, year: int, month: int) -> Optional[Dict[str, Any]]:
+    """
+    Get the dashboard data of an agency with its reads gathered concurrently.
+    Same result as get_agency_dashboard_data.
+
+    Args:
+        agency_id: Agency ID
+        year: Year
+        month: Month (1-12)
+
+    Returns:
+        Dict with all dashboard data, or None if the agency does not exist
+    """
+    if async_available():
+        try:
+            return run_async(get_agency_dashboard_data_async(agency_id, year, month))
+        except Exception as e:
+            print(f"Async read failed, using sync reads: {e}")
+    return get_agency_dashboard_data(agency_id, year, month)
+
+
+@cached("tracking", scope=PERIOD_SCOPE, depends_on=("agencies", "kpis"))
+def load_monthly_review(agency_id: int, year: int, month: int) -> Dict[str, Any]:
+    """
+    Get the data of the monthly review page with its reads gathered concurrently.
+
+    Args:
+        agency_id: Agency ID
+        year: Year
+        month: Month (1-12)
+
+    Returns:
+        Dict with targets, results, review, actions and summary
+    """
+    if async_available():
+        try:
+            return run_async(get_monthly_review_data_async(agency_id, year, month))
+        except Exception as e:
+            print(f"Async read failed, using sync reads: {e}")
+    return {
+        "targets": get_monthly_targets(agency_id, year, month),
+        "results": get_monthly_results(agency_id, year, month),
+        "review": get_monthly_review(agency_id, year, month),
+        "actions": get_action_items(agency_id, year, month),
+        "summary": get_monthly_summary(agency_id, year, month)
+    }
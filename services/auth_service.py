@@ -1,15 +1,13 @@
 """
 Authentication Service - User authentication, password management, and security.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 from db.database import SessionLocal
 from db.models import User, UserSecurityCountry, Country
-
-
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from services.cache import cached, invalidate
+from services import password_hashing
+from services.password_hashing import PasswordHashingBusy
 
 # Configuration
 MAX_FAILED_ATTEMPTS = 3
@@ -25,15 +23,22 @@ class AuthServiceError(Exception):
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using bcrypt (on the hashing pool, see
+    services/password_hashing.py).
 
     Args:
         password: Plain text password
 
     Returns:
         Hashed password
+
+    Raises:
+        AuthServiceError: If the hashing pool is saturated
     """
-    return pwd_context.hash(password)
+    try:
+        return password_hashing.hash_password(password)
+    except PasswordHashingBusy:
+        raise AuthServiceError("El servidor está ocupado. Intente de nuevo en unos segundos")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -46,8 +51,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
     Returns:
         True if password matches, False otherwise
+
+    Raises:
+        AuthServiceError: If the hashing pool is saturated
+    """
+    try:
+        return password_hashing.verify_password(plain_password, hashed_password)
+    except PasswordHashingBusy:
+        raise AuthServiceError("El servidor está ocupado. Intente de nuevo en unos segundos")
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its bcrypt cost is not AUTH_BCRYPT_ROUNDS.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Stored password hash
+
+    Returns:
+        Tuple (valid, new_hash); new_hash is None if no update is needed
+
+    Raises:
+        AuthServiceError: If the hashing pool is saturated
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return password_hashing.verify_and_update(plain_password, hashed_password)
+    except PasswordHashingBusy:
+        raise AuthServiceError("El servidor está ocupado. Intente de nuevo en unos segundos")
 
 
 def create_user(
@@ -74,6 +105,9 @@ def create_user(
     if role not in ("ADMIN", "NORMAL"):
         raise AuthServiceError("El rol debe ser ADMIN o NORMAL")
 
+    # Hash before opening the session: no connection held while bcrypt runs
+    password_hash = hash_password(password)
+
     db = SessionLocal()
     try:
         # Check if username exists
@@ -83,7 +117,7 @@ def create_user(
 
         user = User(
             username=username,
-            password_hash=hash_password(password),
+            password_hash=password_hash,
             role=role,
             active=active
         )
@@ -129,8 +163,12 @@ def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
             remaining = (user.locked_until - datetime.utcnow()).seconds // 60
             raise AuthServiceError(f"Cuenta bloqueada. Intente de nuevo en {remaining + 1} minutos")
 
-        # Verify password
-        if not verify_password(password, user.password_hash):
+        # Verify password, releasing the connection while bcrypt runs
+        # (the user row is reloaded afterwards)
+        password_hash = user.password_hash
+        db.rollback()
+        valid, new_hash = verify_and_update_password(password, password_hash)
+        if not valid:
             # Increment failed attempts
             user.failed_attempts += 1
 
@@ -145,6 +183,10 @@ def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
         # Reset failed attempts on successful login
         user.failed_attempts = 0
         user.locked_until = None
+
+        # Move the hash to the configured cost (unless changed meanwhile)
+        if new_hash and user.password_hash == password_hash:
+            user.password_hash = new_hash
         db.commit()
 
         return {
@@ -163,6 +205,7 @@ def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
         db.close()
 
 
+@cached("users", scope=("user_id",))
 def needs_security_setup(user_id: int) -> bool:
     """
     Check if user needs to configure security countries.
@@ -225,6 +268,7 @@ def assign_security_countries(user_id: int, country_ids: List[int]) -> None:
             db.add(user_country)
 
         db.commit()
+        invalidate("users", (user_id,))
 
     except AuthServiceError:
         raise
@@ -306,11 +350,13 @@ def reset_password(user_id: int, new_password: str) -> None:
         user_id: User ID
         new_password: New plain text password
     """
+    password_hash = hash_password(new_password)
+
     db = SessionLocal()
     try:
         user = db.query(User).filter(User.id == user_id).first()
         if user:
-            user.password_hash = hash_password(new_password)
+            user.password_hash = password_hash
             user.failed_attempts = 0
             user.locked_until = None
             db.commit()
@@ -409,6 +455,7 @@ def toggle_user_active(user_id: int, active: bool) -> None:
         if user:
             user.active = active
             db.commit()
+            invalidate("users", (user_id,))
     except Exception as e:
         db.rollback()
         raise AuthServiceError(f"Error al cambiar estado: {str(e)}")
@@ -433,6 +480,7 @@ def update_user_role(user_id: int, role: str) -> None:
         if user:
             user.role = role
             db.commit()
+            invalidate("access", (user_id,))
     except Exception as e:
         db.rollback()
         raise AuthServiceError(f"Error al cambiar rol: {str(e)}")
@@ -443,8 +491,11 @@ def update_user_role(user_id: int, role: str) -> None:
 def ensure_admin_exists() -> None:
     """
     Ensure the default admin user exists.
-    Creates 'daniel' with password 'Admin2026@' if not exists.
+    Creates 'daniel' with password 'Admin2026@' if not exists,
+    and starts the password hashing workers ahead of the first login.
     """
+    password_hashing.warm_up_hashing_pool()
+
     db = SessionLocal()
     try:
         admin = db.query(User).filter(User.username == "daniel").first()
@@ -0,0 +1,165 @@
+"""
+Cache - Process-wide read-through cache for service read functions.
+
+The cache lives in module state, so it is shared by every Streamlit session
+served by the same process: a rerun in one browser tab reuses what another
+tab already loaded, and a write in any tab invalidates it for all of them.
+
+Cached functions are grouped in namespaces (e.g. "kpis", "agencies",
+"tracking"). Invalidation is version based:
+
+- invalidate(namespace) drops every entry of the namespace.
+- invalidate(namespace, scope, ...) only drops entries whose scope matches.
+  The scope of an entry is the tuple of the call arguments named in
+  cached(scope=...), e.g. (agency_id, year, month).
+- Entries can depend on other namespaces (depends_on); invalidating one of
+  those drops them too.
+
+Entries also expire after a TTL, which bounds staleness for writes done by
+other processes (e.g. the scripts/ seeders).
+
+Cached values must be plain data (dicts, lists, scalars). Every hit returns a
+deep copy, so callers can modify the result without corrupting the cache.
+Calls that pass an open session (db=...) bypass the cache.
+
+Usage:
+    @cached("tracking", scope=("agency_id", "year", "month"), depends_on=("agencies",))
+    def get_monthly_review(agency_id: int, year: int, month: int):
+        ...
+
+    invalidate("tracking", (agency_id, year, month), (year, month))
+"""
+import os
+import copy
+import time
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+
+# Default time-to-live in seconds (0 disables caching)
+DEFAULT_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+
+_lock = threading.Lock()
+# (namespace, None) -> namespace version; (namespace, scope) -> scope version
+_versions: Dict[Tuple[str, Optional[Hashable]], int] = {}
+# key -> (namespace, scope, versions snapshot, expires_at, value)
+_entries: Dict[Tuple, Tuple[str, Optional[Hashable], Tuple[int, ...], float, Any]] = {}
+
+
+def get_version(namespace: str, scope: Optional[Hashable] = None) -> int:
+    """
+    Get the current version of a namespace or of one scope inside it.
+
+    Args:
+        namespace: Cache namespace
+        scope: Optional scope tuple
+
+    Returns:
+        Version counter (starts at 0)
+    """
+    with _lock:
+        return _versions.get((namespace, scope), 0)
+
+
+def invalidate(namespace: str, *scopes: Hashable) -> None:
+    """
+    Invalidate cached entries of a namespace.
+
+    Args:
+        namespace: Cache namespace
+        scopes: Scope tuples to invalidate; if none, the whole namespace
+    """
+    with _lock:
+        targets = scopes or (None,)
+        for scope in targets:
+            _versions[(namespace, scope)] = _versions.get((namespace, scope), 0) + 1
+
+        stale = [
+            key for key, entry in _entries.items()
+            if entry[0] == namespace and (not scopes or entry[1] in scopes)
+        ]
+        for key in stale:
+            del _entries[key]
+
+
+def clear_cache() -> None:
+    """Remove every cached entry (all namespaces)."""
+    with _lock:
+        for version_key in list(_versions):
+            _versions[version_key] += 1
+        _entries.clear()
+
+
+def _snapshot(version_keys: Sequence[Tuple[str, Optional[Hashable]]]) -> Tuple[int, ...]:
+    """Current versions of the given keys (caller holds the lock)."""
+    return tuple(_versions.get(k, 0) for k in version_keys)
+
+
+def cached(
+    namespace: str,
+    ttl: float = None,
+    scope: Sequence[str] = (),
+    depends_on: Sequence[str] = ()
+) -> Callable:
+    """
+    Decorator that memoizes a read function per (function, arguments).
+
+    Args:
+        namespace: Namespace used for invalidation
+        ttl: Time-to-live in seconds (defaults to DEFAULT_TTL_SECONDS)
+        scope: Names of the arguments that form the entry scope
+        depends_on: Other namespaces whose invalidation also drops the entry
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            entry_ttl = DEFAULT_TTL_SECONDS if ttl is None else ttl
+            if entry_ttl <= 0:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if bound.arguments.get("db") is not None:
+                return func(*args, **kwargs)
+
+            key = (namespace, name, tuple(bound.arguments.items()))
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable arguments (lists, dicts): do not cache
+                return func(*args, **kwargs)
+
+            entry_scope = tuple(bound.arguments[arg] for arg in scope) if scope else None
+            version_keys = [(namespace, None)]
+            if entry_scope is not None:
+                version_keys.append((namespace, entry_scope))
+            version_keys.extend((dep, None) for dep in depends_on)
+
+            now = time.monotonic()
+            with _lock:
+                versions = _snapshot(version_keys)
+                entry = _entries.get(key)
+                if entry and entry[2] == versions and entry[3] > now:
+                    return copy.deepcopy(entry[4])
+
+            value = func(*args, **kwargs)
+
+            with _lock:
+                # Skip storing if a write invalidated the entry meanwhile
+                if _snapshot(version_keys) == versions:
+                    _entries[key] = (namespace, entry_scope, versions, now + entry_ttl, value)
+
+            return copy.deepcopy(value)
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
@@ -4,13 +4,23 @@ Dashboard Service - Business logic for dashboard views.
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from db.database import SessionLocal
-from db.models import Agency, MonthlyReview, MonthlyResult, User
-from services.tracking_service import get_monthly_summary, get_monthly_review, get_action_items
-from services.agency_service import list_agencies, get_agency_detail
+from db.models import (
+    Agency, AgencyManager, AgencyKPI, KPI,
+    MonthlyTarget, MonthlyReview, MonthlyResult, ActionItem, User
+)
+from services.tracking_service import (
+    get_monthly_summary, get_monthly_review, get_action_items, build_kpi_summary,
+    get_period_kpi_statuses, get_assigned_kpis_by_agency, review_to_dict, action_item_to_dict,
+    PERIOD_SCOPE, ALL_AGENCIES_PERIOD_SCOPE
+)
+from services.agency_service import get_agency_detail, build_agency_detail
 from services.access_service import get_user_agencies
 from services.utils import month_name
+from services.cache import cached
+from services.parallel import get_worker_count, split_chunks, map_ordered
 
 
+@cached("tracking", scope=PERIOD_SCOPE, depends_on=("agencies", "kpis"))
 def get_agency_dashboard_data(
     agency_id: int,
     year: int,
@@ -35,6 +45,37 @@ def get_agency_dashboard_data(
     # Get KPI summary
     kpi_summary = get_monthly_summary(agency_id, year, month)
 
+    # Get review
+    review = get_monthly_review(agency_id, year, month)
+
+    # Get actions
+    actions = get_action_items(agency_id, year, month)
+
+    return build_agency_dashboard(agency, kpi_summary, review, actions, year, month)
+
+
+def build_agency_dashboard(
+    agency: Dict[str, Any],
+    kpi_summary: List[Dict[str, Any]],
+    review: Optional[Dict[str, Any]],
+    actions: List[Dict[str, Any]],
+    year: int,
+    month: int
+) -> Dict[str, Any]:
+    """
+    Build the dashboard dict of a single agency from already loaded data.
+
+    Args:
+        agency: Agency detail dict (see get_agency_detail)
+        kpi_summary: KPI summary rows (see get_monthly_summary)
+        review: Review dict or None
+        actions: List of action item dicts
+        year: Year
+        month: Month (1-12)
+
+    Returns:
+        Dict with all dashboard data
+    """
     # Calculate overall status
     green_count = sum(1 for k in kpi_summary if k["status"] == "green")
     yellow_count = sum(1 for k in kpi_summary if k["status"] == "yellow")
@@ -50,11 +91,6 @@ def get_agency_dashboard_data(
     else:
         overall_status = "none"
 
-    # Get review
-    review = get_monthly_review(agency_id, year, month)
-
-    # Get actions
-    actions = get_action_items(agency_id, year, month)
     pending_actions = [a for a in actions if not a["done"]]
     completed_actions = [a for a in actions if a["done"]]
 
@@ -84,6 +120,137 @@ def get_agency_dashboard_data(
     }
 
 
+def get_agencies_dashboard_data(
+    year: int,
+    month: int,
+    workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get dashboard data for all active agencies using set-based queries.
+    Issues a constant number of queries (one per table) in a single session
+    instead of calling get_agency_dashboard_data once per agency.
+
+    With more than one worker, the agencies are split into chunks built
+    concurrently, each with its own session (see services/parallel.py).
+
+    Args:
+        year: Year
+        month: Month (1-12)
+        workers: Threads to use (defaults to DASHBOARD_WORKERS; 0 or 1 = sequential)
+
+    Returns:
+        List of agency dashboard dicts ordered by agency name
+    """
+    workers = get_worker_count(workers)
+    if workers <= 1:
+        return _build_agencies_dashboard(year, month)
+
+    db = SessionLocal()
+    try:
+        agency_ids = [
+            agency_id for agency_id, in db.query(Agency.id).filter(
+                Agency.active == True
+            ).order_by(Agency.name)
+        ]
+    finally:
+        db.close()
+
+    chunks = map_ordered(
+        lambda ids: _build_agencies_dashboard(year, month, ids),
+        split_chunks(agency_ids, workers),
+        workers
+    )
+    return [data for chunk in chunks for data in chunk]
+
+
+def _build_agencies_dashboard(
+    year: int,
+    month: int,
+    agency_ids: Optional[List[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the dashboard data of a set of agencies in one session.
+
+    Args:
+        year: Year
+        month: Month (1-12)
+        agency_ids: Active agency IDs to build (None = all active agencies)
+
+    Returns:
+        List of agency dashboard dicts ordered by agency name
+    """
+    db = SessionLocal()
+    try:
+        agencies_query = db.query(Agency).filter(Agency.active == True)
+        if agency_ids is None:
+            active_ids = db.query(Agency.id).filter(Agency.active == True).scalar_subquery()
+        else:
+            active_ids = agency_ids
+            agencies_query = agencies_query.filter(Agency.id.in_(agency_ids))
+
+        agencies = agencies_query.order_by(Agency.name).all()
+        if not agencies:
+            return []
+
+        # Managers of all agencies (for history), most recent first
+        managers_by_agency: Dict[int, List[AgencyManager]] = {}
+        managers = db.query(AgencyManager).filter(
+            AgencyManager.agency_id.in_(active_ids)
+        ).order_by(AgencyManager.agency_id, AgencyManager.start_date.desc()).all()
+        for m in managers:
+            managers_by_agency.setdefault(m.agency_id, []).append(m)
+
+        # Assigned KPIs per agency
+        kpis_by_agency = get_assigned_kpis_by_agency(db, active_ids)
+
+        # Materialized KPI status of the period (targets vs results)
+        statuses_by_agency = get_period_kpi_statuses(db, year, month, active_ids)
+
+        # Reviews of the period
+        reviews_by_agency: Dict[int, Dict[str, Any]] = {}
+        for review in db.query(MonthlyReview).filter(
+            MonthlyReview.year == year,
+            MonthlyReview.month == month,
+            MonthlyReview.agency_id.in_(active_ids)
+        ):
+            reviews_by_agency[review.agency_id] = review_to_dict(review)
+
+        # Action items of the period
+        actions_by_agency: Dict[int, List[Dict[str, Any]]] = {}
+        for item in db.query(ActionItem).filter(
+            ActionItem.year == year,
+            ActionItem.month == month,
+            ActionItem.agency_id.in_(active_ids)
+        ).order_by(ActionItem.id):
+            actions_by_agency.setdefault(item.agency_id, []).append(action_item_to_dict(item))
+
+        result = []
+        for agency in agencies:
+            assigned_kpis = kpis_by_agency.get(agency.id, [])
+            detail = build_agency_detail(
+                agency,
+                managers_by_agency.get(agency.id, []),
+                assigned_kpis
+            )
+            kpi_summary = build_kpi_summary(
+                assigned_kpis,
+                statuses_by_agency.get(agency.id, {})
+            )
+            result.append(build_agency_dashboard(
+                detail,
+                kpi_summary,
+                reviews_by_agency.get(agency.id),
+                actions_by_agency.get(agency.id, []),
+                year,
+                month
+            ))
+
+        return result
+    finally:
+        db.close()
+
+
+@cached("tracking", scope=ALL_AGENCIES_PERIOD_SCOPE, depends_on=("agencies", "kpis"))
 def get_admin_dashboard_data(year: int, month: int) -> Dict[str, Any]:
     """
     Get dashboard data for admin view (all agencies).
@@ -95,29 +262,24 @@ def get_admin_dashboard_data(year: int, month: int) -> Dict[str, Any]:
     Returns:
         Dict with admin dashboard data
     """
-    agencies = list_agencies(active_only=True)
+    agencies_data = get_agencies_dashboard_data(year, month)
 
-    # Collect data for all agencies
-    agencies_data = []
     total_green = 0
     total_yellow = 0
     total_red = 0
     pending_reviews = []
 
-    for agency in agencies:
-        agency_data = get_agency_dashboard_data(agency["id"], year, month)
-        if agency_data:
-            agencies_data.append(agency_data)
-
-            total_green += agency_data["green_count"]
-            total_yellow += agency_data["yellow_count"]
-            total_red += agency_data["red_count"]
+    for agency_data in agencies_data:
+        total_green += agency_data["green_count"]
+        total_yellow += agency_data["yellow_count"]
+        total_red += agency_data["red_count"]
 
-            if agency_data["review_pending"]:
-                pending_reviews.append({
-                    "agency_name": agency["name"],
-                    "manager_name": agency["manager"]["name"] if agency["manager"] else "Sin jefe"
-                })
+        if agency_data["review_pending"]:
+            manager = agency_data["agency"]["active_manager"]
+            pending_reviews.append({
+                "agency_name": agency_data["agency"]["name"],
+                "manager_name": manager["name"] if manager else "Sin jefe"
+            })
 
     # Sort by status (worst first)
     agencies_data.sort(
@@ -205,6 +367,7 @@ def get_period_status_message(data: Dict[str, Any]) -> str:
         return "📊 Sin datos registrados aún"
 
 
+@cached("tracking", scope=PERIOD_SCOPE, depends_on=("agencies", "kpis"))
 def check_monthly_review_complete(agency_id: int, year: int, month: int) -> Dict[str, bool]:
     """
     Check if monthly review is complete.
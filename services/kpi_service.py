@@ -1,28 +1,40 @@
 """
 KPI Service - Business logic for KPI operations.
 """
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from db.database import SessionLocal
 from db.models import KPI
+from services.cache import cached
 
 
-def list_kpis(active_only: bool = True) -> List[KPI]:
+@cached("kpis")
+def list_kpis(active_only: bool = True) -> List[Dict[str, Any]]:
     """
     List all KPIs.
+    Cached process-wide; invalidated via services.cache.invalidate("kpis").
 
     Args:
         active_only: If True, only return active KPIs
 
     Returns:
-        List of KPI objects
+        List of KPI dicts (id, code, label, unit, active)
     """
     db = SessionLocal()
     try:
         query = db.query(KPI)
         if active_only:
             query = query.filter(KPI.active == True)
-        return query.order_by(KPI.code).all()
+        return [
+            {
+                "id": k.id,
+                "code": k.code,
+                "label": k.label,
+                "unit": k.unit,
+                "active": k.active
+            }
+            for k in query.order_by(KPI.code).all()
+        ]
     finally:
         db.close()
 
@@ -63,13 +75,13 @@ def get_kpi_by_code(code: str) -> Optional[KPI]:
 
 def get_kpis_dict() -> dict:
     """
-    Get a dictionary mapping KPI id to KPI object.
+    Get a dictionary mapping KPI id to KPI dict.
 
     Returns:
-        Dict of {kpi_id: KPI}
+        Dict of {kpi_id: KPI dict}
     """
     kpis = list_kpis(active_only=True)
-    return {kpi.id: kpi for kpi in kpis}
+    return {kpi["id"]: kpi for kpi in kpis}
 
 
 def get_kpi_options() -> List[tuple]:
@@ -80,4 +92,4 @@ def get_kpi_options() -> List[tuple]:
         List of tuples (kpi_id, display_text)
     """
     kpis = list_kpis(active_only=True)
-    return [(kpi.id, f"{kpi.code} - {kpi.label}") for kpi in kpis]
+    return [(kpi["id"], f"{kpi['code']} - {kpi['label']}") for kpi in kpis]
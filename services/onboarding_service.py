@@ -12,8 +12,10 @@ from services.tracking_service import (
     get_action_items
 )
 from services.access_service import get_user_agencies
+from services.cache import cached, invalidate
 
 
+@cached("users", scope=("user_id",))
 def is_onboarding_completed(user_id: int) -> bool:
     """
     Check if user has completed onboarding.
@@ -45,6 +47,7 @@ def complete_onboarding(user_id: int) -> None:
         if user:
             user.onboarding_completed = True
             db.commit()
+            invalidate("users", (user_id,))
     except Exception as e:
         db.rollback()
     finally:
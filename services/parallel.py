@@ -0,0 +1,99 @@
+"""
+Parallel - Bounded thread pool for building per-agency payloads concurrently.
+
+Used by the all-agencies builders (get_agencies_dashboard_data,
+get_all_agencies_summary). The agencies are split into contiguous chunks,
+and each chunk is built in its own thread with its own session. Chunks are
+joined back in their original order. If a chunk fails, the error of the
+first failing chunk (in order) is raised, as a sequential loop would, and
+the chunks not yet started are cancelled.
+
+The thread count is capped by the connection pool capacity (pool_size +
+max_overflow), so workers never queue on pool checkouts. Parallel mode is
+opt-in: DASHBOARD_WORKERS=0 (the default) or 1 keeps the sequential build.
+"""
+import os
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+from db.database import get_pool_capacity
+
+
+# Threads used by the all-agencies builders (0 or 1 = sequential)
+DASHBOARD_WORKERS = int(os.getenv("DASHBOARD_WORKERS", "0"))
+
+# Cap when the pool does not bound the number of connections (e.g. NullPool)
+MAX_WORKERS_UNBOUNDED_POOL = 8
+
+
+def get_worker_count(workers: Optional[int] = None, items: Optional[int] = None) -> int:
+    """
+    Number of threads to use, capped by the pool capacity and the item count.
+
+    Args:
+        workers: Requested threads (defaults to DASHBOARD_WORKERS)
+        items: Optional number of items to process
+
+    Returns:
+        Thread count (1 = sequential)
+    """
+    requested = DASHBOARD_WORKERS if workers is None else workers
+    capacity = get_pool_capacity() or MAX_WORKERS_UNBOUNDED_POOL
+    count = min(max(requested, 1), capacity)
+    if items is not None:
+        count = min(count, max(items, 1))
+    return count
+
+
+def split_chunks(items: Sequence[Any], chunks: int) -> List[List[Any]]:
+    """
+    Split items into contiguous chunks of near-equal size, keeping their order.
+
+    Args:
+        items: Items to split
+        chunks: Number of chunks
+
+    Returns:
+        List of non-empty chunks (fewer than requested if there are few items)
+    """
+    items = list(items)
+    chunks = max(1, min(chunks, len(items)))
+    size, extra = divmod(len(items), chunks)
+
+    result = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            result.append(items[start:end])
+        start = end
+    return result
+
+
+def map_ordered(func: Callable[[Any], Any], items: Sequence[Any], workers: int) -> List[Any]:
+    """
+    Apply func to every item on a bounded thread pool, keeping the input order.
+
+    Args:
+        func: Function of one item (must open its own session)
+        items: Items to process
+        workers: Thread count (1 = plain sequential loop)
+
+    Returns:
+        Results in the same order as items
+
+    Raises:
+        Exception: The error of the first failing item, in input order
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix="agency-builder")
+    try:
+        # Each task runs in a copy of the caller's context (SQL instrumentation)
+        futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+        return [future.result() for future in futures]
+    finally:
+        # On error, drop the items not started yet; running ones finish
+        executor.shutdown(wait=True, cancel_futures=True)
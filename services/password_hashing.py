@@ -0,0 +1,322 @@
+"""
+Password Hashing - bcrypt hashing and verification off the request thread.
+
+bcrypt is slow by design (~250 ms per call). Run inline, every login holds
+a Streamlit script thread, and competes with page renders for the server
+process' GIL. Here the calls run on a bounded process pool:
+
+- AUTH_HASH_WORKERS processes (0 = run inline, in the calling thread)
+- at most AUTH_HASH_MAX_CONCURRENCY calls in flight or queued; more callers
+  wait up to AUTH_HASH_QUEUE_TIMEOUT seconds for a slot, then get
+  PasswordHashingBusy (e.g. a burst of logins at the start of a shift)
+
+The worker processes are started on first use, and recreated if one dies.
+Forking a multi-threaded Streamlit server is unsafe, so on POSIX they are
+forked from a "forkserver" that preloads this module (passlib and bcrypt
+are imported once); elsewhere they are started with "spawn". Like any
+multiprocessing child, each worker imports the app's main script as
+__mp_main__, which only runs its module-level imports and page config
+(main.py keeps the page under its __main__ guard).
+
+The bcrypt cost is AUTH_BCRYPT_ROUNDS (calibrate it for the host with
+python -m scripts.calibrate_bcrypt). Hashes with any other cost still verify,
+and verify_and_update returns a new hash for them, so authenticate_user moves
+users to the configured cost as they log in.
+"""
+import os
+import atexit
+import threading
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+from passlib.context import CryptContext
+
+
+# bcrypt work factor (2^rounds iterations): each +1 doubles the hashing time
+AUTH_BCRYPT_ROUNDS = int(os.getenv("AUTH_BCRYPT_ROUNDS", "12"))
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+AUTH_HASH_MAX_CONCURRENCY = int(os.getenv("AUTH_HASH_MAX_CONCURRENCY", "64"))
+AUTH_HASH_QUEUE_TIMEOUT = float(os.getenv("AUTH_HASH_QUEUE_TIMEOUT", "30"))
+
+
+@lru_cache(maxsize=None)
+def get_crypt_context(rounds: int) -> CryptContext:
+    """
+    Get the bcrypt context for a work factor.
+
+    Hashes with a different cost verify but need an update, so a cost change
+    (up or down) is applied on the users' next login.
+
+    Args:
+        rounds: bcrypt cost (4-31)
+
+    Returns:
+        CryptContext
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+
+# Password hashing context using bcrypt
+pwd_context = get_crypt_context(AUTH_BCRYPT_ROUNDS)
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when no hashing slot frees up within AUTH_HASH_QUEUE_TIMEOUT."""
+    pass
+
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_workers = AUTH_HASH_WORKERS
+_slots = threading.BoundedSemaphore(max(1, AUTH_HASH_MAX_CONCURRENCY))
+_queue_timeout = AUTH_HASH_QUEUE_TIMEOUT
+_rounds = AUTH_BCRYPT_ROUNDS
+
+
+# The cost travels with each call: workers do not depend on their environment
+def _hash(password: str, rounds: int) -> str:
+    """Hash in the worker process."""
+    return get_crypt_context(rounds).hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str, rounds: int) -> bool:
+    """Verify in the worker process."""
+    return get_crypt_context(rounds).verify(plain_password, hashed_password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """Verify (and rehash if the cost changed) in the worker process."""
+    return get_crypt_context(rounds).verify_and_update(plain_password, hashed_password)
+
+
+def configure_hashing(
+    workers: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    queue_timeout: Optional[float] = None,
+    rounds: Optional[int] = None
+) -> None:
+    """
+    Change the pool settings at runtime (restarts the pool).
+
+    Args:
+        workers: Worker processes (0 = inline)
+        max_concurrency: Calls in flight or queued
+        queue_timeout: Seconds to wait for a slot
+        rounds: bcrypt cost for new hashes
+    """
+    global _workers, _slots, _queue_timeout, _rounds
+    shutdown_hashing_pool()
+    with _lock:
+        if workers is not None:
+            _workers = workers
+        if max_concurrency is not None:
+            _slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        if queue_timeout is not None:
+            _queue_timeout = queue_timeout
+        if rounds is not None:
+            _rounds = rounds
+
+
+def _get_mp_context():
+    """forkserver (preloading this module) where available, spawn otherwise."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    """Start the process pool on first use (None when running inline)."""
+    global _executor
+    with _lock:
+        if _workers <= 0:
+            return None
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_workers, mp_context=_get_mp_context())
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call starts a new one."""
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def warm_up_hashing_pool() -> None:
+    """Start the worker processes ahead of the first login (app startup)."""
+    executor = _get_executor()
+    if executor is None:
+        return
+    try:
+        for future in [executor.submit(pow, 1, 1) for _ in range(_workers)]:
+            future.result()
+    except BrokenProcessPool:
+        # Logins retry the pool and fall back to inline hashing (see _run)
+        _discard_executor(executor)
+        print("Password hashing pool unavailable, hashing inline")
+
+
+def shutdown_hashing_pool() -> None:
+    """Stop the worker processes."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_hashing_pool)
+
+
+def _run(func, *args):
+    """Run func on the pool, within the concurrency limit."""
+    slots = _slots
+    if not slots.acquire(timeout=_queue_timeout):
+        raise PasswordHashingBusy("Too many concurrent password operations")
+    try:
+        # A worker may die (e.g. killed): restart the pool and retry once
+        for _ in range(2):
+            executor = _get_executor()
+            if executor is None:
+                return func(*args)
+            try:
+                return executor.submit(func, *args).result()
+            except BrokenProcessPool:
+                _discard_executor(executor)
+        # Workers cannot start here: hash inline rather than block logins
+        print("Password hashing pool unavailable, hashing inline")
+        return func(*args)
+    finally:
+        slots.release()
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with bcrypt on the hashing pool.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+
+    Raises:
+        PasswordHashingBusy: If no slot frees up in time
+    """
+    return _run(_hash, password, _rounds)
+
+
+def _map(func, *iterables) -> list:
+    """Run func over the arguments spread on all the workers, in one slot."""
+    slots = _slots
+    if not slots.acquire(timeout=_queue_timeout):
+        raise PasswordHashingBusy("Too many concurrent password operations")
+    try:
+        calls = list(zip(*iterables))
+        executor = _get_executor()
+        if executor is not None:
+            try:
+                chunksize = max(1, len(calls) // (_workers * 4))
+                return list(executor.map(func, *iterables, chunksize=chunksize))
+            except BrokenProcessPool:
+                _discard_executor(executor)
+                print("Password hashing pool unavailable, hashing inline")
+        return [func(*args) for args in calls]
+    finally:
+        slots.release()
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hash many passwords, spread over all the pool workers (bulk provisioning).
+
+    Takes a single concurrency slot: meant for batch jobs, not request paths
+    (logins served by the same process queue behind the batch).
+
+    Args:
+        passwords: Plain text passwords
+
+    Returns:
+        Hashed passwords, in the same order
+
+    Raises:
+        PasswordHashingBusy: If no slot frees up in time
+    """
+    return _map(_hash, passwords, [_rounds] * len(passwords))
+
+
+def verify_passwords(plain_passwords: List[str], hashed_passwords: List[str]) -> List[bool]:
+    """
+    Verify many passwords against their hashes, like hash_passwords.
+
+    Args:
+        plain_passwords: Plain text passwords
+        hashed_passwords: Stored password hashes, in the same order
+
+    Returns:
+        List of booleans (True if the password matches), in the same order
+
+    Raises:
+        PasswordHashingBusy: If no slot frees up in time
+    """
+    return _map(_verify, plain_passwords, hashed_passwords, [_rounds] * len(plain_passwords))
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its bcrypt hash on the hashing pool.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Stored password hash
+
+    Returns:
+        True if password matches, False otherwise
+
+    Raises:
+        PasswordHashingBusy: If no slot frees up in time
+    """
+    return _run(_verify, plain_password, hashed_password, _rounds)
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses another cost, rehash it.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Stored password hash
+
+    Returns:
+        Tuple (valid, new_hash): new_hash is None unless the password is
+        valid and the stored hash needs an update
+
+    Raises:
+        PasswordHashingBusy: If no slot frees up in time
+    """
+    return _run(_verify_and_update, plain_password, hashed_password, _rounds)
+
+
+def needs_update(hashed_password: str) -> bool:
+    """
+    Check if a hash uses a different cost than AUTH_BCRYPT_ROUNDS (no hashing).
+
+    Args:
+        hashed_password: Stored password hash
+
+    Returns:
+        True if the hash should be replaced
+    """
+    return get_crypt_context(_rounds).needs_update(hashed_password)
@@ -0,0 +1,233 @@
+"""
+Planning Service - Batch loading of yearly targets for many agencies.
+
+A yearly plan is a long-format table with one row per agency, month and KPI:
+
+    agency,year,month,kpi,target_value
+    Agencia Centro,2026,1,CS,1200
+    Agencia Centro,2026,1,RIA,300
+    ...
+
+Agencies are referenced by name and KPIs by code. The whole plan is validated
+against agency_kpis in one pass and written in a single transaction.
+"""
+from typing import List, Dict, Any, Tuple
+from datetime import datetime
+from db.database import SessionLocal
+from db.models import Agency, AgencyKPI, KPI, MonthlyTarget
+from services.tracking_service import bulk_upsert_monthly_rows, refresh_kpi_status
+from services.utils import validate_month, validate_year
+from services.cache import invalidate
+
+
+# Columns required in a plan file
+PLAN_COLUMNS = ("agency", "year", "month", "kpi", "target_value")
+
+# Rows per INSERT ... ON CONFLICT statement (6 bound parameters per row). Capped
+# by the database's parameter limit: 999 // 6 rows on SQLite before 3.32
+DEFAULT_CHUNK_SIZE = 500
+
+
+class PlanningServiceError(Exception):
+    """Custom exception for planning service errors."""
+
+    def __init__(self, message: str, errors: List[str] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def read_plan_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a yearly plan from a CSV or Parquet file.
+
+    Args:
+        path: Path to a .csv or .parquet file
+
+    Returns:
+        List of row dicts with the PLAN_COLUMNS keys
+
+    Raises:
+        PlanningServiceError: If the format is unsupported or columns are missing
+    """
+    import pandas as pd
+
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        df = pd.read_csv(path)
+    elif lower.endswith(".parquet"):
+        try:
+            df = pd.read_parquet(path)
+        except ImportError as e:
+            raise PlanningServiceError(
+                "pyarrow is required to read Parquet files. "
+                "Install it with `pip install pyarrow`"
+            ) from e
+    else:
+        raise PlanningServiceError("Formato no soportado: use un archivo .csv o .parquet")
+
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    missing = [c for c in PLAN_COLUMNS if c not in df.columns]
+    if missing:
+        raise PlanningServiceError(f"Faltan columnas en el archivo: {', '.join(missing)}")
+
+    return df[list(PLAN_COLUMNS)].to_dict("records")
+
+
+def validate_plan(db, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Validate a plan against agencies, KPIs and agency_kpis in one pass.
+    Loads the lookup tables with three queries regardless of plan size.
+
+    Args:
+        db: Open session
+        rows: Plan rows (see read_plan_file)
+
+    Returns:
+        Tuple of (monthly_targets rows ready to upsert, list of error messages)
+    """
+    agency_ids = {name: agency_id for agency_id, name in db.query(Agency.id, Agency.name)}
+    kpi_ids = {code: kpi_id for kpi_id, code in db.query(KPI.id, KPI.code)}
+    assigned = set(
+        db.query(AgencyKPI.agency_id, AgencyKPI.kpi_id).filter(AgencyKPI.active == True)
+    )
+
+    now = datetime.utcnow()
+    valid_rows = []
+    errors = []
+    seen = set()
+
+    # Line numbers are reported as in the file (header is line 1)
+    for line, row in enumerate(rows, start=2):
+        agency_name = str(row["agency"]).strip()
+        kpi_code = str(row["kpi"]).strip()
+
+        agency_id = agency_ids.get(agency_name)
+        if agency_id is None:
+            errors.append(f"Línea {line}: agencia '{agency_name}' no existe")
+            continue
+
+        kpi_id = kpi_ids.get(kpi_code)
+        if kpi_id is None:
+            errors.append(f"Línea {line}: KPI '{kpi_code}' no existe")
+            continue
+
+        try:
+            year = float(row["year"])
+            month = float(row["month"])
+            target_value = float(row["target_value"])
+        except (TypeError, ValueError):
+            errors.append(f"Línea {line}: año, mes u objetivo no numérico")
+            continue
+
+        # Parquet/NumPy cells are floats: int() would turn month 3.7 into 3
+        if not year.is_integer() or not month.is_integer():
+            errors.append(f"Línea {line}: año y mes deben ser enteros ({row['year']}/{row['month']})")
+            continue
+        year, month = int(year), int(month)
+
+        if not validate_year(year) or not validate_month(month):
+            errors.append(f"Línea {line}: periodo inválido {year}/{month}")
+            continue
+
+        if target_value != target_value or target_value < 0:
+            errors.append(f"Línea {line}: objetivo inválido ({row['target_value']})")
+            continue
+
+        if (agency_id, kpi_id) not in assigned:
+            errors.append(f"Línea {line}: KPI '{kpi_code}' no está asignado a '{agency_name}'")
+            continue
+
+        key = (agency_id, year, month, kpi_id)
+        if key in seen:
+            errors.append(f"Línea {line}: objetivo duplicado para '{agency_name}' {kpi_code} {year}/{month}")
+            continue
+        seen.add(key)
+
+        valid_rows.append({
+            "agency_id": agency_id,
+            "year": year,
+            "month": month,
+            "kpi_id": kpi_id,
+            "target_value": target_value,
+            "created_at": now
+        })
+
+    return valid_rows, errors
+
+
+def load_plan(
+    rows: List[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Validate and write a yearly plan in a single transaction.
+    Nothing is written if any row is invalid.
+
+    Args:
+        rows: Plan rows (see read_plan_file)
+        chunk_size: Rows per bulk upsert statement
+        dry_run: If True, only validate
+
+    Returns:
+        Dict with counts: rows, agencies, kpis, months, written
+
+    Raises:
+        PlanningServiceError: If validation fails (errors in .errors) or the write fails
+    """
+    if chunk_size < 1:
+        raise PlanningServiceError("El tamaño de lote debe ser mayor a cero")
+
+    db = SessionLocal()
+    try:
+        valid_rows, errors = validate_plan(db, rows)
+        if errors:
+            raise PlanningServiceError(
+                f"El plan tiene {len(errors)} fila(s) inválida(s)", errors
+            )
+
+        written = 0
+        if not dry_run:
+            for start in range(0, len(valid_rows), chunk_size):
+                chunk = valid_rows[start:start + chunk_size]
+                bulk_upsert_monthly_rows(db, MonthlyTarget, chunk, ["target_value"])
+                written += len(chunk)
+            for year in sorted({r["year"] for r in valid_rows}):
+                refresh_kpi_status(db, year=year, chunk_size=chunk_size)
+            db.commit()
+            invalidate("tracking")
+
+        return {
+            "rows": len(valid_rows),
+            "agencies": len({r["agency_id"] for r in valid_rows}),
+            "kpis": len({r["kpi_id"] for r in valid_rows}),
+            "months": len({(r["year"], r["month"]) for r in valid_rows}),
+            "written": written
+        }
+    except PlanningServiceError:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise PlanningServiceError(f"Error al cargar el plan: {str(e)}")
+    finally:
+        db.close()
+
+
+def load_plan_file(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Read a CSV/Parquet plan file and load it (see load_plan).
+
+    Args:
+        path: Path to a .csv or .parquet file
+        chunk_size: Rows per bulk upsert statement
+        dry_run: If True, only validate
+
+    Returns:
+        Dict with load counts
+    """
+    return load_plan(read_plan_file(path), chunk_size=chunk_size, dry_run=dry_run)
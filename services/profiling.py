@@ -0,0 +1,294 @@
+"""
+Profiling - Render timings of Streamlit pages and sections.
+
+Pages (main.py) and their render_* sections are timed with the profiled
+decorator or the profile_section context manager. Timings are aggregated
+in process, per name: count, total, min/max, a fixed-bucket histogram and
+the most recent samples (for p50/p95). Like the cache, the statistics are
+shared by every session served by the process. Admins see them on the
+"Rendimiento" page (ui/performance.py).
+
+Slow render capture (opt-in, PROFILE_SLOW_MS > 0): page renders run under a
+profiler (cProfile, or pyinstrument if installed and PROFILE_BACKEND=
+pyinstrument). Renders slower than the threshold are dumped to
+PROFILE_DUMP_DIR, as a .prof/.html file plus a text summary. Profiling
+slows renders down, so leave it off unless investigating. One render is
+captured at a time per process (since Python 3.12 cProfile hooks every
+thread); renders that start while another one is captured are only timed.
+
+Usage:
+    @profiled()
+    def render_kpi_cards(data):
+        ...
+
+    with profile_section("page:dashboard", capture=True):
+        dashboard_admin.render(current_user)
+"""
+import os
+import io
+import time
+import bisect
+import pstats
+import cProfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Set to false to disable timing entirely
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Page renders slower than this are dumped with a profiler (0 = never profile)
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+# cprofile or pyinstrument (falls back to cprofile if not installed)
+PROFILE_BACKEND = os.getenv("PROFILE_BACKEND", "cprofile").lower()
+PROFILE_DUMP_DIR = os.getenv("PROFILE_DUMP_DIR", "profiles")
+# Dumps kept in PROFILE_DUMP_DIR (oldest removed first)
+PROFILE_MAX_DUMPS = int(os.getenv("PROFILE_MAX_DUMPS", "50"))
+
+# Histogram bucket upper bounds in ms (last bucket: above the last bound)
+HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# Samples kept per name for percentiles
+RECENT_SAMPLES = 500
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, Any]] = {}
+# Held while a profiler runs (profilers are process-wide and do not nest)
+_profiler_lock = threading.Lock()
+
+
+def record_timing(name: str, elapsed_ms: float) -> None:
+    """
+    Add one timing to the statistics of a page or section.
+
+    Args:
+        name: Page or section name
+        elapsed_ms: Render time in milliseconds
+    """
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = {
+                "count": 0,
+                "total_ms": 0.0,
+                "min_ms": elapsed_ms,
+                "max_ms": elapsed_ms,
+                "buckets": [0] * (len(HISTOGRAM_BOUNDS_MS) + 1),
+                "recent": deque(maxlen=RECENT_SAMPLES)
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["min_ms"] = min(entry["min_ms"], elapsed_ms)
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["buckets"][bisect.bisect_left(HISTOGRAM_BOUNDS_MS, elapsed_ms)] += 1
+        entry["recent"].append(elapsed_ms)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def get_profile_stats() -> List[Dict[str, Any]]:
+    """
+    Get the aggregated render timings.
+
+    Returns:
+        List of dicts (name, count, total_ms, avg_ms, min_ms, max_ms, p50_ms,
+        p95_ms, histogram) sorted by total time, descending. histogram is a
+        list of (label, count) with one entry per bucket.
+    """
+    with _lock:
+        snapshot = {
+            name: dict(entry, buckets=list(entry["buckets"]), recent=sorted(entry["recent"]))
+            for name, entry in _stats.items()
+        }
+
+    labels = [f"≤{bound}" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}"]
+    result = [
+        {
+            "name": name,
+            "count": entry["count"],
+            "total_ms": entry["total_ms"],
+            "avg_ms": entry["total_ms"] / entry["count"],
+            "min_ms": entry["min_ms"],
+            "max_ms": entry["max_ms"],
+            "p50_ms": _percentile(entry["recent"], 50),
+            "p95_ms": _percentile(entry["recent"], 95),
+            "histogram": list(zip(labels, entry["buckets"]))
+        }
+        for name, entry in snapshot.items()
+    ]
+    result.sort(key=lambda x: x["total_ms"], reverse=True)
+    return result
+
+
+def reset_profile_stats() -> None:
+    """Drop all aggregated timings."""
+    with _lock:
+        _stats.clear()
+
+
+def _start_profiler():
+    """Start the configured profiler; return (backend, profiler) or (None, None)."""
+    if PROFILE_BACKEND == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            Profiler = None
+        if Profiler is not None:
+            try:
+                profiler = Profiler()
+                profiler.start()
+                return "pyinstrument", profiler
+            except Exception as e:
+                print(f"Could not start profiler: {e}")
+                return None, None
+    try:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return "cprofile", profiler
+    except Exception as e:
+        # e.g. another profiler or debugger already hooks the process
+        print(f"Could not start profiler: {e}")
+        return None, None
+
+
+def _stop_profiler(backend: str, profiler) -> None:
+    """Stop a profiler started by _start_profiler."""
+    if backend == "pyinstrument":
+        profiler.stop()
+    else:
+        profiler.disable()
+
+
+def _dump_profile(name: str, elapsed_ms: float, backend: str, profiler) -> Optional[str]:
+    """
+    Write a slow render's profile to PROFILE_DUMP_DIR.
+
+    Returns:
+        Path of the text summary, or None if it could not be written
+    """
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    base = os.path.join(PROFILE_DUMP_DIR, f"{stamp}_{safe_name}_{elapsed_ms:.0f}ms")
+
+    try:
+        os.makedirs(PROFILE_DUMP_DIR, exist_ok=True)
+        if backend == "pyinstrument":
+            with open(f"{base}.html", "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+            summary = profiler.output_text(unicode=True, color=False)
+        else:
+            profiler.dump_stats(f"{base}.prof")
+            buffer = io.StringIO()
+            pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(40)
+            summary = buffer.getvalue()
+
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(f"{name}: {elapsed_ms:.1f} ms ({backend})\n\n{summary}")
+
+        _prune_dumps()
+        return f"{base}.txt"
+    except OSError as e:
+        print(f"Could not write profile for {name}: {e}")
+        return None
+
+
+def _prune_dumps() -> None:
+    """Keep only the PROFILE_MAX_DUMPS most recent dumps."""
+    summaries = sorted(f for f in os.listdir(PROFILE_DUMP_DIR) if f.endswith(".txt"))
+    for old in summaries[:max(0, len(summaries) - PROFILE_MAX_DUMPS)]:
+        stem = old[:-len(".txt")]
+        for extension in (".txt", ".prof", ".html"):
+            path = os.path.join(PROFILE_DUMP_DIR, stem + extension)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def list_profile_dumps() -> List[Dict[str, Any]]:
+    """
+    List the slow render dumps, most recent first.
+
+    Returns:
+        List of dicts with file (text summary path), name and modified_at
+    """
+    if not os.path.isdir(PROFILE_DUMP_DIR):
+        return []
+
+    dumps = []
+    for file_name in sorted(os.listdir(PROFILE_DUMP_DIR), reverse=True):
+        if file_name.endswith(".txt"):
+            path = os.path.join(PROFILE_DUMP_DIR, file_name)
+            dumps.append({
+                "file": path,
+                "name": file_name[:-len(".txt")],
+                "modified_at": datetime.fromtimestamp(os.path.getmtime(path))
+            })
+    return dumps
+
+
+@contextmanager
+def profile_section(name: str, capture: bool = False):
+    """
+    Time the block and record it under name (only if it completes).
+
+    Args:
+        name: Page or section name
+        capture: Run under a profiler and dump it if slower than PROFILE_SLOW_MS
+            (ignored while another render of the process is captured)
+    """
+    if not PROFILE_ENABLED:
+        yield
+        return
+
+    profiler = None
+    if capture and PROFILE_SLOW_MS > 0 and _profiler_lock.acquire(blocking=False):
+        backend, profiler = _start_profiler()
+        if profiler is None:
+            _profiler_lock.release()
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if profiler is not None:
+            try:
+                _stop_profiler(backend, profiler)
+            finally:
+                _profiler_lock.release()
+
+    # Reached only without exception (e.g. st.rerun() interrupts the render)
+    record_timing(name, elapsed_ms)
+    if profiler is not None and elapsed_ms >= PROFILE_SLOW_MS:
+        _dump_profile(name, elapsed_ms, backend, profiler)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    Decorator that times every call of a render function.
+
+    Args:
+        name: Section name (defaults to "<module>.<function>", e.g.
+            "dashboard_admin.render_kpi_cards")
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        section = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_section(section):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,395 @@
+"""
+Provisioning Service - Bulk creation of users and agency assignments.
+
+A provisioning file has one row per user:
+
+    username,password,role,agencies,active
+    jperez,Inicio2026!,NORMAL,Agencia Centro;Agencia Norte,true
+    mlopez,,NORMAL,Agencia Sur,
+    agarcia,Inicio2026!,ADMIN,,
+
+- Users that do not exist are created (password required, 8+ characters).
+- Existing users get the given role; a password different from their
+  current one resets it (an empty cell, or their current password, keeps
+  it), and an empty active cell (or no active column) keeps their status.
+- agencies (names separated by ";") is the complete list of assignments of
+  the user; ADMIN users access all agencies and take none.
+
+The whole file is validated in one pass (three lookup queries, regardless
+of its size); nothing is written if any row is invalid. Passwords are
+checked against the current hashes and hashed first, in parallel on the
+password hashing pool and without holding a connection. The file is then
+validated again and written in a single transaction, so the changes are
+computed from the data they are applied to. Assignments are diffed against
+the existing ones: only missing rows are inserted and only dropped ones
+deleted.
+"""
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import insert, delete
+from db.database import SessionLocal
+from db.models import User, UserAgency, Agency
+from services.cache import invalidate
+from services.password_hashing import hash_passwords, verify_passwords, PasswordHashingBusy
+
+
+# Columns required in a provisioning file (active is optional)
+USER_COLUMNS = ("username", "password", "role", "agencies")
+
+MIN_PASSWORD_LENGTH = 8
+AGENCY_SEPARATOR = ";"
+
+_TRUE_VALUES = ("1", "true", "si", "sí", "yes", "y", "s")
+_FALSE_VALUES = ("0", "false", "no", "n")
+
+
+class ProvisioningServiceError(Exception):
+    """Custom exception for provisioning service errors."""
+
+    def __init__(self, message: str, errors: List[str] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def read_users_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Read users to provision from a CSV file.
+
+    Args:
+        path: Path to a .csv file
+
+    Returns:
+        List of row dicts with the USER_COLUMNS keys (and active, if present)
+
+    Raises:
+        ProvisioningServiceError: If the format is unsupported or columns are missing
+    """
+    import pandas as pd
+
+    if not path.lower().endswith(".csv"):
+        raise ProvisioningServiceError("Formato no soportado: use un archivo .csv")
+
+    # Everything as text: empty cells stay "" (not NaN)
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    missing = [c for c in USER_COLUMNS if c not in df.columns]
+    if missing:
+        raise ProvisioningServiceError(f"Faltan columnas en el archivo: {', '.join(missing)}")
+
+    columns = list(USER_COLUMNS) + (["active"] if "active" in df.columns else [])
+    return df[columns].to_dict("records")
+
+
+def _parse_active(value: Any) -> Optional[bool]:
+    """Parse an active cell: True/False, None if empty; raises ValueError otherwise."""
+    text = str(value if value is not None else "").strip().lower()
+    if not text:
+        return None
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    raise ValueError(text)
+
+
+def validate_users(db, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Validate provisioning rows against users and agencies in one pass.
+
+    Args:
+        db: Open session
+        rows: Rows (see read_users_file)
+
+    Returns:
+        Tuple of (list of planned changes per user, list of error messages).
+        Each change dict has username, user_id (None for new users), role,
+        active, password, agency_ids and current (the user's current role,
+        active, password_hash and agency_ids, or None)
+    """
+    users = {
+        username: {"id": user_id, "role": role, "active": active, "password_hash": password_hash}
+        for user_id, username, role, active, password_hash in db.query(
+            User.id, User.username, User.role, User.active, User.password_hash
+        )
+    }
+    agency_ids = {name: agency_id for agency_id, name in db.query(Agency.id, Agency.name)}
+    assigned: Dict[int, set] = {}
+    for user_id, agency_id in db.query(UserAgency.user_id, UserAgency.agency_id):
+        assigned.setdefault(user_id, set()).add(agency_id)
+
+    planned = []
+    errors = []
+    seen = set()
+
+    # Line numbers are reported as in the file (header is line 1)
+    for line, row in enumerate(rows, start=2):
+        username = str(row["username"]).strip()
+        password = str(row["password"])
+        role = str(row["role"]).strip().upper()
+
+        if not username:
+            errors.append(f"Línea {line}: nombre de usuario vacío")
+            continue
+        if username in seen:
+            errors.append(f"Línea {line}: usuario '{username}' duplicado en el archivo")
+            continue
+        seen.add(username)
+
+        if role not in ("ADMIN", "NORMAL"):
+            errors.append(f"Línea {line}: el rol debe ser ADMIN o NORMAL ('{row['role']}')")
+            continue
+
+        try:
+            active = _parse_active(row.get("active"))
+        except ValueError:
+            errors.append(f"Línea {line}: valor de activo inválido ('{row['active']}')")
+            continue
+
+        existing = users.get(username)
+        if password and len(password) < MIN_PASSWORD_LENGTH:
+            errors.append(f"Línea {line}: la contraseña debe tener al menos {MIN_PASSWORD_LENGTH} caracteres")
+            continue
+        if existing is None and not password:
+            errors.append(f"Línea {line}: el usuario nuevo '{username}' necesita contraseña")
+            continue
+
+        names = []
+        for name in str(row["agencies"]).split(AGENCY_SEPARATOR):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+        unknown = [name for name in names if name not in agency_ids]
+        if unknown:
+            errors.append(f"Línea {line}: agencia(s) inexistente(s): {', '.join(unknown)}")
+            continue
+        if role == "ADMIN" and names:
+            errors.append(f"Línea {line}: los usuarios ADMIN acceden a todas las agencias; deje 'agencies' vacío")
+            continue
+        if role == "NORMAL" and not names:
+            errors.append(f"Línea {line}: debe asignar al menos una agencia al usuario NORMAL '{username}'")
+            continue
+
+        current = None
+        if existing is not None:
+            current = dict(existing, agency_ids=assigned.get(existing["id"], set()))
+
+        planned.append({
+            "username": username,
+            "user_id": existing["id"] if existing else None,
+            "role": role,
+            "active": active if active is not None else (existing["active"] if existing else True),
+            "password": password or None,
+            "agency_ids": {agency_ids[name] for name in names},
+            "current": current
+        })
+
+    return planned, errors
+
+
+def _describe(change: Dict[str, Any], agency_names: Dict[int, str]) -> List[str]:
+    """Human readable list of what a planned change does to a user."""
+    current = change["current"]
+    if current is None:
+        details = [f"nuevo ({change['role']})"]
+        if not change["active"]:
+            details.append("inactivo")
+    else:
+        details = []
+        if change["role"] != current["role"]:
+            details.append(f"rol {current['role']} → {change['role']}")
+        if change["active"] != current["active"]:
+            details.append("activado" if change["active"] else "desactivado")
+        if change["password"]:
+            details.append("contraseña restablecida")
+
+    previous = current["agency_ids"] if current else set()
+    details += [f"+{agency_names[a]}" for a in sorted(change["agency_ids"] - previous, key=agency_names.get)]
+    details += [f"-{agency_names[a]}" for a in sorted(previous - change["agency_ids"], key=agency_names.get)]
+    return details
+
+
+def _check_passwords(planned: List[Dict[str, Any]], hash_new: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare the passwords of the file with the current ones and hash new ones.
+
+    Args:
+        planned: Planned changes from validate_users
+        hash_new: If False, only compare (dry run)
+
+    Returns:
+        Dict {username: {"checked_hash": hash compared against (None for
+        new users), "changed": False if it is the current password,
+        "password_hash": new hash (None if unchanged or not hash_new)}}
+        for the rows with a password
+    """
+    with_password = [c for c in planned if c["password"]]
+    existing = [c for c in with_password if c["current"] is not None]
+    matches = verify_passwords(
+        [c["password"] for c in existing],
+        [c["current"]["password_hash"] for c in existing]
+    )
+    unchanged = {c["username"] for c, match in zip(existing, matches) if match}
+
+    to_hash = [c for c in with_password if c["username"] not in unchanged] if hash_new else []
+    hashes = dict(zip([c["username"] for c in to_hash], hash_passwords([c["password"] for c in to_hash])))
+
+    return {
+        c["username"]: {
+            "checked_hash": c["current"]["password_hash"] if c["current"] else None,
+            "changed": c["username"] not in unchanged,
+            "password_hash": hashes.get(c["username"])
+        }
+        for c in with_password
+    }
+
+
+def provision_users(rows: List[Dict[str, Any]], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Validate and apply a provisioning file in a single transaction.
+    Nothing is written if any row is invalid.
+
+    Args:
+        rows: Rows (see read_users_file)
+        dry_run: If True, only validate and report what would change
+
+    Returns:
+        Dict with created, updated and unchanged (lists of usernames),
+        changes ({username: [change descriptions]}), assignments_added,
+        assignments_removed and passwords_set counts
+
+    Raises:
+        ProvisioningServiceError: If validation fails (errors in .errors),
+            a user changes during the import or the write fails
+    """
+    db = SessionLocal()
+    try:
+        planned, errors = validate_users(db, rows)
+        if errors:
+            raise ProvisioningServiceError(
+                f"El archivo tiene {len(errors)} fila(s) inválida(s)", errors
+            )
+
+        # Release the connection while checking and hashing (on the pool)
+        db.rollback()
+        passwords = _check_passwords(planned, hash_new=not dry_run)
+
+        # Validate again in the write transaction: the changes are computed
+        # from the same data they are applied to
+        planned, errors = validate_users(db, rows)
+        if errors:
+            raise ProvisioningServiceError(
+                f"El archivo tiene {len(errors)} fila(s) inválida(s)", errors
+            )
+
+        for c in planned:
+            if not c["password"]:
+                continue
+            checked = passwords[c["username"]]
+            current_hash = c["current"]["password_hash"] if c["current"] else None
+            if current_hash != checked["checked_hash"]:
+                raise ProvisioningServiceError(
+                    f"El usuario '{c['username']}' cambió durante la importación; vuelva a ejecutarla"
+                )
+            if not checked["changed"]:
+                # Same password as the current one: nothing to reset
+                c["password"] = None
+            c["password_hash"] = checked["password_hash"]
+
+        agency_names = {agency_id: name for agency_id, name in db.query(Agency.id, Agency.name)}
+        changes = {c["username"]: _describe(c, agency_names) for c in planned}
+        to_write = [c for c in planned if changes[c["username"]]]
+
+        summary = {
+            "created": [c["username"] for c in planned if c["user_id"] is None],
+            "updated": [c["username"] for c in to_write if c["user_id"] is not None],
+            "unchanged": [c["username"] for c in planned if not changes[c["username"]]],
+            "changes": {username: details for username, details in changes.items() if details},
+            "assignments_added": 0,
+            "assignments_removed": 0,
+            "passwords_set": len([c for c in to_write if c["password"]])
+        }
+        for c in to_write:
+            previous = c["current"]["agency_ids"] if c["current"] else set()
+            summary["assignments_added"] += len(c["agency_ids"] - previous)
+            summary["assignments_removed"] += len(previous - c["agency_ids"])
+
+        if dry_run or not to_write:
+            return summary
+
+        new_users = {}
+        for c in to_write:
+            if c["user_id"] is None:
+                new_users[c["username"]] = User(
+                    username=c["username"],
+                    password_hash=c["password_hash"],
+                    role=c["role"],
+                    active=c["active"]
+                )
+        db.add_all(new_users.values())
+        db.flush()
+
+        existing_users = {
+            user.id: user for user in db.query(User).filter(
+                User.id.in_([c["user_id"] for c in to_write if c["user_id"] is not None])
+            )
+        }
+
+        added = []
+        removed = []
+        for c in to_write:
+            if c["user_id"] is None:
+                user_id = new_users[c["username"]].id
+                previous = set()
+            else:
+                user_id = c["user_id"]
+                previous = c["current"]["agency_ids"]
+                user = existing_users[user_id]
+                user.role = c["role"]
+                user.active = c["active"]
+                if c["password"]:
+                    user.password_hash = c["password_hash"]
+                    user.failed_attempts = 0
+                    user.locked_until = None
+            c["user_id"] = user_id
+            added += [{"user_id": user_id, "agency_id": a} for a in c["agency_ids"] - previous]
+            removed += [(user_id, a) for a in previous - c["agency_ids"]]
+
+        if added:
+            db.execute(insert(UserAgency), added)
+        for user_id in {user_id for user_id, _ in removed}:
+            db.execute(delete(UserAgency).where(
+                UserAgency.user_id == user_id,
+                UserAgency.agency_id.in_([a for u, a in removed if u == user_id])
+            ))
+
+        db.commit()
+
+        scopes = [(c["user_id"],) for c in to_write]
+        invalidate("access", *scopes)
+        invalidate("users", *scopes)
+        return summary
+    except ProvisioningServiceError:
+        db.rollback()
+        raise
+    except PasswordHashingBusy:
+        db.rollback()
+        raise ProvisioningServiceError("El servicio de contraseñas está ocupado. Intente de nuevo")
+    except Exception as e:
+        db.rollback()
+        raise ProvisioningServiceError(f"Error al importar usuarios: {str(e)}")
+    finally:
+        db.close()
+
+
+def provision_users_file(path: str, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Read a CSV provisioning file and apply it (see provision_users).
+
+    Args:
+        path: Path to a .csv file
+        dry_run: If True, only validate and report
+
+    Returns:
+        Dict with the provisioning summary
+    """
+    return provision_users(read_users_file(path), dry_run=dry_run)
@@ -0,0 +1,199 @@
+"""
+Ranking Service - Agency ranking for a period, computed in SQL.
+
+Average attainment and status counts per agency are aggregated by the
+database from the materialized KPI status (agency_kpi_status), so a ranking
+page only loads the agencies it shows (limit/offset, top-N, bottom-N)
+instead of building the summary of every agency in Python.
+
+Same figures as get_all_agencies_summary: the average is taken over the
+agency's assigned KPIs, and an assigned KPI without target or result counts
+as 0% (red).
+"""
+from typing import List, Optional, Dict, Any
+from sqlalchemy import func, case, and_, exists
+from db.database import SessionLocal
+from db.models import Agency, AgencyManager, AgencyKPI, AgencyKPIStatus
+from services.tracking_service import ALL_AGENCIES_PERIOD_SCOPE
+from services.cache import cached
+from services.utils import contains_pattern, LIKE_ESCAPE
+
+
+class RankingServiceError(Exception):
+    """Custom exception for ranking service errors."""
+    pass
+
+
+# Ranking orders:
+# - top: best average attainment first
+# - bottom: worst average attainment first
+# - risk: most red KPIs first, then most yellow, then fewest green (admin dashboard order)
+RANKING_ORDERS = ("top", "bottom", "risk")
+
+
+@cached("tracking", scope=ALL_AGENCIES_PERIOD_SCOPE, depends_on=("agencies", "kpis"))
+def get_agency_ranking(
+    year: int,
+    month: int,
+    order: str = "top",
+    limit: Optional[int] = None,
+    offset: int = 0,
+    city: Optional[str] = None,
+    manager: Optional[str] = None,
+    only_with_kpis: bool = True
+) -> Dict[str, Any]:
+    """
+    Rank the active agencies of a period.
+
+    Args:
+        year: Year
+        month: Month (1-12)
+        order: One of RANKING_ORDERS
+        limit: Optional page size (e.g. 5 for a top 5)
+        offset: Number of agencies to skip (with limit, for pagination)
+        city: Optional case-insensitive filter on the city (exact match)
+        manager: Optional case-insensitive substring filter on the active manager name
+        only_with_kpis: If True, skip agencies without assigned KPIs
+
+    Returns:
+        Dict with:
+        - total: Number of agencies matching the filters (for pagination)
+        - agencies: Ranking rows with position, agency_id, agency_name, city,
+          manager_name, kpi_count, avg_pct, green_count, yellow_count, red_count
+
+    Raises:
+        RankingServiceError: If the order is unknown or the paging is invalid
+    """
+    if order not in RANKING_ORDERS:
+        raise RankingServiceError(f"Orden de ranking desconocido: {order}")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise RankingServiceError("Paginación inválida")
+
+    kpi_count = func.count(AgencyKPI.id)
+    green_count = func.sum(case((AgencyKPIStatus.status == "green", 1), else_=0))
+    yellow_count = func.sum(case((AgencyKPIStatus.status == "yellow", 1), else_=0))
+    # Assigned KPIs without a status row have no target nor result: red
+    red_count = func.sum(case(
+        (and_(AgencyKPI.id.isnot(None), AgencyKPIStatus.status.is_(None)), 1),
+        (AgencyKPIStatus.status == "red", 1),
+        else_=0
+    ))
+    avg_pct = func.coalesce(
+        func.sum(func.coalesce(AgencyKPIStatus.pct, 0.0)) / func.nullif(kpi_count, 0),
+        0.0
+    )
+
+    db = SessionLocal()
+    try:
+        query = db.query(
+            Agency.id, Agency.name, Agency.city,
+            kpi_count.label("kpi_count"),
+            avg_pct.label("avg_pct"),
+            green_count.label("green_count"),
+            yellow_count.label("yellow_count"),
+            red_count.label("red_count")
+        ).outerjoin(
+            AgencyKPI,
+            and_(AgencyKPI.agency_id == Agency.id, AgencyKPI.active == True)
+        ).outerjoin(
+            AgencyKPIStatus,
+            and_(
+                AgencyKPIStatus.agency_id == Agency.id,
+                AgencyKPIStatus.kpi_id == AgencyKPI.kpi_id,
+                AgencyKPIStatus.year == year,
+                AgencyKPIStatus.month == month
+            )
+        ).filter(Agency.active == True)
+
+        if city:
+            query = query.filter(func.lower(Agency.city) == city.lower())
+        if manager:
+            query = query.filter(exists().where(
+                AgencyManager.agency_id == Agency.id,
+                AgencyManager.active == True,
+                AgencyManager.full_name.ilike(contains_pattern(manager), escape=LIKE_ESCAPE)
+            ))
+
+        query = query.group_by(Agency.id, Agency.name, Agency.city)
+        if only_with_kpis:
+            query = query.having(kpi_count > 0)
+
+        total = db.query(func.count()).select_from(query.subquery()).scalar()
+
+        if order == "top":
+            query = query.order_by(avg_pct.desc(), Agency.name)
+        elif order == "bottom":
+            query = query.order_by(avg_pct.asc(), Agency.name)
+        else:
+            query = query.order_by(
+                red_count.desc(), yellow_count.desc(), green_count.asc(), Agency.name
+            )
+
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        rows = query.all()
+
+        # Active manager of the listed agencies only
+        managers_by_agency: Dict[int, str] = {}
+        if rows:
+            for agency_id, full_name in db.query(
+                AgencyManager.agency_id, AgencyManager.full_name
+            ).filter(
+                AgencyManager.agency_id.in_([row.id for row in rows]),
+                AgencyManager.active == True
+            ).order_by(AgencyManager.agency_id, AgencyManager.id):
+                managers_by_agency.setdefault(agency_id, full_name)
+
+        agencies: List[Dict[str, Any]] = [
+            {
+                "position": offset + i,
+                "agency_id": row.id,
+                "agency_name": row.name,
+                "city": row.city,
+                "manager_name": managers_by_agency.get(row.id),
+                "kpi_count": row.kpi_count,
+                "avg_pct": float(row.avg_pct),
+                "green_count": int(row.green_count or 0),
+                "yellow_count": int(row.yellow_count or 0),
+                "red_count": int(row.red_count or 0)
+            }
+            for i, row in enumerate(rows, 1)
+        ]
+
+        return {"total": total, "agencies": agencies}
+    finally:
+        db.close()
+
+
+def get_top_agencies(year: int, month: int, n: int = 5, **filters) -> List[Dict[str, Any]]:
+    """
+    Get the N agencies with the best average attainment.
+
+    Args:
+        year: Year
+        month: Month (1-12)
+        n: Number of agencies
+        filters: city / manager filters (see get_agency_ranking)
+
+    Returns:
+        List of ranking rows
+    """
+    return get_agency_ranking(year, month, order="top", limit=n, **filters)["agencies"]
+
+
+def get_bottom_agencies(year: int, month: int, n: int = 5, **filters) -> List[Dict[str, Any]]:
+    """
+    Get the N agencies with the worst average attainment.
+
+    Args:
+        year: Year
+        month: Month (1-12)
+        n: Number of agencies
+        filters: city / manager filters (see get_agency_ranking)
+
+    Returns:
+        List of ranking rows
+    """
+    return get_agency_ranking(year, month, order="bottom", limit=n, **filters)["agencies"]
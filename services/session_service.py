@@ -0,0 +1,154 @@
+"""
+Session Service - Signed principal of the logged-in user.
+
+Built once at login and kept in the Streamlit session state, the principal
+carries what every rerun needs to know about the user: role, whether the
+security countries are configured, whether onboarding is completed and the
+allowed agency IDs. Reruns read it instead of querying User,
+UserSecurityCountry and UserAgency again.
+
+The principal records the cache versions (services/cache.py) of the user's
+"users" and "access" scopes, of those namespaces as a whole (bumped by
+namespace-wide invalidations, e.g. bulk writes) and of the "agencies"
+namespace when it was built. The services that change those data already
+invalidate them, so a principal whose versions no longer match is rebuilt
+(two queries, plus the access index if it changed). As with cached reads,
+writes from other processes are only seen after PRINCIPAL_MAX_AGE_SECONDS
+(defaults to CACHE_TTL_SECONDS).
+
+The principal is signed (HMAC-SHA256) with SESSION_SECRET, or a random
+per-process key: a principal that was not built here is rejected.
+"""
+import os
+import hmac
+import json
+import time
+import hashlib
+import secrets
+from typing import Dict, Any, Optional, Tuple
+from db.database import SessionLocal
+from db.models import User, UserSecurityCountry
+from services.cache import get_version, DEFAULT_TTL_SECONDS
+from services.auth_service import REQUIRED_SECURITY_COUNTRIES
+from services.access_service import get_access_index, get_user_agency_ids
+
+
+PRINCIPAL_MAX_AGE_SECONDS = float(os.getenv("PRINCIPAL_MAX_AGE_SECONDS", str(DEFAULT_TTL_SECONDS)))
+_SECRET = os.getenv("SESSION_SECRET", "").encode() or secrets.token_bytes(32)
+
+
+def get_principal_version(user_id: int) -> Tuple[int, ...]:
+    """
+    Get the cache versions a principal depends on (no database access).
+
+    invalidate(namespace) with no scopes only bumps the namespace version,
+    so both the user's scopes and the whole namespaces are checked.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Tuple of the "users" and "access" scope versions of the user, the
+        "users" and "access" namespace versions and the "agencies"
+        namespace version
+    """
+    return (
+        get_version("users", (user_id,)),
+        get_version("access", (user_id,)),
+        get_version("users"),
+        get_version("access"),
+        get_version("agencies")
+    )
+
+
+def _sign(principal: Dict[str, Any]) -> str:
+    """HMAC of every principal field except the signature."""
+    payload = json.dumps(
+        {k: v for k, v in principal.items() if k != "signature"},
+        sort_keys=True, default=str
+    )
+    return hmac.new(_SECRET, payload.encode(), hashlib.sha256).hexdigest()
+
+
+def load_principal(user_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Build the principal of a user from the database.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Principal dict (id, username, role, active, security_configured,
+        onboarding_completed, agency_ids, version, issued_at, signature),
+        or None if the user does not exist or is inactive. agency_ids is
+        None for ADMIN users (all agencies).
+    """
+    # Taken before reading: a write during the load leaves the principal stale
+    version = get_principal_version(user_id)
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user or not user.active:
+            return None
+
+        security_count = db.query(UserSecurityCountry).filter(
+            UserSecurityCountry.user_id == user_id
+        ).count()
+
+        # Access index: cached and shared with the access checks
+        agency_ids = None
+        if not get_access_index(user_id)["all_agencies"]:
+            agency_ids = get_user_agency_ids(user_id)
+
+        principal = {
+            "id": user.id,
+            "username": user.username,
+            "role": user.role,
+            "active": user.active,
+            "security_configured": security_count >= REQUIRED_SECURITY_COUNTRIES,
+            "onboarding_completed": bool(user.onboarding_completed),
+            "agency_ids": agency_ids,
+            "version": list(version),
+            "issued_at": time.time()
+        }
+        principal["signature"] = _sign(principal)
+        return principal
+    finally:
+        db.close()
+
+
+def is_principal_current(principal: Dict[str, Any]) -> bool:
+    """
+    Check a principal's versions and age (no database access).
+
+    Args:
+        principal: Principal dict from load_principal
+
+    Returns:
+        True if it can be used as is
+    """
+    return (
+        list(get_principal_version(principal["id"])) == principal["version"]
+        and time.time() - principal["issued_at"] < PRINCIPAL_MAX_AGE_SECONDS
+    )
+
+
+def revalidate_principal(principal: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Return the principal if still current, otherwise rebuild it.
+
+    Args:
+        principal: Principal dict stored in the session
+
+    Returns:
+        Current principal, or None if it is invalid (bad signature) or the
+        user no longer exists or was deactivated
+    """
+    if not principal or not hmac.compare_digest(principal.get("signature", ""), _sign(principal)):
+        return None
+
+    if is_principal_current(principal):
+        return principal
+
+    return load_principal(principal["id"])
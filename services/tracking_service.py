@@ -4,13 +4,16 @@ Tracking Service - Business logic for targets, results, reviews and action items
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_, func, select, Select
+from sqlalchemy.dialects import postgresql, sqlite
 from db.database import SessionLocal
 from db.models import (
     MonthlyTarget, MonthlyResult, MonthlyReview,
-    ActionItem, AgencyKPI, KPI
+    ActionItem, AgencyKPI, KPI, AgencyKPIStatus
 )
-from services.utils import compute_kpi_status, get_status_emoji
+from services.utils import compute_kpi_status, compute_kpi_status_array, get_status_emoji
+from services.cache import cached, invalidate
+from services.parallel import get_worker_count, split_chunks, map_ordered
 
 
 class TrackingServiceError(Exception):
@@ -18,6 +21,411 @@ class TrackingServiceError(Exception):
     pass
 
 
+# Cache scopes: per agency and period, per period across all agencies, per agency and year
+PERIOD_SCOPE = ("agency_id", "year", "month")
+ALL_AGENCIES_PERIOD_SCOPE = ("year", "month")
+YEAR_SCOPE = ("agency_id", "year")
+
+
+def invalidate_period(agency_id: int, year: int, month: int) -> None:
+    """
+    Invalidate cached reads affected by a write to an agency and period.
+
+    Args:
+        agency_id: The agency ID
+        year: Year
+        month: Month (1-12)
+    """
+    invalidate("tracking", (agency_id, year, month), (year, month), (agency_id, year))
+
+
+# ============== READ STATEMENTS ==============
+# Shared by the sync reads below and the async reads in services/async_service.py
+
+def select_monthly_targets(agency_id: int, year: int, month: int) -> Select:
+    """Statement selecting (kpi_id, target_value) of an agency and period."""
+    return select(MonthlyTarget.kpi_id, MonthlyTarget.target_value).where(
+        MonthlyTarget.agency_id == agency_id,
+        MonthlyTarget.year == year,
+        MonthlyTarget.month == month
+    )
+
+
+def select_monthly_results(agency_id: int, year: int, month: int) -> Select:
+    """Statement selecting (kpi_id, actual_value) of an agency and period."""
+    return select(MonthlyResult.kpi_id, MonthlyResult.actual_value).where(
+        MonthlyResult.agency_id == agency_id,
+        MonthlyResult.year == year,
+        MonthlyResult.month == month
+    )
+
+
+def select_monthly_review(agency_id: int, year: int, month: int) -> Select:
+    """Statement selecting the MonthlyReview of an agency and period."""
+    return select(MonthlyReview).where(
+        MonthlyReview.agency_id == agency_id,
+        MonthlyReview.year == year,
+        MonthlyReview.month == month
+    )
+
+
+def select_action_items(agency_id: int, year: int, month: int) -> Select:
+    """Statement selecting the ActionItems of an agency and period, by ID."""
+    return select(ActionItem).where(
+        ActionItem.agency_id == agency_id,
+        ActionItem.year == year,
+        ActionItem.month == month
+    ).order_by(ActionItem.id)
+
+
+def select_monthly_summary(agency_id: int, year: int, month: int) -> Select:
+    """
+    Statement selecting each active KPI of an agency with its materialized
+    status in the period: (KPI, target, actual, diff, pct, status), by KPI ID.
+    The status columns are NULL when the KPI has no target nor result.
+    """
+    return select(
+        KPI, *KPI_STATUS_COLUMNS
+    ).join(
+        AgencyKPI, AgencyKPI.kpi_id == KPI.id
+    ).outerjoin(
+        AgencyKPIStatus,
+        and_(
+            AgencyKPIStatus.agency_id == AgencyKPI.agency_id,
+            AgencyKPIStatus.year == year,
+            AgencyKPIStatus.month == month,
+            AgencyKPIStatus.kpi_id == KPI.id
+        )
+    ).where(
+        AgencyKPI.agency_id == agency_id,
+        AgencyKPI.active == True
+    ).order_by(KPI.id)
+
+
+def review_to_dict(review: MonthlyReview) -> Dict[str, Any]:
+    """Convert a MonthlyReview row to the dict returned by the services."""
+    return {
+        "id": review.id,
+        "review_date": review.review_date,
+        "what_happened": review.what_happened,
+        "improvement_plan": review.improvement_plan
+    }
+
+
+def action_item_to_dict(item: ActionItem) -> Dict[str, Any]:
+    """Convert an ActionItem row to the dict returned by the services."""
+    return {
+        "id": item.id,
+        "title": item.title,
+        "done": item.done,
+        "done_at": item.done_at
+    }
+
+
+def summary_rows_to_kpi_summary(rows) -> List[Dict[str, Any]]:
+    """Build the KPI summary from the rows of select_monthly_summary."""
+    assigned_kpis = [kpi for kpi, *_ in rows]
+    statuses = {kpi.id: tuple(status) for kpi, *status in rows if status[-1] is not None}
+    return build_kpi_summary(assigned_kpis, statuses)
+
+
+# Natural key shared by monthly_targets and monthly_results (uq_monthly_target / uq_monthly_result)
+MONTHLY_KEY_COLUMNS = ("agency_id", "year", "month", "kpi_id")
+
+
+def max_rows_per_insert(db: Session, model) -> int:
+    """
+    Get how many rows of a model fit in one multi-row INSERT.
+
+    Each row binds up to one parameter per column (column defaults included).
+    SQLite allows 999 bound parameters per statement before 3.32 and 32766
+    since; the PostgreSQL protocol allows 65535.
+
+    Args:
+        db: Open session
+        model: ORM model
+
+    Returns:
+        Maximum rows per statement
+    """
+    dialect = db.get_bind().dialect
+    if dialect.name == "sqlite":
+        version = getattr(dialect.dbapi, "sqlite_version_info", (0,))
+        max_params = 32766 if version >= (3, 32, 0) else 999
+    else:
+        max_params = 65535
+    return max(1, max_params // len(model.__table__.columns))
+
+
+def bulk_upsert_monthly_rows(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    update_columns: List[str]
+) -> None:
+    """
+    Insert or update many MonthlyTarget / MonthlyResult rows in one statement.
+    Uses INSERT ... ON CONFLICT (agency_id, year, month, kpi_id) DO UPDATE
+    on SQLite and PostgreSQL, split if the rows exceed the bound parameter
+    limit of the database (see max_rows_per_insert). Does not commit.
+
+    Args:
+        db: Open session
+        model: MonthlyTarget or MonthlyResult
+        rows: List of dicts with the key columns plus the values to store
+        update_columns: Columns overwritten when the row already exists
+    """
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        _upsert_monthly_rows_fallback(db, model, rows, update_columns)
+        return
+
+    max_rows = max_rows_per_insert(db, model)
+    for start in range(0, len(rows), max_rows):
+        stmt = insert(model).values(rows[start:start + max_rows])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(MONTHLY_KEY_COLUMNS),
+            set_={col: stmt.excluded[col] for col in update_columns}
+        )
+        db.execute(stmt)
+
+
+def _upsert_monthly_rows_fallback(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    update_columns: List[str]
+) -> None:
+    """Portable upsert for dialects without ON CONFLICT: one SELECT, then update or add."""
+    keys = [tuple(row[col] for col in MONTHLY_KEY_COLUMNS) for row in rows]
+    key_columns = [getattr(model, col) for col in MONTHLY_KEY_COLUMNS]
+    existing = {
+        tuple(getattr(obj, col) for col in MONTHLY_KEY_COLUMNS): obj
+        for obj in db.query(model).filter(tuple_(*key_columns).in_(keys)).all()
+    }
+
+    for key, row in zip(keys, rows):
+        obj = existing.get(key)
+        if obj:
+            for col in update_columns:
+                setattr(obj, col, row[col])
+        else:
+            obj = model(**row)
+            db.add(obj)
+            existing[key] = obj
+
+
+# ============== KPI STATUS (MATERIALIZED) ==============
+
+# Columns of agency_kpi_status read by the summaries, in build_kpi_summary order
+KPI_STATUS_COLUMNS = (
+    AgencyKPIStatus.target_value,
+    AgencyKPIStatus.actual_value,
+    AgencyKPIStatus.diff,
+    AgencyKPIStatus.pct,
+    AgencyKPIStatus.status
+)
+
+# Advisory lock class of the status refreshes (PostgreSQL), any int4
+KPI_STATUS_LOCK = 0x4B504953
+
+
+def _lock_kpi_status_scope(
+    db: Session,
+    agency_id: Optional[int],
+    year: Optional[int],
+    month: Optional[int]
+) -> None:
+    """
+    Serialize status refreshes of the same period until the transaction ends.
+
+    Under READ COMMITTED, a refresh that runs while another transaction has
+    an uncommitted write to the same period reads the old values, and the
+    last one to commit could keep a stale row. Refreshes of one period take
+    an exclusive lock on it (and a shared lock on the whole table), so the
+    second one reads after the first commits. Wider scopes lock the whole
+    table. SQLite already serializes writing transactions.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+
+    if agency_id is None or year is None or month is None:
+        db.execute(select(func.pg_advisory_xact_lock(KPI_STATUS_LOCK, 0)))
+        return
+
+    # Any int4 other than 0 (the table key); collisions only serialize more
+    period_key = ((agency_id * 10000 + year) * 12 + month) % 2147483647 + 1
+    db.execute(select(func.pg_advisory_xact_lock_shared(KPI_STATUS_LOCK, 0)))
+    db.execute(select(func.pg_advisory_xact_lock(KPI_STATUS_LOCK, period_key)))
+
+
+def refresh_kpi_status(
+    db: Session,
+    agency_id: Optional[int] = None,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    chunk_size: int = 500
+) -> int:
+    """
+    Recompute the agency_kpi_status rows of a scope from the targets, results
+    and active KPI assignments. Rows are upserted, and rows that no longer
+    apply (KPI unassigned, data removed) are deleted. Does not commit.
+    Omitted scope arguments mean "all" (no arguments rebuilds the whole table).
+    On PostgreSQL, concurrent refreshes of the same period wait for each
+    other until commit (see _lock_kpi_status_scope).
+
+    Args:
+        db: Open session (pending changes are flushed first)
+        agency_id: Optional agency ID
+        year: Optional year
+        month: Optional month (1-12)
+        chunk_size: Rows per bulk upsert statement
+
+    Returns:
+        Number of status rows in the scope after the refresh
+    """
+    db.flush()
+    _lock_kpi_status_scope(db, agency_id, year, month)
+
+    def in_scope(query, model):
+        if agency_id is not None:
+            query = query.filter(model.agency_id == agency_id)
+        if year is not None:
+            query = query.filter(model.year == year)
+        if month is not None:
+            query = query.filter(model.month == month)
+        return query
+
+    assigned_query = db.query(AgencyKPI.agency_id, AgencyKPI.kpi_id).filter(AgencyKPI.active == True)
+    if agency_id is not None:
+        assigned_query = assigned_query.filter(AgencyKPI.agency_id == agency_id)
+    assigned = set(assigned_query.all())
+
+    # (agency_id, year, month, kpi_id) -> [target, actual]
+    values: Dict[tuple, list] = {}
+    for model, column, position in (
+        (MonthlyTarget, MonthlyTarget.target_value, 0),
+        (MonthlyResult, MonthlyResult.actual_value, 1)
+    ):
+        query = db.query(model.agency_id, model.year, model.month, model.kpi_id, column)
+        for row_agency_id, row_year, row_month, kpi_id, value in in_scope(query, model):
+            if (row_agency_id, kpi_id) in assigned:
+                key = (row_agency_id, row_year, row_month, kpi_id)
+                values.setdefault(key, [0, 0])[position] = value
+
+    stale_ids = [
+        status_id
+        for status_id, *key in in_scope(
+            db.query(
+                AgencyKPIStatus.id, AgencyKPIStatus.agency_id, AgencyKPIStatus.year,
+                AgencyKPIStatus.month, AgencyKPIStatus.kpi_id
+            ),
+            AgencyKPIStatus
+        )
+        if tuple(key) not in values
+    ]
+    for start in range(0, len(stale_ids), chunk_size):
+        db.query(AgencyKPIStatus).filter(
+            AgencyKPIStatus.id.in_(stale_ids[start:start + chunk_size])
+        ).delete(synchronize_session=False)
+
+    targets = [target for target, _ in values.values()]
+    actuals = [actual for _, actual in values.values()]
+    diffs, pcts, statuses = compute_kpi_status_array(targets, actuals)
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "agency_id": row_agency_id,
+            "year": row_year,
+            "month": row_month,
+            "kpi_id": kpi_id,
+            "target_value": target,
+            "actual_value": actual,
+            "diff": diff,
+            "pct": pct,
+            "status": status,
+            "refreshed_at": now
+        }
+        for (row_agency_id, row_year, row_month, kpi_id), target, actual, diff, pct, status in zip(
+            values.keys(), targets, actuals, diffs.tolist(), pcts.tolist(), statuses.tolist()
+        )
+    ]
+
+    update_columns = ["target_value", "actual_value", "diff", "pct", "status", "refreshed_at"]
+    for start in range(0, len(rows), chunk_size):
+        bulk_upsert_monthly_rows(db, AgencyKPIStatus, rows[start:start + chunk_size], update_columns)
+
+    return len(rows)
+
+
+def rebuild_kpi_status(
+    agency_id: Optional[int] = None,
+    year: Optional[int] = None,
+    month: Optional[int] = None
+) -> int:
+    """
+    Rebuild the materialized KPI status of a scope (backfills, data fixes).
+
+    Args:
+        agency_id: Optional agency ID (default: all agencies)
+        year: Optional year (default: all years)
+        month: Optional month (default: all months)
+
+    Returns:
+        Number of status rows written
+    """
+    db = SessionLocal()
+    try:
+        count = refresh_kpi_status(db, agency_id=agency_id, year=year, month=month)
+        db.commit()
+        invalidate("tracking")
+        return count
+    except Exception as e:
+        db.rollback()
+        raise TrackingServiceError(f"Error al recalcular estados de KPI: {str(e)}")
+    finally:
+        db.close()
+
+
+def get_period_kpi_statuses(
+    db: Session,
+    year: int,
+    month: int,
+    agency_ids
+) -> Dict[int, Dict[int, tuple]]:
+    """
+    Read the materialized KPI status of many agencies for a period in one query.
+
+    Args:
+        db: Open session
+        year: Year
+        month: Month (1-12)
+        agency_ids: List of agency IDs or a scalar subquery selecting them
+
+    Returns:
+        Dict mapping agency_id to a dict of kpi_id -> (target, actual, diff, pct, status)
+    """
+    statuses: Dict[int, Dict[int, tuple]] = {}
+    rows = db.query(
+        AgencyKPIStatus.agency_id, AgencyKPIStatus.kpi_id, *KPI_STATUS_COLUMNS
+    ).filter(
+        AgencyKPIStatus.year == year,
+        AgencyKPIStatus.month == month,
+        AgencyKPIStatus.agency_id.in_(agency_ids)
+    )
+    for agency_id, kpi_id, *status in rows:
+        statuses.setdefault(agency_id, {})[kpi_id] = tuple(status)
+    return statuses
+
+
 # ============== MONTHLY TARGETS ==============
 
 def upsert_monthly_targets(
@@ -35,31 +443,25 @@ def upsert_monthly_targets(
         month: Month (1-12)
         targets: Dict mapping kpi_id to target_value
     """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "agency_id": agency_id,
+            "year": year,
+            "month": month,
+            "kpi_id": kpi_id,
+            "target_value": target_value,
+            "created_at": now
+        }
+        for kpi_id, target_value in targets.items()
+    ]
+
     db = SessionLocal()
     try:
-        for kpi_id, target_value in targets.items():
-            existing = db.query(MonthlyTarget).filter(
-                and_(
-                    MonthlyTarget.agency_id == agency_id,
-                    MonthlyTarget.year == year,
-                    MonthlyTarget.month == month,
-                    MonthlyTarget.kpi_id == kpi_id
-                )
-            ).first()
-
-            if existing:
-                existing.target_value = target_value
-            else:
-                new_target = MonthlyTarget(
-                    agency_id=agency_id,
-                    year=year,
-                    month=month,
-                    kpi_id=kpi_id,
-                    target_value=target_value
-                )
-                db.add(new_target)
-
+        bulk_upsert_monthly_rows(db, MonthlyTarget, rows, ["target_value"])
+        refresh_kpi_status(db, agency_id=agency_id, year=year, month=month)
         db.commit()
+        invalidate_period(agency_id, year, month)
     except Exception as e:
         db.rollback()
         raise TrackingServiceError(f"Error al guardar objetivos: {str(e)}")
@@ -67,6 +469,7 @@ def upsert_monthly_targets(
         db.close()
 
 
+@cached("tracking", scope=PERIOD_SCOPE)
 def get_monthly_targets(
     agency_id: int,
     year: int,
@@ -85,15 +488,44 @@ def get_monthly_targets(
     """
     db = SessionLocal()
     try:
-        targets = db.query(MonthlyTarget).filter(
-            and_(
-                MonthlyTarget.agency_id == agency_id,
-                MonthlyTarget.year == year,
-                MonthlyTarget.month == month
-            )
+        return dict(db.execute(select_monthly_targets(agency_id, year, month)).all())
+    finally:
+        db.close()
+
+
+@cached("tracking", scope=YEAR_SCOPE)
+def get_year_targets_matrix(
+    agency_id: int,
+    year: int
+) -> Dict[str, Any]:
+    """
+    Get all targets of an agency for a whole year.
+
+    Args:
+        agency_id: The agency ID
+        year: Year
+
+    Returns:
+        Dict with:
+        - months: Dict mapping month (1-12) to a dict of kpi_id -> target_value
+        - totals: Dict mapping kpi_id to the annual target (sum over months)
+    """
+    db = SessionLocal()
+    try:
+        months = {month: {} for month in range(1, 13)}
+        rows = db.query(
+            MonthlyTarget.month, MonthlyTarget.kpi_id, MonthlyTarget.target_value
+        ).filter(
+            MonthlyTarget.agency_id == agency_id,
+            MonthlyTarget.year == year
         ).all()
+        # Annual totals from the same rows: no second GROUP BY query
+        totals: Dict[int, float] = {}
+        for month, kpi_id, target_value in rows:
+            months.setdefault(month, {})[kpi_id] = target_value
+            totals[kpi_id] = totals.get(kpi_id, 0) + target_value
 
-        return {t.kpi_id: t.target_value for t in targets}
+        return {"months": months, "totals": totals}
     finally:
         db.close()
 
@@ -128,36 +560,30 @@ def copy_targets_to_all_months(
         if not source_targets:
             raise TrackingServiceError(f"No hay objetivos definidos para el mes {source_month}")
 
+        now = datetime.utcnow()
+        rows = []
         months_updated = 0
         for target_month in range(1, 13):
             if target_month == source_month:
                 continue
 
             for source in source_targets:
-                existing = db.query(MonthlyTarget).filter(
-                    and_(
-                        MonthlyTarget.agency_id == agency_id,
-                        MonthlyTarget.year == year,
-                        MonthlyTarget.month == target_month,
-                        MonthlyTarget.kpi_id == source.kpi_id
-                    )
-                ).first()
-
-                if existing:
-                    existing.target_value = source.target_value
-                else:
-                    new_target = MonthlyTarget(
-                        agency_id=agency_id,
-                        year=year,
-                        month=target_month,
-                        kpi_id=source.kpi_id,
-                        target_value=source.target_value
-                    )
-                    db.add(new_target)
+                rows.append({
+                    "agency_id": agency_id,
+                    "year": year,
+                    "month": target_month,
+                    "kpi_id": source.kpi_id,
+                    "target_value": source.target_value,
+                    "created_at": now
+                })
 
             months_updated += 1
 
+        bulk_upsert_monthly_rows(db, MonthlyTarget, rows, ["target_value"])
+        refresh_kpi_status(db, agency_id=agency_id, year=year)
         db.commit()
+        for target_month in range(1, 13):
+            invalidate_period(agency_id, year, target_month)
         return months_updated
 
     except TrackingServiceError:
@@ -219,34 +645,28 @@ def upsert_monthly_results(
         results: Dict mapping kpi_id to actual_value
         recorded_by: Optional name of who recorded the results
     """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "agency_id": agency_id,
+            "year": year,
+            "month": month,
+            "kpi_id": kpi_id,
+            "actual_value": actual_value,
+            "recorded_at": now,
+            "recorded_by": recorded_by
+        }
+        for kpi_id, actual_value in results.items()
+    ]
+
     db = SessionLocal()
     try:
-        for kpi_id, actual_value in results.items():
-            existing = db.query(MonthlyResult).filter(
-                and_(
-                    MonthlyResult.agency_id == agency_id,
-                    MonthlyResult.year == year,
-                    MonthlyResult.month == month,
-                    MonthlyResult.kpi_id == kpi_id
-                )
-            ).first()
-
-            if existing:
-                existing.actual_value = actual_value
-                existing.recorded_at = datetime.utcnow()
-                existing.recorded_by = recorded_by
-            else:
-                new_result = MonthlyResult(
-                    agency_id=agency_id,
-                    year=year,
-                    month=month,
-                    kpi_id=kpi_id,
-                    actual_value=actual_value,
-                    recorded_by=recorded_by
-                )
-                db.add(new_result)
-
+        bulk_upsert_monthly_rows(
+            db, MonthlyResult, rows, ["actual_value", "recorded_at", "recorded_by"]
+        )
+        refresh_kpi_status(db, agency_id=agency_id, year=year, month=month)
         db.commit()
+        invalidate_period(agency_id, year, month)
     except Exception as e:
         db.rollback()
         raise TrackingServiceError(f"Error al guardar resultados: {str(e)}")
@@ -254,6 +674,7 @@ def upsert_monthly_results(
         db.close()
 
 
+@cached("tracking", scope=PERIOD_SCOPE)
 def get_monthly_results(
     agency_id: int,
     year: int,
@@ -272,15 +693,7 @@ def get_monthly_results(
     """
     db = SessionLocal()
     try:
-        results = db.query(MonthlyResult).filter(
-            and_(
-                MonthlyResult.agency_id == agency_id,
-                MonthlyResult.year == year,
-                MonthlyResult.month == month
-            )
-        ).all()
-
-        return {r.kpi_id: r.actual_value for r in results}
+        return dict(db.execute(select_monthly_results(agency_id, year, month)).all())
     finally:
         db.close()
 
@@ -335,6 +748,7 @@ def upsert_monthly_review(
             db.add(new_review)
 
         db.commit()
+        invalidate_period(agency_id, year, month)
     except Exception as e:
         db.rollback()
         raise TrackingServiceError(f"Error al guardar revisión: {str(e)}")
@@ -342,6 +756,7 @@ def upsert_monthly_review(
         db.close()
 
 
+@cached("tracking", scope=PERIOD_SCOPE)
 def get_monthly_review(
     agency_id: int,
     year: int,
@@ -360,22 +775,8 @@ def get_monthly_review(
     """
     db = SessionLocal()
     try:
-        review = db.query(MonthlyReview).filter(
-            and_(
-                MonthlyReview.agency_id == agency_id,
-                MonthlyReview.year == year,
-                MonthlyReview.month == month
-            )
-        ).first()
-
-        if review:
-            return {
-                "id": review.id,
-                "review_date": review.review_date,
-                "what_happened": review.what_happened,
-                "improvement_plan": review.improvement_plan
-            }
-        return None
+        review = db.execute(select_monthly_review(agency_id, year, month)).scalars().first()
+        return review_to_dict(review) if review else None
     finally:
         db.close()
 
@@ -412,6 +813,7 @@ def add_action_item(
         db.add(item)
         db.commit()
         db.refresh(item)
+        invalidate_period(agency_id, year, month)
         return item
     except Exception as e:
         db.rollback()
@@ -432,9 +834,11 @@ def toggle_action_item_done(item_id: int, done: bool) -> None:
     try:
         item = db.query(ActionItem).filter(ActionItem.id == item_id).first()
         if item:
+            period = (item.agency_id, item.year, item.month)
             item.done = done
             item.done_at = datetime.utcnow() if done else None
             db.commit()
+            invalidate_period(*period)
     except Exception as e:
         db.rollback()
         raise TrackingServiceError(f"Error al actualizar acción: {str(e)}")
@@ -453,8 +857,10 @@ def delete_action_item(item_id: int) -> None:
     try:
         item = db.query(ActionItem).filter(ActionItem.id == item_id).first()
         if item:
+            period = (item.agency_id, item.year, item.month)
             db.delete(item)
             db.commit()
+            invalidate_period(*period)
     except Exception as e:
         db.rollback()
         raise TrackingServiceError(f"Error al eliminar acción: {str(e)}")
@@ -462,6 +868,7 @@ def delete_action_item(item_id: int) -> None:
         db.close()
 
 
+@cached("tracking", scope=PERIOD_SCOPE)
 def get_action_items(
     agency_id: int,
     year: int,
@@ -480,87 +887,201 @@ def get_action_items(
     """
     db = SessionLocal()
     try:
-        items = db.query(ActionItem).filter(
-            and_(
-                ActionItem.agency_id == agency_id,
-                ActionItem.year == year,
-                ActionItem.month == month
-            )
-        ).order_by(ActionItem.id).all()
-
-        return [
-            {
-                "id": item.id,
-                "title": item.title,
-                "done": item.done,
-                "done_at": item.done_at
-            }
-            for item in items
-        ]
+        items = db.execute(select_action_items(agency_id, year, month)).scalars()
+        return [action_item_to_dict(item) for item in items]
     finally:
         db.close()
 
 
 # ============== SUMMARY / DASHBOARD ==============
 
+@cached("tracking", scope=PERIOD_SCOPE, depends_on=("agencies", "kpis"))
 def get_monthly_summary(
     agency_id: int,
     year: int,
-    month: int
+    month: int,
+    db: Optional[Session] = None
 ) -> List[Dict[str, Any]]:
     """
     Get a summary of targets vs results for all KPIs of an agency.
+    Assigned KPIs and their materialized status (agency_kpi_status) are
+    fetched in a single outer-joined query.
 
     Args:
         agency_id: The agency ID
         year: Year
         month: Month (1-12)
+        db: Optional open session to reuse (it is not closed here)
 
     Returns:
         List of dicts with KPI performance data
     """
-    db = SessionLocal()
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
     try:
-        # Get assigned KPIs
-        assigned_kpis = db.query(KPI).join(AgencyKPI).filter(
-            AgencyKPI.agency_id == agency_id,
-            AgencyKPI.active == True
-        ).all()
+        rows = db.execute(select_monthly_summary(agency_id, year, month)).all()
+        return summary_rows_to_kpi_summary(rows)
+    finally:
+        if owns_session:
+            db.close()
 
-        targets = get_monthly_targets(agency_id, year, month)
-        results = get_monthly_results(agency_id, year, month)
 
-        summary = []
-        for kpi in assigned_kpis:
-            target = targets.get(kpi.id, 0)
-            actual = results.get(kpi.id, 0)
+def build_kpi_summary(
+    kpis: List[KPI],
+    statuses: Dict[int, tuple]
+) -> List[Dict[str, Any]]:
+    """
+    Build the targets vs results summary rows from already loaded data.
+    Shared by get_monthly_summary and the set-based dashboard builders.
+
+    Args:
+        kpis: KPIs assigned to the agency
+        statuses: Dict mapping kpi_id to (target, actual, diff, pct, status)
+            from agency_kpi_status; KPIs without a row have no target nor result
+
+    Returns:
+        List of dicts with KPI performance data
+    """
+    summary = []
+    for kpi in kpis:
+        if kpi.id in statuses:
+            target, actual, diff, pct, status = statuses[kpi.id]
+        else:
+            target = actual = 0
             diff, pct, status = compute_kpi_status(target, actual)
 
-            summary.append({
-                "kpi_id": kpi.id,
-                "kpi_code": kpi.code,
-                "kpi_label": kpi.label,
-                "kpi_unit": kpi.unit,
-                "target": target,
-                "actual": actual,
-                "diff": diff,
-                "pct": pct,
-                "status": status,
-                "status_emoji": get_status_emoji(status)
-            })
-
-        return summary
+        summary.append({
+            "kpi_id": kpi.id,
+            "kpi_code": kpi.code,
+            "kpi_label": kpi.label,
+            "kpi_unit": kpi.unit,
+            "target": target,
+            "actual": actual,
+            "diff": diff,
+            "pct": pct,
+            "status": status,
+            "status_emoji": get_status_emoji(status)
+        })
+
+    return summary
+
+
+def get_assigned_kpis_by_agency(db: Session, agency_ids) -> Dict[int, List[KPI]]:
+    """
+    Get the active KPIs assigned to many agencies in one query.
+
+    Args:
+        db: Open session
+        agency_ids: List of agency IDs or a scalar subquery selecting them
+
+    Returns:
+        Dict mapping agency_id to its KPIs ordered by KPI ID
+    """
+    kpis_by_agency: Dict[int, List[KPI]] = {}
+    assigned = db.query(AgencyKPI.agency_id, KPI).join(
+        KPI, AgencyKPI.kpi_id == KPI.id
+    ).filter(
+        AgencyKPI.agency_id.in_(agency_ids),
+        AgencyKPI.active == True
+    ).order_by(AgencyKPI.agency_id, KPI.id).all()
+    for agency_id, kpi in assigned:
+        kpis_by_agency.setdefault(agency_id, []).append(kpi)
+    return kpis_by_agency
+
+
+def build_agency_summary(
+    agency: Dict[str, Any],
+    summary: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Build the ranking row of an agency from its KPI summary.
+    Shared by get_all_agencies_summary and the multi-month aggregations.
+
+    Args:
+        agency: Agency dict (see list_agencies)
+        summary: KPI summary rows (see build_kpi_summary)
+
+    Returns:
+        Dict with average performance and status counts
+    """
+    # Calculate average performance
+    if summary:
+        avg_pct = sum(s["pct"] for s in summary) / len(summary)
+        red_count = sum(1 for s in summary if s["status"] == "red")
+        yellow_count = sum(1 for s in summary if s["status"] == "yellow")
+        green_count = sum(1 for s in summary if s["status"] == "green")
+    else:
+        avg_pct = 0
+        red_count = yellow_count = green_count = 0
+
+    return {
+        "agency_id": agency["id"],
+        "agency_name": agency["name"],
+        "city": agency["city"],
+        "manager_name": agency["manager"]["name"] if agency["manager"] else None,
+        "avg_pct": avg_pct,
+        "red_count": red_count,
+        "yellow_count": yellow_count,
+        "green_count": green_count,
+        "kpi_details": summary
+    }
+
+
+def _build_agencies_summary(
+    agencies: List[Dict[str, Any]],
+    year: int,
+    month: int
+) -> List[Dict[str, Any]]:
+    """
+    Build the summaries of a set of agencies in one session.
+
+    Args:
+        agencies: Agency dicts (see list_agencies)
+        year: Year
+        month: Month (1-12)
+
+    Returns:
+        List of agency summaries, in the order of agencies
+    """
+    agency_ids = [agency["id"] for agency in agencies]
+
+    db = SessionLocal()
+    try:
+        kpis_by_agency = get_assigned_kpis_by_agency(db, agency_ids)
+        statuses_by_agency = get_period_kpi_statuses(db, year, month, agency_ids)
     finally:
         db.close()
 
+    return [
+        build_agency_summary(
+            agency,
+            build_kpi_summary(
+                kpis_by_agency.get(agency["id"], []),
+                statuses_by_agency.get(agency["id"], {})
+            )
+        )
+        for agency in agencies
+    ]
+
 
-def get_all_agencies_summary(year: int, month: int) -> List[Dict[str, Any]]:
+@cached("tracking", scope=ALL_AGENCIES_PERIOD_SCOPE, depends_on=("agencies", "kpis"))
+def get_all_agencies_summary(
+    year: int,
+    month: int,
+    workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
     """
     Get summary of all agencies for a specific month.
+    Reads the materialized KPI status of all agencies in one query.
+
+    With more than one worker, the agencies are split into chunks built
+    concurrently, each with its own session (see services/parallel.py).
 
     Args:
         year: Year
         month: Month (1-12)
+        workers: Threads to use (defaults to DASHBOARD_WORKERS; 0 or 1 = sequential)
 
     Returns:
         List of agency summaries with average performance
@@ -568,32 +1089,16 @@ def get_all_agencies_summary(year: int, month: int) -> List[Dict[str, Any]]:
     from services.agency_service import list_agencies
 
     agencies = list_agencies(active_only=True)
-    result = []
-
-    for agency in agencies:
-        summary = get_monthly_summary(agency["id"], year, month)
-
-        # Calculate average performance
-        if summary:
-            avg_pct = sum(s["pct"] for s in summary) / len(summary)
-            red_count = sum(1 for s in summary if s["status"] == "red")
-            yellow_count = sum(1 for s in summary if s["status"] == "yellow")
-            green_count = sum(1 for s in summary if s["status"] == "green")
-        else:
-            avg_pct = 0
-            red_count = yellow_count = green_count = 0
-
-        result.append({
-            "agency_id": agency["id"],
-            "agency_name": agency["name"],
-            "city": agency["city"],
-            "manager_name": agency["manager"]["name"] if agency["manager"] else None,
-            "avg_pct": avg_pct,
-            "red_count": red_count,
-            "yellow_count": yellow_count,
-            "green_count": green_count,
-            "kpi_details": summary
-        })
+    if not agencies:
+        return []
+
+    workers = get_worker_count(workers, len(agencies))
+    chunks = map_ordered(
+        lambda chunk: _build_agencies_summary(chunk, year, month),
+        split_chunks(agencies, workers),
+        workers
+    )
+    result = [summary for chunk in chunks for summary in chunk]
 
     # Sort by average performance (descending)
     result.sort(key=lambda x: x["avg_pct"], reverse=True)
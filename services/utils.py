@@ -1,8 +1,9 @@
 """
 Utility functions for the Agency Performance Tracker.
 """
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Sequence
 from datetime import date
+import numpy as np
 
 # Status thresholds (configurable)
 THRESHOLD_GREEN = 100  # >= 100% is green
@@ -70,6 +71,57 @@ def compute_kpi_status(target: float, actual: float) -> Tuple[float, float, str]
     return diff, pct, status
 
 
+def compute_kpi_status_array(
+    targets: Sequence[float],
+    actuals: Sequence[float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized compute_kpi_status: same semantics, element by element,
+    over arrays of targets and actuals (including the target <= 0 case).
+
+    Args:
+        targets: Target values (list, tuple, NumPy array or pandas Series)
+        actuals: Actual values, same length as targets
+
+    Returns:
+        Tuple of arrays (difference, percentage, status)
+        - status holds "green", "yellow" or "red"
+    """
+    targets = np.asarray(targets, dtype=float)
+    actuals = np.asarray(actuals, dtype=float)
+
+    diff = actuals - targets
+
+    # If no target, consider 100% if actual > 0 (see compute_kpi_status)
+    pct = np.where(actuals == 0, 0.0, 100.0)
+    has_target = targets > 0
+    pct[has_target] = (actuals[has_target] / targets[has_target]) * 100
+
+    status = np.select(
+        [pct >= THRESHOLD_GREEN, pct >= THRESHOLD_YELLOW],
+        ["green", "yellow"],
+        default="red"
+    )
+
+    return diff, pct, status
+
+
+def add_kpi_status_columns(df, target_column: str = "target", actual_column: str = "actual"):
+    """
+    Add diff, pct and status columns to a pandas DataFrame of targets and actuals.
+
+    Args:
+        df: DataFrame with one row per agency/KPI/month cell
+        target_column: Name of the target column
+        actual_column: Name of the actual column
+
+    Returns:
+        New DataFrame with the diff, pct and status columns added
+    """
+    diff, pct, status = compute_kpi_status_array(df[target_column], df[actual_column])
+    return df.assign(diff=diff, pct=pct, status=status)
+
+
 def get_status_emoji(status: str) -> str:
     """
     Get emoji for status indicator.
@@ -123,6 +175,29 @@ def format_number(value: float, decimals: int = 0) -> str:
         return f"{value:,.{decimals}f}".replace(",", " ")
 
 
+# Escape character of the patterns built by contains_pattern (pass as escape=)
+LIKE_ESCAPE = "\\"
+
+
+def contains_pattern(text: str) -> str:
+    """
+    Build a LIKE pattern that matches text as a literal substring.
+    % and _ typed by the user are escaped instead of acting as wildcards.
+
+    Args:
+        text: Substring to search for
+
+    Returns:
+        Pattern for column.ilike(pattern, escape=LIKE_ESCAPE)
+    """
+    escaped = (
+        text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+    return f"%{escaped}%"
+
+
 def validate_month(month: int) -> bool:
     """
     Validate that month is in valid range (1-12).
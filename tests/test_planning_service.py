@@ -0,0 +1,79 @@
+"""
+Tests for the yearly plan validation (services/planning_service.py).
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import Base
+from db.models import Agency, KPI, AgencyKPI
+from services.planning_service import validate_plan
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory database with one agency and one assigned KPI."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    agency = Agency(name="Agencia Centro", city="Lima")
+    kpi = KPI(code="CS", label="Capital Services", unit="trx")
+    session.add_all([agency, kpi])
+    session.flush()
+    session.add(AgencyKPI(agency_id=agency.id, kpi_id=kpi.id, active=True))
+    session.commit()
+
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def plan_row(**values):
+    """One plan row with valid defaults."""
+    row = {"agency": "Agencia Centro", "year": 2026, "month": 3, "kpi": "CS", "target_value": 1200}
+    row.update(values)
+    return row
+
+
+def test_accepts_whole_number_floats(db):
+    """Year and month read from Parquet/NumPy arrive as floats."""
+    valid_rows, errors = validate_plan(db, [plan_row(year=2026.0, month=3.0)])
+
+    assert errors == []
+    assert (valid_rows[0]["year"], valid_rows[0]["month"]) == (2026, 3)
+
+
+def test_rejects_fractional_month(db):
+    """A fractional month is an error, not truncated to another period."""
+    valid_rows, errors = validate_plan(db, [plan_row(month=3.7)])
+
+    assert valid_rows == []
+    assert len(errors) == 1
+    assert "Línea 2" in errors[0] and "enteros" in errors[0]
+
+
+def test_rejects_fractional_year(db):
+    valid_rows, errors = validate_plan(db, [plan_row(year=2026.5)])
+
+    assert valid_rows == []
+    assert len(errors) == 1
+
+
+def test_rejects_non_numeric_month(db):
+    valid_rows, errors = validate_plan(db, [plan_row(month="marzo")])
+
+    assert valid_rows == []
+    assert "no numérico" in errors[0]
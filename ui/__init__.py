@@ -11,7 +11,8 @@ from ui import (
     monthly_review,
     first_login_security,
     forgot_password,
-    user_management
+    user_management,
+    performance
 )
 
 __all__ = [
@@ -26,5 +27,6 @@ __all__ = [
     "monthly_review",
     "first_login_security",
     "forgot_password",
-    "user_management"
+    "user_management",
+    "performance"
 ]
@@ -5,7 +5,7 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, Any
 from services.agency_service import list_agencies, get_agency_detail
-from services.access_service import get_user_agency_ids, user_can_access_agency
+from services.access_service import user_can_access_agency
 from ui.sidebar import set_page
 
 
@@ -15,15 +15,21 @@ def render(current_user: Dict[str, Any]):
 
     # Filters
     col1, col2 = st.columns([3, 1])
+    with col1:
+        search = st.text_input(
+            "Buscar agencia",
+            placeholder="Nombre de la agencia",
+            label_visibility="collapsed"
+        )
     with col2:
         show_inactive = st.checkbox("Mostrar inactivas", value=False)
 
     # Get agencies
-    agencies = list_agencies(active_only=not show_inactive)
+    agencies = list_agencies(active_only=not show_inactive, name=search.strip() or None)
 
     # Filter by user access (NORMAL users only see assigned agencies)
     if current_user.get("role") != "ADMIN":
-        allowed_ids = set(get_user_agency_ids(current_user["id"]))
+        allowed_ids = set(current_user["agency_ids"])
         agencies = [a for a in agencies if a["id"] in allowed_ids]
 
     if not agencies:
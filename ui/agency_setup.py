@@ -74,10 +74,10 @@ def render(current_user: Dict[str, Any]):
         cols = st.columns(2)
         for i, kpi in enumerate(kpis):
             with cols[i % 2]:
-                kpi_selections[kpi.id] = st.checkbox(
-                    f"{kpi.code} - {kpi.label}",
+                kpi_selections[kpi["id"]] = st.checkbox(
+                    f"{kpi['code']} - {kpi['label']}",
                     value=True,  # Default all selected
-                    key=f"kpi_{kpi.id}"
+                    key=f"kpi_{kpi['id']}"
                 )
 
         st.markdown("---")
@@ -6,7 +6,6 @@ import pandas as pd
 from typing import Dict, Any
 from services.tracking_service import get_all_agencies_summary, get_monthly_summary
 from services.agency_service import list_agencies
-from services.access_service import get_user_agency_ids
 from services.utils import month_name, format_number, get_status_emoji, get_status_color
 
 
@@ -42,7 +41,7 @@ def render(current_user: Dict[str, Any]):
 
     # Filter by user access (NORMAL users only see assigned agencies)
     if current_user.get("role") != "ADMIN":
-        allowed_ids = set(get_user_agency_ids(current_user["id"]))
+        allowed_ids = set(current_user["agency_ids"])
         agencies_summary = [a for a in agencies_summary if a["agency_id"] in allowed_ids]
 
     if not agencies_summary:
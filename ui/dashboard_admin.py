@@ -9,7 +9,22 @@ from services.dashboard_service import (
     get_admin_dashboard_data,
     get_period_status_message
 )
+from services.aggregation_service import (
+    compare_windows, previous_window, ytd_window, trailing_window, quarter_window,
+    TRAILING_WINDOWS
+)
+from services.ranking_service import get_top_agencies, get_bottom_agencies
+from services.agency_service import list_agencies
 from services.utils import month_name
+from services.profiling import profiled
+
+
+# Cumulative views: windows ending in the selected month
+CUMULATIVE_VIEWS = {
+    "ytd": "Acumulado del año",
+    **{f"trailing_{n}": f"Últimos {n} meses" for n in TRAILING_WINDOWS},
+    "quarter": "Trimestre",
+}
 
 
 def render(current_user: Dict[str, Any]):
@@ -48,9 +63,12 @@ def render(current_user: Dict[str, Any]):
     render_global_summary(data)
     render_alerts_section(data)
     render_agencies_table(data)
+    render_ranking_section(year, month)
+    render_cumulative_section(year, month)
     render_pending_reviews(data)
 
 
+@profiled()
 def render_global_summary(data: Dict[str, Any]):
     """Render global KPI summary across all agencies."""
     st.markdown(f"### 🌍 Resumen Global - {data['month_name']} {data['year']}")
@@ -80,6 +98,7 @@ def render_global_summary(data: Dict[str, Any]):
     st.markdown("---")
 
 
+@profiled()
 def render_alerts_section(data: Dict[str, Any]):
     """Render alerts for agencies at risk."""
     at_risk = data["at_risk"]
@@ -125,6 +144,7 @@ def render_alerts_section(data: Dict[str, Any]):
     st.markdown("---")
 
 
+@profiled()
 def render_agencies_table(data: Dict[str, Any]):
     """Render table with all agencies and their status."""
     st.markdown("### 🏢 Estado por Agencia")
@@ -208,6 +228,118 @@ def render_agencies_table(data: Dict[str, Any]):
     st.markdown("---")
 
 
+@profiled()
+def render_ranking_section(year: int, month: int):
+    """Render top and bottom agencies of the period, with city/manager filters."""
+    st.markdown("### 🏆 Ranking")
+
+    cities = sorted({a["city"] for a in list_agencies(active_only=True) if a["city"]})
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        city = st.selectbox("Ciudad", ["Todas"] + cities, key="ranking_city")
+    with col2:
+        manager = st.text_input("Jefe", placeholder="Buscar por nombre...", key="ranking_manager")
+    with col3:
+        n = st.number_input("Mostrar", min_value=1, max_value=50, value=5, key="ranking_n")
+
+    filters = {
+        "city": None if city == "Todas" else city,
+        "manager": manager.strip() or None
+    }
+    top = get_top_agencies(year, month, int(n), **filters)
+    bottom = get_bottom_agencies(year, month, int(n), **filters)
+
+    if not top:
+        st.info("No hay agencias que coincidan con el filtro seleccionado.")
+        return
+
+    import pandas as pd
+
+    def to_table(rows):
+        return pd.DataFrame([
+            {
+                "Pos": row["position"],
+                "Agencia": row["agency_name"],
+                "Jefe": row["manager_name"] or "Sin jefe",
+                "Promedio": f"{row['avg_pct']:.1f}%",
+                "🟢": row["green_count"],
+                "🟡": row["yellow_count"],
+                "🔴": row["red_count"]
+            }
+            for row in rows
+        ])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Mejores**")
+        st.dataframe(to_table(top), use_container_width=True, hide_index=True)
+    with col2:
+        st.markdown("**Peores**")
+        st.dataframe(to_table(bottom), use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+
+
+def get_cumulative_windows(view: str, year: int, month: int):
+    """Return (window, previous window) of a cumulative view ending in year/month."""
+    if view == "ytd":
+        window = ytd_window(year, month)
+        return window, previous_window(window, same_period_last_year=True)
+    if view == "quarter":
+        quarter = (month - 1) // 3 + 1
+        previous = quarter_window(year, quarter - 1) if quarter > 1 else quarter_window(year - 1, 4)
+        return quarter_window(year, quarter), previous
+    window = trailing_window(year, month, int(view.split("_")[1]))
+    return window, previous_window(window)
+
+
+@profiled()
+def render_cumulative_section(year: int, month: int):
+    """Render cumulative attainment (YTD, trailing months, quarter) with comparison."""
+    st.markdown("### 📈 Acumulados")
+
+    view = st.radio(
+        "Periodo:",
+        options=list(CUMULATIVE_VIEWS.keys()),
+        format_func=lambda v: CUMULATIVE_VIEWS[v],
+        horizontal=True,
+        key="admin_cumulative_view"
+    )
+
+    window, previous = get_cumulative_windows(view, year, month)
+    agencies = compare_windows(window, previous)
+    st.caption(f"{window['label']} comparado con {previous['label']}. Objetivos y resultados sumados en el periodo.")
+
+    agencies = [a for a in agencies if a["kpi_details"]]
+    if not agencies:
+        st.info("No hay datos para este periodo.")
+        return
+
+    import pandas as pd
+
+    table_data = []
+    for pos, agency in enumerate(agencies, 1):
+        delta = agency["delta_pct"]
+        table_data.append({
+            "Pos": pos,
+            "Agencia": agency["agency_name"],
+            "Ciudad": agency["city"] or "-",
+            "Promedio": f"{agency['avg_pct']:.1f}%",
+            "Anterior": f"{agency['previous_avg_pct']:.1f}%" if delta is not None else "-",
+            "Δ": f"{delta:+.1f} pts" if delta is not None else "-",
+            "🟢": agency["green_count"],
+            "🟡": agency["yellow_count"],
+            "🔴": agency["red_count"]
+        })
+
+    df = pd.DataFrame(table_data)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+
+
+@profiled()
 def render_pending_reviews(data: Dict[str, Any]):
     """Render section with agencies pending review."""
     pending = data["pending_reviews"]
@@ -236,6 +368,7 @@ def render_pending_reviews(data: Dict[str, Any]):
                 st.info(f"📧 Funcionalidad de notificación próximamente...")
 
 
+@profiled()
 def render_comparison_chart(data: Dict[str, Any]):
     """Render comparison chart for agencies (optional feature)."""
     try:
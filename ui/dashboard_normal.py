@@ -9,19 +9,19 @@ import streamlit as st
 from datetime import date
 from typing import Dict, Any, Optional
 from services.dashboard_service import (
-    get_agency_dashboard_data,
     get_kpi_card_data,
     get_period_status_message
 )
 from services.onboarding_service import (
-    is_onboarding_completed,
     complete_onboarding,
     get_onboarding_checklist,
     is_checklist_complete,
     get_user_primary_agency
 )
 from services.access_service import get_user_agencies
+from services.async_service import load_agency_dashboard
 from services.utils import month_name
+from services.profiling import profiled
 
 
 def render(current_user: Dict[str, Any]):
@@ -77,12 +77,12 @@ def render(current_user: Dict[str, Any]):
             )
 
     # Check if onboarding is needed
-    if not is_onboarding_completed(user_id):
+    if not current_user["onboarding_completed"]:
         render_onboarding(current_user, selected_agency_id, year, month)
         return
 
     # Get dashboard data
-    data = get_agency_dashboard_data(selected_agency_id, year, month)
+    data = load_agency_dashboard(selected_agency_id, year, month)
 
     if not data:
         st.warning("⚠️ No se pudo cargar la información del dashboard.")
@@ -104,6 +104,7 @@ def render_no_agencies_message():
     )
 
 
+@profiled()
 def render_onboarding(current_user: Dict[str, Any], agency_id: int, year: int, month: int):
     """Render onboarding flow for first-time users."""
     user_id = current_user["id"]
@@ -164,6 +165,7 @@ def render_onboarding(current_user: Dict[str, Any], agency_id: int, year: int, m
         st.info("💡 Completa los pasos anteriores para habilitar tu dashboard")
 
 
+@profiled()
 def render_status_header(data: Dict[str, Any]):
     """Render the main status header - answers '¿Voy bien o mal?'"""
     agency = data["agency"]
@@ -226,6 +228,7 @@ def render_status_header(data: Dict[str, Any]):
     st.markdown("---")
 
 
+@profiled()
 def render_kpi_cards(data: Dict[str, Any]):
     """Render KPI cards - answers '¿En qué KPI estoy fallando?'"""
     st.markdown("### 📊 Estado de KPIs")
@@ -287,6 +290,7 @@ def render_single_kpi_card(card: Dict[str, Any]):
     """, unsafe_allow_html=True)
 
 
+@profiled()
 def render_actions_summary(data: Dict[str, Any]):
     """Render actions summary - answers '¿Qué tengo que hacer?'"""
     st.markdown("### ✅ Acciones del mes")
@@ -326,6 +330,7 @@ def render_actions_summary(data: Dict[str, Any]):
     st.markdown("---")
 
 
+@profiled()
 def render_review_summary(data: Dict[str, Any]):
     """Render review summary with improvement plan."""
     review = data.get("review")
@@ -3,6 +3,7 @@ Login UI - User authentication screen.
 """
 import streamlit as st
 from services.auth_service import authenticate_user, AuthServiceError
+from services.session_service import load_principal, revalidate_principal
 
 
 def render():
@@ -53,7 +54,7 @@ def render():
                     try:
                         user = authenticate_user(username, password)
                         if user:
-                            st.session_state.user = user
+                            st.session_state.user = load_principal(user["id"])
                             st.session_state.authenticated = True
                             st.rerun()
                         else:
@@ -78,8 +79,19 @@ def is_authenticated() -> bool:
 
 
 def get_current_user():
-    """Get the current authenticated user."""
-    return st.session_state.get("user")
+    """
+    Get the current authenticated user (session principal, see
+    services/session_service.py), rebuilt if the user's data changed.
+
+    Returns:
+        Principal dict, or None if the user was deactivated or removed
+    """
+    user = revalidate_principal(st.session_state.get("user"))
+    if user is None:
+        logout()
+    else:
+        st.session_state.user = user
+    return user
 
 
 def logout():
@@ -5,21 +5,18 @@ import streamlit as st
 from datetime import date
 from typing import Dict, Any
 from services.agency_service import list_agencies, get_agency_kpis
-from services.access_service import get_user_agency_ids
 from services.tracking_service import (
-    get_monthly_targets,
-    get_monthly_results,
     upsert_monthly_results,
-    get_monthly_review,
     upsert_monthly_review,
     get_action_items,
     add_action_item,
     toggle_action_item_done,
     delete_action_item,
-    get_monthly_summary,
     TrackingServiceError
 )
+from services.async_service import load_monthly_review
 from services.utils import month_name, format_number, get_status_emoji
+from services.profiling import profiled
 
 
 def render(current_user: Dict[str, Any]):
@@ -45,7 +42,7 @@ def render(current_user: Dict[str, Any]):
 
     # Filter by user access (NORMAL users only see assigned agencies)
     if current_user.get("role") != "ADMIN":
-        allowed_ids = set(get_user_agency_ids(current_user["id"]))
+        allowed_ids = set(current_user["agency_ids"])
         agencies = [a for a in agencies if a["id"] in allowed_ids]
 
     if not agencies:
@@ -95,6 +92,9 @@ def render(current_user: Dict[str, Any]):
         st.warning("⚠️ Esta agencia no tiene KPIs asignados.")
         return
 
+    # Load all sections' data at once (reads run concurrently)
+    data = load_monthly_review(selected_agency_id, year, month)
+
     # Create tabs for different sections
     tab1, tab2, tab3, tab4 = st.tabs([
         "📊 Resultados",
@@ -105,28 +105,29 @@ def render(current_user: Dict[str, Any]):
 
     # TAB 1: Results
     with tab1:
-        render_results_section(selected_agency_id, year, month, agency_kpis)
+        render_results_section(selected_agency_id, year, month, agency_kpis, data)
 
     # TAB 2: Notes
     with tab2:
-        render_notes_section(selected_agency_id, year, month)
+        render_notes_section(selected_agency_id, year, month, data)
 
     # TAB 3: Action Items
     with tab3:
-        render_actions_section(selected_agency_id, year, month)
+        render_actions_section(selected_agency_id, year, month, data)
 
     # TAB 4: Summary
     with tab4:
-        render_summary_section(selected_agency_id, year, month)
+        render_summary_section(selected_agency_id, year, month, data)
 
 
-def render_results_section(agency_id: int, year: int, month: int, kpis: list):
+@profiled()
+def render_results_section(agency_id: int, year: int, month: int, kpis: list, data: Dict[str, Any]):
     """Render the results input section."""
     st.subheader(f"Resultados de {month_name(month)} {year}")
 
     # Get existing data
-    targets = get_monthly_targets(agency_id, year, month)
-    results = get_monthly_results(agency_id, year, month)
+    targets = data["targets"]
+    results = data["results"]
 
     if not targets:
         st.warning("⚠️ No hay objetivos definidos para este mes. Defina los objetivos primero.")
@@ -177,12 +178,13 @@ def render_results_section(agency_id: int, year: int, month: int, kpis: list):
                 st.error(f"❌ Error: {str(e)}")
 
 
-def render_notes_section(agency_id: int, year: int, month: int):
+@profiled()
+def render_notes_section(agency_id: int, year: int, month: int, data: Dict[str, Any]):
     """Render the notes section."""
     st.subheader(f"Notas de {month_name(month)} {year}")
 
     # Get existing review
-    review = get_monthly_review(agency_id, year, month)
+    review = data["review"]
 
     with st.form("notes_form"):
         review_date = st.date_input(
@@ -223,7 +225,8 @@ def render_notes_section(agency_id: int, year: int, month: int):
                 st.error(f"❌ Error: {str(e)}")
 
 
-def render_actions_section(agency_id: int, year: int, month: int):
+@profiled()
+def render_actions_section(agency_id: int, year: int, month: int, data: Dict[str, Any]):
     """Render the action items section."""
     st.subheader(f"Acciones de {month_name(month)} {year}")
 
@@ -241,7 +244,7 @@ def render_actions_section(agency_id: int, year: int, month: int):
     st.markdown("---")
 
     # Current month's actions
-    current_actions = get_action_items(agency_id, year, month)
+    current_actions = data["actions"]
 
     st.markdown("**Acciones para este mes:**")
 
@@ -296,11 +299,12 @@ def render_actions_section(agency_id: int, year: int, month: int):
                 st.warning("Ingrese un texto para la acción")
 
 
-def render_summary_section(agency_id: int, year: int, month: int):
+@profiled()
+def render_summary_section(agency_id: int, year: int, month: int, data: Dict[str, Any]):
     """Render the summary section with KPI status."""
     st.subheader(f"Resumen de {month_name(month)} {year}")
 
-    summary = get_monthly_summary(agency_id, year, month)
+    summary = data["summary"]
 
     if not summary:
         st.info("No hay datos para mostrar. Registre objetivos y resultados primero.")
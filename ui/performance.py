@@ -0,0 +1,101 @@
+"""
+Performance UI - Render timings of pages and sections (ADMIN only).
+"""
+import streamlit as st
+import pandas as pd
+from typing import Dict, Any
+from services.profiling import (
+    get_profile_stats, reset_profile_stats, list_profile_dumps,
+    PROFILE_ENABLED, PROFILE_SLOW_MS, PROFILE_DUMP_DIR
+)
+
+
+def render(current_user: Dict[str, Any]):
+    """
+    Render the performance statistics page.
+    Only accessible by ADMIN users.
+
+    Args:
+        current_user: Current authenticated user dict
+    """
+    if current_user.get("role") != "ADMIN":
+        st.error("⛔ Acceso denegado. Esta página es solo para administradores.")
+        return
+
+    st.title("⏱️ Rendimiento")
+    st.markdown("Tiempos de renderizado por página y sección, desde el último reinicio del servidor.")
+
+    if not PROFILE_ENABLED:
+        st.info("La medición está desactivada (PROFILE_ENABLED=false).")
+        return
+
+    stats = get_profile_stats()
+
+    col1, col2 = st.columns([4, 1])
+    with col2:
+        if st.button("🔄 Reiniciar estadísticas", use_container_width=True):
+            reset_profile_stats()
+            st.rerun()
+
+    if not stats:
+        st.info("Todavía no hay mediciones. Navegue por la aplicación y vuelva a esta página.")
+    else:
+        render_stats_table(stats)
+        render_histogram(stats)
+
+    st.markdown("---")
+    render_profile_dumps()
+
+
+def render_stats_table(stats: list):
+    """Render the timings table (pages first, then sections)."""
+    st.subheader("📋 Tiempos")
+
+    df = pd.DataFrame([
+        {
+            "Nombre": s["name"],
+            "Ejecuciones": s["count"],
+            "Total (s)": round(s["total_ms"] / 1000, 2),
+            "Media (ms)": round(s["avg_ms"], 1),
+            "p50 (ms)": round(s["p50_ms"], 1),
+            "p95 (ms)": round(s["p95_ms"], 1),
+            "Máx. (ms)": round(s["max_ms"], 1)
+        }
+        for s in sorted(stats, key=lambda s: (not s["name"].startswith("page:"), -s["total_ms"]))
+    ])
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+
+def render_histogram(stats: list):
+    """Render the histogram of one page or section."""
+    st.subheader("📊 Distribución")
+
+    by_name = {s["name"]: s for s in stats}
+    selected = st.selectbox("Página o sección", options=list(by_name.keys()))
+    histogram = by_name[selected]["histogram"]
+
+    df = pd.DataFrame(histogram, columns=["ms", "Ejecuciones"])
+    # Keep the bucket order on the chart
+    df["ms"] = pd.Categorical(df["ms"], categories=[label for label, _ in histogram], ordered=True)
+    st.bar_chart(df.set_index("ms"))
+
+
+def render_profile_dumps():
+    """Render the profiles captured for slow renders."""
+    st.subheader("🐢 Renderizados lentos")
+
+    if PROFILE_SLOW_MS <= 0:
+        st.caption(
+            "Captura desactivada. Defina PROFILE_SLOW_MS (ms) para perfilar las páginas "
+            f"y guardar las más lentas en `{PROFILE_DUMP_DIR}/`."
+        )
+
+    dumps = list_profile_dumps()
+    if not dumps:
+        st.info("No hay perfiles guardados.")
+        return
+
+    for dump in dumps[:20]:
+        with st.expander(f"{dump['name']} ({dump['modified_at']:%d/%m/%Y %H:%M:%S})"):
+            with open(dump["file"], encoding="utf-8") as f:
+                st.code(f.read(), language="text")
@@ -3,6 +3,7 @@ Sidebar navigation component for Streamlit app.
 """
 import streamlit as st
 from typing import Dict, Any
+from db.database import get_pool_stats
 
 
 # Page definitions - base pages available to all users
@@ -40,6 +41,11 @@ PAGES_ADMIN = {
         "title": "Gestión Usuarios",
         "icon": "👥",
         "admin_only": True
+    },
+    "performance": {
+        "title": "Rendimiento",
+        "icon": "⏱️",
+        "admin_only": True
     }
 }
 
@@ -114,6 +120,10 @@ def render_sidebar(user: Dict[str, Any]) -> str:
 
         st.markdown("---")
 
+        # Connection pool status (admins only)
+        if user and user.get("role") == "ADMIN":
+            render_pool_stats()
+
         # Logout button
         if st.button("🚪 Cerrar Sesión", use_container_width=True, type="secondary"):
             # Clear session state
@@ -130,6 +140,57 @@ def render_sidebar(user: Dict[str, Any]) -> str:
     return st.session_state.current_page
 
 
+def render_pool_stats() -> None:
+    """Render database connection pool statistics in an expander."""
+    stats = get_pool_stats()
+
+    with st.expander("🔌 Conexiones BD", expanded=False):
+        st.caption(f"Pool: {stats['pool_class']}")
+        if stats["size"] is None:
+            st.caption("Sin estadísticas para este tipo de pool")
+            return
+
+        st.markdown(
+            f"- En uso: **{stats['checked_out']}** / {stats['size']} "
+            f"(+{stats['overflow']} de {stats['max_overflow']} extra)\n"
+            f"- Libres: {stats['checked_in']}"
+        )
+        if stats["checkouts"] is not None:
+            st.markdown(
+                f"- Espera media: {stats['avg_wait_ms']:.1f} ms "
+                f"(máx. {stats['max_wait_ms']:.0f} ms)\n"
+                f"- Timeouts: {stats['timeouts']} de {stats['checkouts']} solicitudes\n"
+                f"- Errores de conexión: {stats['errors']}"
+            )
+
+    st.markdown("---")
+
+
+def render_query_stats(stats: Dict[str, Any]) -> None:
+    """
+    Render the SQL statistics of the current rerun (admins only).
+
+    Args:
+        stats: QueryStats.to_dict() snapshot (see db/instrumentation.py)
+    """
+    with st.expander(f"🐞 SQL: {stats['count']} consultas, {stats['total_ms']:.0f} ms", expanded=False):
+        st.caption(f"{stats['label']} · render total {stats['elapsed_ms']:.0f} ms")
+        if not stats["count"]:
+            st.caption("Sin consultas en esta ejecución")
+            return
+
+        st.markdown("**Por función**")
+        st.markdown("\n".join(
+            f"- `{name}`: {f['count']} ({f['total_ms']:.1f} ms)"
+            for name, f in stats["by_function"].items()
+        ))
+
+        st.markdown("**Más lentas**")
+        for slow in stats["slowest"]:
+            st.caption(f"{slow['ms']:.1f} ms · {slow['function']}")
+            st.code(slow["statement"], language="sql")
+
+
 def set_page(page_key: str) -> None:
     """
     Programmatically set the current page.
@@ -4,10 +4,11 @@ Targets Setup UI - Define monthly targets per agency and KPI.
 import streamlit as st
 from typing import Dict, Any
 from services.agency_service import list_agencies, get_agency_kpis
-from services.access_service import get_user_agency_ids, user_can_access_agency
+from services.access_service import user_can_access_agency
 from services.tracking_service import (
     upsert_monthly_targets,
     get_monthly_targets,
+    get_year_targets_matrix,
     copy_targets_to_all_months,
     copy_targets_to_next_month,
     TrackingServiceError
@@ -37,7 +38,7 @@ def render(current_user: Dict[str, Any]):
 
     # Filter by user access (NORMAL users only see assigned agencies)
     if current_user.get("role") != "ADMIN":
-        allowed_ids = set(get_user_agency_ids(current_user["id"]))
+        allowed_ids = set(current_user["agency_ids"])
         agencies = [a for a in agencies if a["id"] in allowed_ids]
 
     if not agencies:
@@ -180,14 +181,15 @@ def show_year_overview(agency_id: int, year: int, kpis: list):
     """Show a table with all months' targets."""
     import pandas as pd
 
+    matrix = get_year_targets_matrix(agency_id, year)
+
     # Build data for table
     data = {"Mes": [month_name(m) for m in range(1, 13)]}
 
     for kpi in kpis:
         kpi_values = []
         for month in range(1, 13):
-            targets = get_monthly_targets(agency_id, year, month)
-            value = targets.get(kpi.id, 0)
+            value = matrix["months"][month].get(kpi.id, 0)
             kpi_values.append(value if value > 0 else "-")
         data[kpi.code] = kpi_values
 
@@ -198,10 +200,7 @@ def show_year_overview(agency_id: int, year: int, kpis: list):
     st.markdown("**Totales Anuales:**")
     totals = []
     for kpi in kpis:
-        total = sum(
-            get_monthly_targets(agency_id, year, m).get(kpi.id, 0)
-            for m in range(1, 13)
-        )
+        total = matrix["totals"].get(kpi.id, 0)
         totals.append(f"{kpi.code}: {total:,.0f}")
 
     st.markdown(" | ".join(totals))